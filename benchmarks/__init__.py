@@ -0,0 +1,9 @@
+"""Benchmarks of the hot paths of fitting and predicting, run with `python -m benchmarks` from the repository root.
+
+Every benchmark times one hot path on a synthetic dataset whose number of samples, features and pool size are
+parameters, and reports the fastest of several repetitions and the peak memory of one further run. Results can
+be stored as baseline and later runs compared against it, to prove optimisations and to catch regressions.
+"""
+
+from .cases import BENCHMARKS, SIZES, Dataset
+from .runner import Result, compare, load_results, run, save_results
@@ -0,0 +1,68 @@
+"""Command line interface of the benchmarks, e.g.
+
+    python -m benchmarks --size medium --save baseline.json
+    python -m benchmarks --compare baseline.json
+
+Comparing runs the benchmarks on the dataset the baseline was recorded on and exits with status 1 if any of them
+regressed by more than the tolerance.
+"""
+
+import argparse
+import sys
+import warnings
+
+from .cases import BENCHMARKS, SIZES, Dataset
+from .runner import compare, load_results, run, save_results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks of the SupRB hot paths.")
+    parser.add_argument("--size", choices=SIZES, default="small", help="preset of the dataset size")
+    parser.add_argument("--n-samples", type=int, help="overrides the number of samples of the preset")
+    parser.add_argument("--n-features", type=int, help="overrides the number of features of the preset")
+    parser.add_argument("--pool-size", type=int, help="overrides the pool size of the preset")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions of every benchmark")
+    parser.add_argument("--filter", action="append", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--save", metavar="FILE", help="store the results as baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative slowdown that counts as regression")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        baseline, dataset = load_results(args.compare)
+    else:
+        n_samples, n_features, pool_size = SIZES[args.size]
+        dataset = Dataset(
+            n_samples=args.n_samples or n_samples,
+            n_features=args.n_features or n_features,
+            pool_size=args.pool_size or pool_size,
+        )
+
+    names = [name for name in BENCHMARKS if not args.filter or any(part in name for part in args.filter)]
+    print(f"Dataset: {dataset}")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = run(dataset, names=names, repeat=args.repeat)
+
+    print(f"{'benchmark':<36}{'time [ms]':>12}{'peak [MiB]':>12}")
+    for result in results:
+        print(f"{result.name:<36}{1e3 * result.time:>12.3f}{result.peak_memory / 2**20:>12.2f}")
+
+    if args.save:
+        save_results(results, dataset, args.save)
+
+    if baseline is None:
+        return 0
+
+    rows = compare(results, baseline, tolerance=args.tolerance)
+    print(f"\n{'benchmark':<36}{'time':>10}{'memory':>10}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<36}{row['time_ratio']:>9.2f}x{row['memory_ratio']:>9.2f}x{flag}")
+    return int(any(row["regression"] for row in rows))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
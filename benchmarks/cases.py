@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable
+
+import numpy as np
+from sklearn.base import clone
+
+from suprb import SupRB
+from suprb.optimizer.rule.es import ES1xLambda
+from suprb.optimizer.solution.ga import GeneticAlgorithm
+from suprb.optimizer.solution.nsga2.sorting import fast_non_dominated_sort
+from suprb.rule import Rule, RulePool
+from suprb.rule.initialization import NormalInit
+from suprb.rule.matching import OrderedBound
+from suprb.solution.mixing_model import ErrorExperienceHeuristic
+from suprb.utils import check_random_state, estimate_bounds
+
+# Presets of (n_samples, n_features, pool_size)
+SIZES = {
+    "small": (1_000, 4, 32),
+    "medium": (10_000, 8, 128),
+    "large": (100_000, 16, 512),
+}
+
+
+@dataclass
+class Dataset:
+    """A synthetic regression problem with a pool of rules fitted on it, which all benchmarks share."""
+
+    n_samples: int
+    n_features: int
+    pool_size: int
+    random_state: int = 0
+
+    @cached_property
+    def data(self) -> tuple[np.ndarray, np.ndarray]:
+        random_state = check_random_state(self.random_state)
+        X = random_state.uniform(-1, 1, size=(self.n_samples, self.n_features))
+        y = np.sin(3 * X[:, 0]) + np.sum(X[:, 1:] ** 2, axis=1) + random_state.normal(scale=0.1, size=self.n_samples)
+        return X, y
+
+    @property
+    def X(self) -> np.ndarray:
+        return self.data[0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.data[1]
+
+    @cached_property
+    def bounds(self) -> np.ndarray:
+        return estimate_bounds(self.X)
+
+    @cached_property
+    def init(self) -> NormalInit:
+        return NormalInit(bounds=self.bounds, matching_type=OrderedBound(np.array([])), sigma=1.5)
+
+    @cached_property
+    def rules(self) -> list[Rule]:
+        """`pool_size` fitted rules around random training samples."""
+        random_state = check_random_state(self.random_state)
+        origins = self.X[random_state.choice(self.n_samples, size=self.pool_size)]
+        return [self.init(mean=origin, random_state=random_state).fit(self.X, self.y) for origin in origins]
+
+    def rule_discovery(self, **kwargs) -> ES1xLambda:
+        # Cloned, such that configuring it leaves the default components shared by all instances untouched
+        rule_discovery = clone(ES1xLambda(random_state=self.random_state, **kwargs))
+        for key in rule_discovery.get_params():
+            if key.endswith("bounds"):
+                rule_discovery.set_params(**{key: self.bounds})
+            elif key.endswith("matching_type"):
+                rule_discovery.set_params(**{key: OrderedBound(np.array([]))})
+        rule_discovery.pool_, rule_discovery.elitist_ = [], None
+        return rule_discovery
+
+    def __str__(self):
+        return f"n_samples={self.n_samples}, n_features={self.n_features}, pool_size={self.pool_size}"
+
+
+def rule_fit(dataset: Dataset) -> Callable:
+    rule = dataset.rules[0]
+    return lambda: rule.clone().fit(dataset.X, dataset.y)
+
+
+def ordered_bound_match(dataset: Dataset) -> Callable:
+    matches = [rule.match for rule in dataset.rules]
+
+    def benchmark():
+        for match in matches:
+            match(dataset.X)
+
+    return benchmark
+
+
+def mixing(dataset: Dataset) -> Callable:
+    mixing = ErrorExperienceHeuristic()
+    return lambda: mixing(dataset.X, dataset.rules)
+
+
+def es_optimize(dataset: Dataset) -> Callable:
+    rule_discovery = dataset.rule_discovery(n_iter=20, lmbda=8, delay=10)
+    rule_discovery._prepare(dataset.X, dataset.y)
+    initial_rule = dataset.rules[0]
+
+    def benchmark():
+        rule_discovery._optimize(
+            dataset.X,
+            dataset.y,
+            initial_rule=initial_rule.clone().fit(dataset.X, dataset.y),
+            random_state=check_random_state(dataset.random_state),
+        )
+
+    return benchmark
+
+
+def ga_optimize(dataset: Dataset) -> Callable:
+    solution_composition = clone(GeneticAlgorithm(n_iter=8, population_size=16, warm_start=False))
+    solution_composition.init.fitness.max_genome_length_ = dataset.pool_size
+    solution_composition.pool_ = RulePool(dataset.rules)
+
+    def benchmark():
+        # Starts from the same fresh population every time
+        solution_composition.random_state_ = check_random_state(dataset.random_state)
+        solution_composition._init_population()
+        solution_composition._optimize(dataset.X, dataset.y)
+
+    return benchmark
+
+
+def non_dominated_sort(dataset: Dataset) -> Callable:
+    fitness_values = check_random_state(dataset.random_state).random((dataset.pool_size, 2))
+    return lambda: fast_non_dominated_sort(fitness_values)
+
+
+def suprb_predict(dataset: Dataset) -> Callable:
+    estimator = SupRB(
+        n_iter=1,
+        n_rules=dataset.pool_size,
+        n_initial_rules=0,
+        rule_discovery=ES1xLambda(n_iter=4, lmbda=4, delay=2),
+        solution_composition=GeneticAlgorithm(n_iter=4, population_size=8),
+        random_state=dataset.random_state,
+        verbose=0,
+    ).fit(dataset.X, dataset.y)
+    return lambda: estimator.predict(dataset.X)
+
+
+# The benchmarks by name, each a function that prepares the benchmark on a dataset and returns the timed callable
+BENCHMARKS: dict[str, Callable[[Dataset], Callable]] = {
+    "Rule.fit": rule_fit,
+    "OrderedBound.__call__": ordered_bound_match,
+    "ErrorExperienceHeuristic.__call__": mixing,
+    "ES1xLambda._optimize": es_optimize,
+    "GeneticAlgorithm._optimize": ga_optimize,
+    "fast_non_dominated_sort": non_dominated_sort,
+    "SupRB.predict": suprb_predict,
+}
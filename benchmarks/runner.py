@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Iterable
+
+import numpy as np
+
+from .cases import BENCHMARKS, Dataset
+
+
+@dataclass
+class Result:
+    """Times of all repetitions of a benchmark in seconds and the peak memory of one run in bytes, as traced by
+    `tracemalloc` (which includes the allocations of numpy arrays). Like `timeit`, the fastest repetition is
+    reported, because slower ones mostly measure interference by other processes."""
+
+    name: str
+    times: list[float]
+    peak_memory: int
+
+    @property
+    def time(self) -> float:
+        return float(np.min(self.times))
+
+
+def run(dataset: Dataset, names: Iterable[str] = None, repeat: int = 5) -> list[Result]:
+    """Runs the given benchmarks (all if None) on `dataset`, each `repeat` times after one untimed warm-up run."""
+
+    results = []
+    for name in names if names is not None else BENCHMARKS:
+        benchmark = BENCHMARKS[name](dataset)
+        benchmark()
+
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            benchmark()
+            times.append(time.perf_counter() - start)
+
+        # Tracing slows down allocations, so memory is measured in a separate run
+        gc.collect()
+        tracemalloc.start()
+        try:
+            benchmark()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        results.append(Result(name=name, times=times, peak_memory=peak_memory))
+    return results
+
+
+def save_results(results: list[Result], dataset: Dataset, filename: str):
+    with open(filename, "w") as f:
+        json.dump(
+            {
+                "dataset": {
+                    "n_samples": dataset.n_samples,
+                    "n_features": dataset.n_features,
+                    "pool_size": dataset.pool_size,
+                    "random_state": dataset.random_state,
+                },
+                "machine": platform.platform(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "results": [asdict(result) for result in results],
+            },
+            f,
+            indent=2,
+        )
+
+
+def load_results(filename: str) -> tuple[list[Result], Dataset]:
+    with open(filename) as f:
+        saved = json.load(f)
+    return [Result(**result) for result in saved["results"]], Dataset(**saved["dataset"])
+
+
+def compare(results: list[Result], baseline: list[Result], tolerance: float = 0.2) -> list[dict]:
+    """Relates the times and peak memory of `results` to those of `baseline`. Benchmarks that take more than
+    `1 + tolerance` times as long, or use more than `1 + tolerance` times as much memory, are regressions."""
+
+    baseline = {result.name: result for result in baseline}
+    rows = []
+    for result in results:
+        if result.name not in baseline:
+            continue
+        reference = baseline[result.name]
+        time_ratio = result.time / reference.time if reference.time else np.inf
+        memory_ratio = result.peak_memory / reference.peak_memory if reference.peak_memory else 1.0
+        rows.append(
+            {
+                "name": result.name,
+                "time": result.time,
+                "baseline_time": reference.time,
+                "time_ratio": time_ratio,
+                "peak_memory": result.peak_memory,
+                "baseline_peak_memory": reference.peak_memory,
+                "memory_ratio": memory_ratio,
+                "regression": time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance,
+            }
+        )
+    return rows
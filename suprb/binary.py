@@ -0,0 +1,165 @@
+"""Binary (de)serialization of the compiled elitist (see `SupRB.compile()`).
+
+A file starts with `MAGIC`, followed by the length of a JSON header as little-endian uint64 and the header itself,
+which holds the config, the scores of the elitist and the dtype, shape and offset of every array (`powers` is only
+present if the local models are not linear, see `suprb.rule.codec`). The raw arrays
+follow, aligned to `ALIGNMENT` bytes, such that they can be memory-mapped instead of parsed."""
+
+import json
+import struct
+from copy import deepcopy
+
+import numpy as np
+
+from .json import CLASS_PREFIX, _get_class, _load_config, _save_config
+from .rule import Rule
+from .rule.codec import PolynomialModel
+from .rule.matching import OrderedBound
+from .solution import CompiledSolution, Solution
+from .suprb import SupRB
+
+MAGIC = b"SUPRBBIN"
+VERSION = 1
+ALIGNMENT = 64
+
+ARRAYS = ("bounds", "coef", "intercept", "taus", "errors", "experiences")
+
+
+def dump(suprb, filename):
+    """Saves the compiled elitist of a fitted `SupRB`, compiling it first if necessary.
+    Only elitists that can be compiled, i.e., of interval-based rules with local models a `LocalModelCodec`
+    supports, can be saved."""
+
+    if not hasattr(suprb, "compiled_"):
+        suprb.compile()
+    compiled = suprb.compiled_
+
+    arrays = {name: np.ascontiguousarray(getattr(compiled, name), dtype=float) for name in ARRAYS}
+    if compiled.powers is not None:
+        arrays["powers"] = np.ascontiguousarray(compiled.powers, dtype=np.int64)
+    subpopulation = suprb.elitist_.subpopulation if hasattr(suprb, "elitist_") else []
+    if subpopulation:
+        arrays["input_space"] = np.ascontiguousarray(subpopulation[0].input_space, dtype=float)
+
+    config = {"config": {}}
+    _save_config(suprb, config)
+    header = {
+        "version": VERSION,
+        "n_features": compiled.n_features,
+        "config": config["config"],
+        "elitist": _elitist_scores(suprb),
+        "arrays": {},
+    }
+
+    # The offsets depend on the length of the header, which includes them, so reserve enough digits upfront
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": 10**15}
+    start = _align(len(MAGIC) + 8 + len(json.dumps(header).encode()))
+    for name, array in arrays.items():
+        header["arrays"][name]["offset"] = start + offset
+        offset = _align(offset + array.nbytes)
+
+    encoded = json.dumps(header).encode()
+    with open(filename, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(encoded)))
+        f.write(encoded)
+        for name, array in arrays.items():
+            f.write(b"\0" * (header["arrays"][name]["offset"] - f.tell()))
+            f.write(array.tobytes())
+
+    return header
+
+
+def load(filename, mmap_mode="r", rules=False):
+    """Loads a `SupRB` whose `compiled_` elitist predicts straight from the arrays in the file.
+
+    Parameters
+    ----------
+    filename: str
+    mmap_mode: str
+        Mode to memory-map the arrays with (see `np.memmap`), or None to read them into memory.
+    rules: bool
+        If True, the rules of the elitist are rebuilt as well (as `pool_` and `elitist_`), e.g., to inspect or refine
+        them. Predicting does not need them.
+    """
+
+    header = load_header(filename)
+    arrays = {name: _read_array(filename, spec, mmap_mode) for name, spec in header["arrays"].items()}
+
+    suprb = _load_config(deepcopy(header["config"]))
+    suprb.n_features_in_ = header["n_features"]
+    suprb.compiled_ = CompiledSolution(**{name: arrays[name] for name in ARRAYS}, powers=arrays.get("powers"))
+    if rules:
+        _load_rules(suprb, arrays, header)
+    suprb.is_fitted_ = True
+
+    return suprb
+
+
+def load_header(filename) -> dict:
+    with open(filename, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filename} is not a binary SupRB model")
+        (length,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(length))
+
+    if header["version"] > VERSION:
+        raise ValueError(f"{filename} has format version {header['version']}, but only {VERSION} is supported")
+    return header
+
+
+def _elitist_scores(suprb) -> dict:
+    elitist = getattr(suprb, "elitist_", None)
+    return {key: getattr(elitist, key, None) for key in ("complexity_", "error_", "fitness_")}
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _read_array(filename, spec: dict, mmap_mode) -> np.ndarray:
+    dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+    if mmap_mode is None or not np.prod(shape, dtype=int):
+        count = int(np.prod(shape, dtype=int))
+        return np.fromfile(filename, dtype=dtype, count=count, offset=spec["offset"]).reshape(shape)
+    return np.memmap(filename, dtype=dtype, mode=mmap_mode, offset=spec["offset"], shape=shape)
+
+
+def _load_rules(suprb: SupRB, arrays: dict, header: dict):
+    config = header["config"]
+    compiled = suprb.compiled_
+    input_space = np.asarray(arrays.get("input_space", np.zeros((header["n_features"], 2))))
+    # Compiled bounds are sorted, so they are valid ordered bounds whichever interval-based matching was used
+    matching_type = config["matching_type"]
+    matching_type = _get_class(matching_type) if matching_type.startswith(CLASS_PREFIX) else OrderedBound
+
+    suprb.pool_ = []
+    for i in range(compiled.n_rules):
+        if compiled.powers is None:
+            model = _get_class(config["rule_discovery__init__model"])()
+        else:
+            model = PolynomialModel(powers=compiled.powers)
+        model.coef_ = np.asarray(compiled.coef[i])
+        model.intercept_ = float(compiled.intercept[i])
+
+        rule = Rule(
+            matching_type(np.array(compiled.bounds[i])),
+            input_space,
+            model,
+            _get_class(config["rule_discovery__init__fitness"]),
+        )
+        rule.error_ = float(compiled.errors[i])
+        rule.experience_ = float(compiled.experiences[i])
+        rule.is_fitted_ = True
+        suprb.pool_.append(rule)
+
+    suprb.elitist_ = Solution(
+        genome=np.ones(len(suprb.pool_)),
+        pool=suprb.pool_,
+        mixing=suprb.solution_composition.init.mixing,
+        fitness=suprb.solution_composition.init.fitness,
+    )
+    for key, value in header["elitist"].items():
+        setattr(suprb.elitist_, key, value)
@@ -6,9 +6,12 @@ from suprb.suprb import SupRB
 from .solution import Solution
 
 from .rule import Rule
+from .rule.codec import LinearCodec, PolynomialModel, get_codec
+from .rule.matching import OrderedBound
 import importlib
 
-"""(De)Serialization currenlty only supports LinearRegression as local models. """
+"""(De)Serialization supports all local models a `LocalModelCodec` is registered for (see `suprb.rule.codec`).
+Linear models are restored as the configured model class, all others as lightweight `PolynomialModel`s."""
 
 CLASS_PREFIX = "class:"
 
@@ -49,7 +52,9 @@ def load(filename):
     suprb = _load_config(deepcopy(json_dict["config"]))
     _load_pool(json_dict, suprb)
     _load_elitist(suprb)
+    suprb.n_features_in_ = suprb.pool_[0].input_space.shape[0]
     suprb.is_fitted_ = True
+    suprb._index_elitist()
 
     return suprb
 
@@ -87,6 +92,9 @@ def _save_config(suprb, json_config):
             continue
         elif isinstance(value, primitive):
             json_config["config"][key] = value
+        elif _is_steps(value):
+            # The steps themselves are saved under their names, like all nested estimators
+            json_config["config"][key] = [name for name, _ in value]
         else:
             json_config["config"][key] = _get_full_class_name(value)
 
@@ -117,16 +125,30 @@ def _convert_rule_to_json(rule):
         "experience_": rule.experience_,
         "match": _convert_dict_to_json(vars(rule.match)),
         "is_fitted_": rule.is_fitted_,
-        "model": {
-            "coef_": _convert_to_json_format(getattr(rule.model, "coef_")),
-            "intercept_": getattr(rule.model, "intercept_"),
-        },
+        "model": _convert_model_to_json(rule.model, rule.input_space.shape[0]),
+    }
+
+
+def _convert_model_to_json(model, n_features):
+    codec = get_codec(model)
+    if isinstance(codec, LinearCodec):
+        return {
+            "coef_": _convert_to_json_format(getattr(model, "coef_")),
+            "intercept_": getattr(model, "intercept_"),
+        }
+
+    polynomial = codec.encode(model, n_features)
+    return {
+        "codec": codec.name,
+        "powers": _convert_to_json_format(polynomial.powers),
+        "coef_": _convert_to_json_format(polynomial.coef_),
+        "intercept_": polynomial.intercept_,
     }
 
 
 def _load_config(json_config):
     _deserialize_config(json_config)
-    return SupRB(**json_config)
+    return SupRB(**{key: None if value == "NoneType" else value for key, value in json_config.items()})
 
 
 def _deserialize_config(json_config):
@@ -134,9 +156,21 @@ def _deserialize_config(json_config):
         base_key, longest_key = _get_longest_key(json_config)
         _update_longest_key(json_config, longest_key)
         params = _update_same_base_keys(json_config, base_key)
+        if _is_step_names(params.get("steps")):
+            params["steps"] = [(name, params.pop(name)) for name in params["steps"]]
         json_config[base_key] = _get_class(json_config[base_key])(**params)
 
 
+def _is_steps(value):
+    return isinstance(value, list) and all(
+        isinstance(step, tuple) and len(step) == 2 and isinstance(step[0], str) for step in value
+    )
+
+
+def _is_step_names(value):
+    return isinstance(value, list) and all(isinstance(name, str) for name in value)
+
+
 def _get_longest_key(json_config):
     longest_key = max(json_config, key=lambda key: key.count("__"))
     base_key = "__".join(longest_key.split("__")[:-1])
@@ -185,7 +219,8 @@ def _update_same_base_keys(json_config, base_key):
 def _get_keys_with_same_base(json_config, base):
     same_base_key_list = []
     for key in json_config:
-        if key.startswith(base) and key != base:
+        # Only the parameters of base itself, not those of siblings sharing its prefix (e.g., 'crossover_rate')
+        if key.startswith(base + "__"):
             same_base_key_list.append(key)
 
     return same_base_key_list
@@ -200,10 +235,11 @@ def _load_pool(json_dict, suprb):
 
 def _convert_json_to_rule(json_rule, json_dict):
 
+    input_space = _convert_from_json_to_array(json_dict["input_space"])
     rule = Rule(
         _convert_matching_type(json_rule["match"], json_dict["config"]["matching_type"]),
-        _convert_from_json_to_array(json_dict["input_space"]),
-        _convert_model(json_rule["model"], json_dict["config"]["rule_discovery__init__model"]),
+        input_space,
+        _convert_model(json_rule["model"], json_dict["config"]["rule_discovery__init__model"], input_space.shape[0]),
         _get_class(json_dict["config"]["rule_discovery__init__fitness"]),
     )
 
@@ -215,7 +251,8 @@ def _convert_json_to_rule(json_rule, json_dict):
 
 
 def _convert_matching_type(match, matching_type):
-    matching = _get_class(matching_type)([])
+    # SupRB matches with OrderedBound if no matching type was set
+    matching = (_get_class(matching_type) if matching_type.startswith(CLASS_PREFIX) else OrderedBound)([])
 
     for name, p in match.items():
         setattr(matching, name, _convert_from_json_to_array(p))
@@ -223,8 +260,12 @@ def _convert_matching_type(match, matching_type):
     return matching
 
 
-def _convert_model(json_model, model_type):
-    model = _get_class(model_type)()
+def _convert_model(json_model, model_type, n_features):
+    if "codec" in json_model:
+        powers = _convert_from_json_to_array(json_model["powers"]).astype(int).reshape(-1, n_features)
+        model = PolynomialModel(powers=powers)
+    else:
+        model = _get_class(model_type)()
 
     setattr(model, "coef_", _convert_from_json_to_array(json_model["coef_"]))
     setattr(model, "intercept_", json_model["intercept_"])
@@ -105,6 +105,11 @@ class DefaultLogger(BaseLogger):
         # Log performance
         log_metric("training_score", elitist.score(X, y))
 
+        # Log where the time of this iteration was spent, if the estimator is profiled
+        if getattr(estimator, "profile", False) and hasattr(estimator, "step_profile_"):
+            for key, value in estimator.step_profile_.metrics().items():
+                log_metric(key, value)
+
     def get_elitist(self, estimator: BaseRegressor):
         json_data = {}
         # suprb_json._save_pool(estimator.solution_composition_.elitist().pool, json_data)
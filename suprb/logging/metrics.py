@@ -1,7 +1,8 @@
-import itertools
 import numpy as np
 
 from suprb import Rule, Solution
+from suprb.rule.match_set import coverage
+from suprb.solution.genome import hamming_distance, pairwise_hamming_distances
 
 
 def genome_diversity(population: list[Solution]):
@@ -12,20 +13,16 @@ def genome_diversity(population: list[Solution]):
     identical solutions if the same rule is part of the pool multiple times
     """
 
-    combinations = list(itertools.combinations(population, 2))
-    return np.sum([hamming_distance(a.genome, b.genome) for a, b in combinations]) / population[0].genome.shape[0]
-
-
-def hamming_distance(a: np.ndarray, b: np.ndarray):
-    return np.count_nonzero(a ^ b)
+    distances = pairwise_hamming_distances([solution.genome for solution in population])
+    return np.sum(distances) / population[0].genome.shape[0]
 
 
 def matched_training_samples(pool: list[Rule]):
     if not pool:
         return 0
 
-    matched = np.stack([rule.match_set_ for rule in pool]).any(axis=0).nonzero()[0].shape[0]
     total = pool[0].match_set_.shape[0]
+    matched = np.count_nonzero(coverage([rule.match_set_ for rule in pool], n_samples=total))
     return matched / total
 
 
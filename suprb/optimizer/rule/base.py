@@ -2,7 +2,8 @@ from abc import ABCMeta, abstractmethod
 from typing import Optional
 
 import numpy as np
-from joblib import Parallel, delayed
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
 
 from suprb.solution import Solution
 from suprb.optimizer import BaseOptimizer
@@ -11,6 +12,8 @@ from suprb.rule.matching import MatchingFunction
 from .acceptance import RuleAcceptance
 from .constraint import RuleConstraint
 from .origin import RuleOriginGeneration
+from .workers import RuleDiscoveryWorkers
+from ...profiling import timer
 from ...utils import check_random_state, RandomState, spawn_random_states
 
 
@@ -54,36 +57,83 @@ class RuleDiscovery(BaseOptimizer, metaclass=ABCMeta):
         self.constraint = constraint
 
     def _filter_invalid_rules(self, X: np.ndarray, y: np.ndarray, rules: list[Rule]) -> list[Rule]:
-        return list(
-            filter(
-                lambda rule: rule is not None and self.acceptance(rule=rule, X=X, y=y),
-                rules,
+        with timer("acceptance"):
+            return list(
+                filter(
+                    lambda rule: rule is not None and self.acceptance(rule=rule, X=X, y=y),
+                    rules,
+                )
             )
-        )
 
     @abstractmethod
     def optimize(self, X: np.ndarray, y: np.ndarray, n_rules: int = 1) -> list[Rule]:
         pass
 
+    def close(self):
+        """Release resources that are kept between calls of `optimize()`, e.g., worker processes."""
+        pass
+
 
 class ParallelSingleRuleDiscovery(RuleDiscovery, metaclass=ABCMeta):
     """
     Implements basic functionality to generate several `Rule`s in parallel.
     The optimization process is assumed to generate exactly one rule for every origin data sample.
+
+    Parameters
+    ----------
+    persistent_workers: bool
+        If True and `n_jobs` is larger than one, rules are optimized in worker processes that are started once for
+        every training set and kept until `close()` is called (see `RuleDiscoveryWorkers`).
+        The workers hold the training data in shared memory, so that only the initial rules and seeds are sent to
+        them, and they return rules without their match sets and predictions, which are recomputed afterwards.
+        Otherwise, a new joblib context is used in every call of `optimize()`.
     """
 
+    workers_: RuleDiscoveryWorkers
+
+    def __init__(
+        self,
+        n_iter: int,
+        origin_generation: RuleOriginGeneration,
+        init: RuleInit,
+        acceptance: RuleAcceptance,
+        constraint: RuleConstraint,
+        random_state: int,
+        n_jobs: int,
+        persistent_workers: bool = False,
+    ):
+        super().__init__(
+            n_iter=n_iter,
+            origin_generation=origin_generation,
+            init=init,
+            acceptance=acceptance,
+            constraint=constraint,
+            random_state=random_state,
+            n_jobs=n_jobs,
+        )
+        self.persistent_workers = persistent_workers
+
+    def _prepare(self, X: np.ndarray, y: np.ndarray):
+        """Builds data-dependent state `_optimize()` relies on. Also called once in every worker process."""
+        pass
+
     def optimize(self, X: np.ndarray, y: np.ndarray, n_rules: int = 1) -> list[Rule]:
         self.random_state_ = check_random_state(self.random_state)
+        if self.persistent_workers and effective_n_jobs(self.n_jobs) > 1:
+            return self._optimize_in_workers(X, y, n_rules=n_rules)
+
+        self._prepare(X, y)
         random_states = spawn_random_states(self.random_state_, n=n_rules)
 
-        origins = self.origin_generation(
-            n_rules=n_rules,
-            X=X,
-            y=y,
-            pool=self.pool_,
-            elitist=self.elitist_,
-            random_state=self.random_state_,
-        )
+        with timer("origin_generation"):
+            origins = self.origin_generation(
+                n_rules=n_rules,
+                X=X,
+                y=y,
+                pool=self.pool_,
+                elitist=self.elitist_,
+                random_state=self.random_state_,
+            )
 
         initial_rules = []
         for origin in origins:
@@ -98,6 +148,33 @@ class ParallelSingleRuleDiscovery(RuleDiscovery, metaclass=ABCMeta):
 
         return self._filter_invalid_rules(X=X, y=y, rules=rules)
 
+    def _optimize_in_workers(self, X: np.ndarray, y: np.ndarray, n_rules: int) -> list[Rule]:
+        if not hasattr(self, "workers_") or not self.workers_.is_for(X, y):
+            self.close()
+            self.workers_ = RuleDiscoveryWorkers(clone(self), X, y, n_jobs=effective_n_jobs(self.n_jobs))
+
+        # Same seeds as `spawn_random_states()` would use
+        seeds = self.random_state_.bit_generator._seed_seq.spawn(n_rules)
+
+        with timer("origin_generation"):
+            origins = self.origin_generation(
+                n_rules=n_rules,
+                X=X,
+                y=y,
+                pool=self.pool_,
+                elitist=self.elitist_,
+                random_state=self.random_state_,
+            )
+        initial_rules = [self.constraint(self.init(mean=origin, random_state=self.random_state_)) for origin in origins]
+
+        rules = self.workers_.optimize(initial_rules, seeds)
+        return self._filter_invalid_rules(X=X, y=y, rules=rules)
+
+    def close(self):
+        if hasattr(self, "workers_"):
+            self.workers_.close()
+            del self.workers_
+
     @abstractmethod
     def _optimize(
         self,
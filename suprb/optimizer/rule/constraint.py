@@ -6,6 +6,7 @@ import numpy as np
 
 from suprb.base import BaseComponent
 from suprb.rule import Rule
+from suprb.rule.matching import OrderedBound
 
 
 class RuleConstraint(BaseComponent, metaclass=ABCMeta):
@@ -19,6 +20,19 @@ class RuleConstraint(BaseComponent, metaclass=ABCMeta):
     def __call__(self, rule: Rule) -> Rule:
         pass
 
+    def batch(self, bounds: np.ndarray, rule: Rule = None) -> np.ndarray:
+        """Applies the constraint to stacked `OrderedBound` bounds with shape (n_rules, n_features, 2) in place.
+        Constraints without a vectorised implementation are applied to a clone of `rule` (or a bare rule, if None)
+        for every row of bounds, one after another."""
+
+        for i, row in enumerate(bounds):
+            if rule is not None:
+                clone = rule.clone(match=OrderedBound(row.copy()), model=None)
+            else:
+                clone = Rule(match=OrderedBound(row.copy()), input_space=None, model=None, fitness=None)
+            bounds[i] = self(clone).match.bounds
+        return bounds
+
 
 class CombinedConstraint(RuleConstraint):
     """
@@ -34,6 +48,9 @@ class CombinedConstraint(RuleConstraint):
     def __call__(self, rule: Rule) -> Rule:
         return self.clip(self.min_range(rule))
 
+    def batch(self, bounds: np.ndarray, rule: Rule = None) -> np.ndarray:
+        return self.clip.batch(self.min_range.batch(bounds, rule=rule), rule=rule)
+
 
 class Clip(RuleConstraint):
     """Clip the rule into bounds."""
@@ -46,6 +63,9 @@ class Clip(RuleConstraint):
         rule.match.clip(self.bounds)
         return rule
 
+    def batch(self, bounds: np.ndarray, rule: Rule = None) -> np.ndarray:
+        return np.clip(bounds, self.bounds[:, :1], self.bounds[:, 1:], out=bounds)
+
 
 class MinRange(RuleConstraint):
     """Make bounds bigger that were generated smaller than min_range."""
@@ -56,3 +76,10 @@ class MinRange(RuleConstraint):
     def __call__(self, rule: Rule) -> Rule:
         rule.match.min_range(self.min_range)
         return rule
+
+    def batch(self, bounds: np.ndarray, rule: Rule = None) -> np.ndarray:
+        if self.min_range > 0:
+            invalid = bounds[:, :, 1] - bounds[:, :, 0] < self.min_range
+            bounds[invalid, 0] -= self.min_range / 2
+            bounds[invalid, 1] += self.min_range / 2
+        return bounds
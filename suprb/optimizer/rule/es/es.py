@@ -1,3 +1,4 @@
+import copy
 import warnings
 from collections import deque
 from typing import Optional
@@ -7,6 +8,11 @@ import warnings
 
 from suprb.rule import Rule, RuleInit
 from suprb.rule.initialization import MeanInit
+from suprb.rule.batch import fit_rules, set_fitted_attributes, supports_batch_fit
+from suprb.rule.index import MatchFingerprint, SampleIndex
+from suprb.rule.matching import OrderedBound
+from suprb.rule.statistics import SufficientStatistics
+from suprb.profiling import count, timer
 from suprb.utils import RandomState
 from ..mutation import RuleMutation, HalfnormIncrease
 from ..selection import RuleSelection, Fittest
@@ -15,6 +21,8 @@ from ..acceptance import Variance
 from ..base import ParallelSingleRuleDiscovery
 from ..constraint import CombinedConstraint, MinRange, Clip
 from ..origin import Matching, SquaredError, RuleOriginGeneration
+from ..workers import compact
+from ...subsample import Subsample
 
 
 class ES1xLambda(ParallelSingleRuleDiscovery):
@@ -46,6 +54,30 @@ class ES1xLambda(ParallelSingleRuleDiscovery):
         Pass an int for reproducible results across multiple function calls.
     n_jobs: int
         The number of threads / processes the optimization uses. Currently not used for this optimizer.
+    batched: bool
+        If True and rules use `OrderedBound`s, the bounds of all lambda children are mutated and constrained as one
+        (lmbda, n_features, 2) array and matched with a single broadcast comparison per feature.
+        Only children that match any sample become `Rule`s, and children matching the same samples as their parent
+        reuse its local model instead of fitting a new one. Linear and ridge local models of the other children are
+        fitted together in closed form, see `suprb.rule.batch.fit_rules()`.
+        For one- and two-dimensional inputs, these models are instead fitted and evaluated from prefix sums over the
+        training data (see `SufficientStatistics`), and only the selected child is matched against the data.
+    sample_index: bool
+        If True, the training samples are sorted along every feature once per `fit` (see `SampleIndex`) and children
+        with `OrderedBound`s are matched with binary searches on these orders, such that only the samples inside
+        the interval of their most selective feature are compared.
+        Rules additionally store a fingerprint of their match set (see `MatchFingerprint`), such that a child is
+        only re-matched on the samples between the bounds of its parent and its own bounds, and reuses the local
+        model of its parent if none of these samples changes.
+    persistent_workers: bool
+        If True and `n_jobs` is larger than one, rules are optimized in worker processes that live as long as the
+        training data does not change, see `ParallelSingleRuleDiscovery`.
+    subsample: Subsample
+        If set, the children of every iteration are fitted and evaluated on the next subsample of its schedule only.
+        The selected child is then refitted on all samples before it replaces (or, for '+', competes with) the
+        elitist, such that only elitists, and therefore the rules that enter the pool, are fitted on all samples.
+        Children whose squared errors on the samples of the subsample both match are significantly worse than the
+        ones of the elitist (see `Subsample.promote()`) are not refitted, and the elitist survives the iteration.
     """
 
     def __init__(
@@ -62,6 +94,10 @@ class ES1xLambda(ParallelSingleRuleDiscovery):
         constraint: RuleConstraint = CombinedConstraint(MinRange(), Clip()),
         random_state: int = None,
         n_jobs: int = 1,
+        batched: bool = False,
+        sample_index: bool = False,
+        persistent_workers: bool = False,
+        subsample: Subsample = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -71,12 +107,16 @@ class ES1xLambda(ParallelSingleRuleDiscovery):
             constraint=constraint,
             random_state=random_state,
             n_jobs=n_jobs,
+            persistent_workers=persistent_workers,
         )
         self.lmbda = lmbda
         self.delay = delay
         self.operator = operator
         self.mutation = mutation
         self.selection = selection
+        self.batched = batched
+        self.sample_index = sample_index
+        self.subsample = subsample
 
         if self.delay < 2:
             warnings.warn(
@@ -88,6 +128,21 @@ class ES1xLambda(ParallelSingleRuleDiscovery):
         if self.operator == "," and isinstance(self.mutation, HalfnormIncrease):
             warnings.warn("',' operator and HalfnormIncrease mutation lead to collapsing populations")
 
+    def _prepare(self, X: np.ndarray, y: np.ndarray):
+        if self.batched and X.shape[1] <= 2:
+            if not hasattr(self, "statistics_") or not self.statistics_.is_for(X, y):
+                self.statistics_ = SufficientStatistics(X, y)
+        if self.sample_index:
+            if not hasattr(self, "index_") or not self.index_.is_for(X):
+                self.index_ = SampleIndex(X)
+
+    def close(self):
+        super().close()
+        # Both keep references to the training data and tables of its size
+        for attribute in ("statistics_", "index_"):
+            if hasattr(self, attribute):
+                delattr(self, attribute)
+
     def _optimize(
         self,
         X: np.ndarray,
@@ -97,17 +152,33 @@ class ES1xLambda(ParallelSingleRuleDiscovery):
     ) -> Optional[Rule]:
 
         elitist = initial_rule
+        if self._index(X) is not None and isinstance(elitist.match, OrderedBound) and hasattr(elitist, "match_set_"):
+            elitist.fingerprint_ = self._index(X).fingerprint(elitist.match.bounds, elitist.match_set_)
 
         elitists = deque(maxlen=self.delay)
+        subsamples = self.subsample.schedule(X.shape[0], random_state) if self.subsample is not None else None
 
         # Main iteration
         for iteration in range(self.n_iter):
             elitists.append(elitist)
 
+            # Children are evaluated on the next subsample only, if there is a schedule
+            if subsamples is not None:
+                samples = next(subsamples)
+                X_eval, y_eval = X[samples], y[samples]
+            else:
+                X_eval, y_eval = X, y
+
             # Generate, fit and evaluate lambda children
-            children = [
-                self.constraint(self.mutation(elitist, random_state=random_state)).fit(X, y) for _ in range(self.lmbda)
-            ]
+            if self.batched and isinstance(elitist.match, OrderedBound):
+                children = self._generate_batch(X_eval, y_eval, elitist, random_state)
+            else:
+                with timer("rule_mutation"):
+                    mutants = [
+                        self.constraint(self.mutation(elitist, random_state=random_state)) for _ in range(self.lmbda)
+                    ]
+                with timer("rule_fit"):
+                    children = [self._fit(mutant, X_eval, y_eval, parent=elitist) for mutant in mutants]
 
             # Filter children that do not match any data samples
             valid_children = list(filter(lambda rule: rule.is_fitted_ and rule.experience_ > 0, children))
@@ -121,6 +192,15 @@ class ES1xLambda(ParallelSingleRuleDiscovery):
                 )
                 continue
 
+            # Only the best child on the subsample is fitted on all samples and competes with the elitist
+            if subsamples is not None:
+                child = self.selection(children, random_state=random_state)[0]
+                if self._promote(child, elitist, X_eval, y_eval):
+                    with timer("rule_fit"):
+                        children = [self._fit(compact(child), X, y, parent=elitist)]
+                else:
+                    children = [elitist]
+
             # Different operators for replacement
             # 'selection' returns a list of rules. Either unordered or
             # descending, we thus take the first element for our new parent
@@ -129,9 +209,147 @@ class ES1xLambda(ParallelSingleRuleDiscovery):
                 elitist = self.selection(children, random_state=random_state)[0]
             elif self.operator in (",", "&"):
                 elitist = self.selection(children, random_state=random_state)[0]
+            if not hasattr(elitist, "match_set_"):
+                self._match_survivor(X, elitist)
             if self.operator == "&":
                 if len(elitists) == self.delay and all([e.fitness_ <= elitists[0].fitness_ for e in elitists]):
                     elitist = elitists[0]
                     break
 
         return elitist
+
+    def _promote(self, child: Rule, elitist: Rule, X: np.ndarray, y: np.ndarray) -> bool:
+        """Whether `child`, fitted on the subsample `X`, `y`, is worth a fit on all samples, judged by the squared errors
+        of both rules on the samples of the subsample they both match."""
+
+        matched = child.match(X) & elitist.match(X)
+        if not matched.any():
+            return True
+        X_matched, y_matched = X[matched], y[matched]
+        return self.subsample.promote(
+            (child.predict(X_matched) - y_matched) ** 2, (elitist.predict(X_matched) - y_matched) ** 2
+        )
+
+    def _generate_batch(self, X: np.ndarray, y: np.ndarray, elitist: Rule, random_state: RandomState) -> list[Rule]:
+        """Generates the lambda children of `elitist` as arrays and only creates `Rule`s for those matching any data."""
+
+        with timer("rule_mutation"):
+            bounds = self.mutation.batch(elitist, n=self.lmbda, random_state=random_state)
+            bounds = self.constraint.batch(bounds, rule=elitist)
+
+        with timer("rule_fit"):
+            return self._fit_batch(X, y, bounds, elitist)
+
+    def _fit_batch(self, X: np.ndarray, y: np.ndarray, bounds: np.ndarray, elitist: Rule) -> list[Rule]:
+        """Matches, fits and evaluates the children with the given bounds."""
+
+        statistics = getattr(self, "statistics_", None)
+        if (
+            statistics is not None
+            and statistics.is_for(X, y)
+            and statistics.supported
+            and supports_batch_fit(elitist.model)
+        ):
+            return self._generate_from_statistics(statistics, bounds, elitist)
+
+        index = self._index(X)
+        parent_fingerprint = getattr(elitist, "fingerprint_", None)
+        if index is not None and parent_fingerprint is not None:
+            matched = [index.rematch(child_bounds, elitist.match_set_, parent_fingerprint) for child_bounds in bounds]
+        else:
+            match_sets = index.match_batch(bounds) if index is not None else OrderedBound.match_batch(bounds, X)
+            matched = [(match_set, None) for match_set in match_sets]
+
+        children, unfitted = [], []
+        for child_bounds, (match_set, fingerprint) in zip(bounds, matched):
+            if fingerprint is not None:
+                empty, unchanged = fingerprint.count == 0, fingerprint == parent_fingerprint
+            else:
+                empty, unchanged = not match_set.any(), np.array_equal(match_set, elitist.match_set_)
+
+            if empty:
+                continue
+            if unchanged:
+                child = self._inherit_fit(elitist.clone(match=OrderedBound(child_bounds), model=None), elitist)
+            else:
+                child = elitist.clone(match=OrderedBound(child_bounds))
+                unfitted.append((child, match_set))
+            child.fingerprint_ = fingerprint
+            children.append(child)
+
+        # Linear local models of all remaining children are fitted with a single batched solve
+        if unfitted:
+            rules, unfitted_match_sets = zip(*unfitted)
+            fit_rules(list(rules), X, y, match_sets=np.stack(unfitted_match_sets))
+
+        return children
+
+    def _generate_from_statistics(
+        self, statistics: SufficientStatistics, bounds: np.ndarray, elitist: Rule
+    ) -> list[Rule]:
+        """Fits and evaluates the children from the sufficient statistics of their boxes.
+        Their match sets and predictions are left out, see `_match_survivor()`."""
+
+        model = elitist.model
+        alpha = model.alpha if hasattr(model, "alpha") else 0
+        counts, coefs, intercepts, grams, errors = statistics.fit(
+            bounds, alpha=alpha, fit_intercept=model.fit_intercept
+        )
+
+        children = []
+        for i in np.flatnonzero(counts > 0):
+            child = elitist.clone(match=OrderedBound(bounds[i]))
+            set_fitted_attributes(child.model, coefs[i], intercepts[i], grams[i], bounds.shape[1])
+            child.error_ = max(errors[i], 1e-4)
+            child.fitness_ = child.fitness(child)
+            child.experience_ = float(counts[i])
+            child.is_fitted_ = True
+            children.append(child)
+
+        count("rules_fitted", len(children))
+        return children
+
+    def _index(self, X: np.ndarray) -> Optional[SampleIndex]:
+        index = getattr(self, "index_", None)
+        return index if self.sample_index and index is not None and index.is_for(X) else None
+
+    def _match(self, X: np.ndarray, rule: Rule, parent: Rule = None) -> tuple[np.ndarray, Optional[MatchFingerprint]]:
+        """The match set of `rule` and its fingerprint, which is derived from the one of `parent` if available."""
+
+        index = self._index(X)
+        if index is None or not isinstance(rule.match, OrderedBound):
+            return rule.match(X), None
+
+        parent_fingerprint = getattr(parent, "fingerprint_", None)
+        if parent_fingerprint is not None:
+            return index.rematch(rule.match.bounds, parent.match_set_, parent_fingerprint)
+
+        match_set = index.match(rule.match.bounds)
+        return match_set, index.fingerprint(rule.match.bounds, match_set)
+
+    def _fit(self, rule: Rule, X: np.ndarray, y: np.ndarray, parent: Rule = None) -> Rule:
+        match_set, fingerprint = self._match(X, rule, parent=parent)
+        if fingerprint is not None and fingerprint == getattr(parent, "fingerprint_", None):
+            rule = self._inherit_fit(rule, parent)
+            rule.fingerprint_ = fingerprint
+            return rule
+        return rule.fit(X, y, match_set=match_set, fingerprint=fingerprint)
+
+    @staticmethod
+    def _inherit_fit(rule: Rule, parent: Rule) -> Rule:
+        """The local model only depends on the matched samples, so the fit of a parent matching the same samples
+        can be reused."""
+
+        count("rule_fit_cache_hits")
+        rule.model = copy.deepcopy(parent.model)
+        rule.match_set_ = parent.match_set_
+        rule.pred_ = parent.pred_
+        rule.error_ = parent.error_
+        rule.experience_ = parent.experience_
+        rule.fitness_ = rule.fitness(rule)
+        rule.is_fitted_ = True
+        return rule
+
+    def _match_survivor(self, X: np.ndarray, rule: Rule):
+        rule.match_set_, rule.fingerprint_ = self._match(X, rule)
+        rule.pred_ = rule.model.predict(X[rule.match_set_])
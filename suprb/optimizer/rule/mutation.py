@@ -7,7 +7,7 @@ import warnings
 from suprb.rule import Rule
 from suprb.utils import RandomState
 from suprb.optimizer.rule.generation_operator import GenerationOperator
-from suprb.rule.matching import MatchingFunction
+from suprb.rule.matching import MatchingFunction, OrderedBound
 
 
 class RuleMutation(GenerationOperator):
@@ -34,6 +34,21 @@ class RuleMutation(GenerationOperator):
         warnings.warn("No matching_type was set! This will impact mutation.")
         pass
 
+    def batch(self, rule: Rule, n: int, random_state: RandomState) -> np.ndarray:
+        """Returns the bounds of `n` mutations of `rule`, stacked with shape (n, n_features, 2).
+        Mutations with a vectorised implementation for `OrderedBound` draw the noise of all bounds at once,
+        all others mutate `n` clones one after another."""
+
+        if isinstance(self.matching_type, OrderedBound):
+            bounds = self.ordered_bound_batch(np.repeat(rule.match.bounds[None], n, axis=0), random_state)
+            if bounds is not None:
+                return bounds
+        return np.stack([self(rule, random_state=random_state).match.bounds for _ in range(n)])
+
+    def ordered_bound_batch(self, bounds: np.ndarray, random_state: RandomState):
+        """Mutates stacked ordered bounds in place. Returns None if not implemented."""
+        return None
+
 
 class SigmaRange(RuleMutation):
     """Draws the sigma used for another mutation from uniform distribution, low to high.
@@ -84,6 +99,10 @@ class Normal(RuleMutation):
         self.unordered_bound(rule, random_state)
         rule.match.bounds = np.sort(rule.match.bounds, axis=1)
 
+    def ordered_bound_batch(self, bounds: np.ndarray, random_state: RandomState):
+        bounds += random_state.normal(scale=self.sigma, size=bounds.shape)
+        return np.sort(bounds, axis=2)
+
     def center_spread(self, rule: Rule, random_state: RandomState):
         self.individual_mutate(rule, random_state)
 
@@ -105,6 +124,12 @@ class Halfnorm(RuleMutation):
         self.unordered_bound(rule, random_state)
         rule.match.bounds = np.sort(rule.match.bounds, axis=1)
 
+    def ordered_bound_batch(self, bounds: np.ndarray, random_state: RandomState):
+        mean = np.mean(bounds, axis=2)
+        bounds[:, :, 0] = mean - halfnorm.rvs(scale=self.sigma / 2, size=mean.shape, random_state=random_state)
+        bounds[:, :, 1] = mean + halfnorm.rvs(scale=self.sigma / 2, size=mean.shape, random_state=random_state)
+        return np.sort(bounds, axis=2)
+
     def center_spread(self, rule: Rule, random_state: RandomState):
         raise TypeError("Halform Mutation is not implemented for CSR")
 
@@ -124,6 +149,12 @@ class HalfnormIncrease(RuleMutation):
         bounds[:, 1] += halfnorm.rvs(scale=self.sigma / 2, size=bounds.shape[0], random_state=random_state)
         rule.match.bounds = np.sort(rule.match.bounds, axis=1)
 
+    def ordered_bound_batch(self, bounds: np.ndarray, random_state: RandomState):
+        size = bounds.shape[:2]
+        bounds[:, :, 0] -= halfnorm.rvs(scale=self.sigma / 2, size=size, random_state=random_state)
+        bounds[:, :, 1] += halfnorm.rvs(scale=self.sigma / 2, size=size, random_state=random_state)
+        return np.sort(bounds, axis=2)
+
     def center_spread(self, rule: Rule, random_state: RandomState):
         bounds = rule.match.bounds
         bounds[:, 0] += random_state.normal(scale=self.sigma[0], size=bounds.shape[0])
@@ -150,6 +181,10 @@ class Uniform(RuleMutation):
         self.unordered_bound(rule, random_state)
         rule.match.bounds = np.sort(rule.match.bounds, axis=1)
 
+    def ordered_bound_batch(self, bounds: np.ndarray, random_state: RandomState):
+        bounds += random_state.uniform(-self.sigma, self.sigma, size=bounds.shape)
+        return np.sort(bounds, axis=2)
+
     def center_spread(self, rule: Rule, random_state: RandomState):
         self.individual_mutate(rule, random_state)
 
@@ -169,6 +204,11 @@ class UniformIncrease(RuleMutation):
         bounds[:, 1] += random_state.uniform(0, self.sigma, size=bounds.shape[0])
         rule.match.bounds = np.sort(rule.match.bounds, axis=1)
 
+    def ordered_bound_batch(self, bounds: np.ndarray, random_state: RandomState):
+        bounds[:, :, 0] -= random_state.uniform(0, self.sigma, size=bounds.shape[:2])
+        bounds[:, :, 1] += random_state.uniform(0, self.sigma, size=bounds.shape[:2])
+        return np.sort(bounds, axis=2)
+
     def center_spread(self, rule: Rule, random_state: RandomState):
         bounds = rule.match.bounds
         bounds[:, 0] -= random_state.uniform(-self.sigma[0], self.sigma[0], size=bounds.shape[0])
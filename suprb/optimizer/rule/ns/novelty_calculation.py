@@ -1,7 +1,7 @@
 import numpy as np
 from suprb.rule import Rule
 from suprb.base import BaseComponent
-from scipy.spatial.distance import hamming
+from suprb.rule.match_set import hamming_distance
 from .novelty_search_type import NoveltySearchType
 from .archive import Archive, ArchiveNovel
 
@@ -33,9 +33,10 @@ class NoveltyCalculation(BaseComponent):
             if not hasattr(rule, "idx_") or rule.idx_ > len(archive):
                 rule.distances_ = []
                 for archive_rule in archive:
-                    hamming_distance = hamming(rule.match_set_, archive_rule.match_set_)
-                    archive_rule.distances_.append(hamming_distance)
-                    rule.distances_.append(hamming_distance)
+                    # Relative hamming distance, like `scipy.spatial.distance.hamming()`
+                    distance = hamming_distance(rule.match_set_, archive_rule.match_set_) / len(rule.match_set_)
+                    archive_rule.distances_.append(distance)
+                    rule.distances_.append(distance)
 
                 rule.distances_.append(0)
                 rule.idx_ = len(archive)
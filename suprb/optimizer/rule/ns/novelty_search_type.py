@@ -1,5 +1,6 @@
 import numpy as np
 from suprb.rule import Rule
+from suprb.rule.match_set import match_count
 from suprb.base import BaseComponent
 
 
@@ -24,13 +25,13 @@ class MinimalCriteria(NoveltySearchType):
         # a maximum of 25% of the population (to prevent empty populations)
         maximum_threshold = min(
             np.percentile(
-                [np.count_nonzero(rule.match_set_) for rule in rules],
+                [match_count(rule.match_set_) for rule in rules],
                 self.min_examples_matched,
             ),
             25,
         )
 
-        return [rule for rule in rules if np.count_nonzero(rule.match_set_) >= maximum_threshold]
+        return [rule for rule in rules if match_count(rule.match_set_) >= maximum_threshold]
 
 
 class LocalCompetition(NoveltySearchType):
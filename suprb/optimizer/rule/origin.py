@@ -6,6 +6,7 @@ import numpy as np
 from suprb.base import BaseComponent
 from suprb.solution import Solution
 from suprb.rule import Rule
+from suprb.rule.match_set import coverage
 from suprb.utils import RandomState
 
 
@@ -83,7 +84,8 @@ class Matching(RouletteWheelOrigin):
     """Bias the examples that were matched less than others by rules to have a higher probability to be selected."""
 
     def _calculate_weights(self, subgroup: list[Rule], **kwargs) -> np.ndarray:
-        return np.count_nonzero(np.stack([rule.match_set_ for rule in subgroup], axis=0) == 0, axis=0)
+        match_sets = [rule.match_set_ for rule in subgroup]
+        return len(match_sets) - coverage(match_sets, n_samples=match_sets[0].shape[0])
 
 
 class SquaredError(RouletteWheelOrigin):
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from suprb.rule import Rule
+
+# Per worker process: the optimizer and the training data attached from shared memory
+_worker_state = {}
+
+
+def _share(array: np.ndarray) -> tuple[shared_memory.SharedMemory, tuple]:
+    memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[...] = array
+    return memory, (memory.name, array.shape, array.dtype.str)
+
+
+def _attach(name: str, shape: tuple, dtype: str) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    # Workers share the resource tracker of the parent, which unlinks the memory in `_release()`
+    memory = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf)
+    array.flags.writeable = False
+    return memory, array
+
+
+def _init_worker(optimizer, X_spec: tuple, y_spec: tuple):
+    X_memory, X = _attach(*X_spec)
+    y_memory, y = _attach(*y_spec)
+    optimizer._prepare(X, y)
+    _worker_state.update(optimizer=optimizer, X=X, y=y, memory=(X_memory, y_memory))
+
+
+def _optimize_in_worker(initial_rule: Rule, seed: np.random.SeedSequence) -> Optional[Rule]:
+    optimizer, X, y = _worker_state["optimizer"], _worker_state["X"], _worker_state["y"]
+    rule = optimizer._optimize(X=X, y=y, initial_rule=initial_rule.fit(X, y), random_state=np.random.default_rng(seed))
+    return compact(rule)
+
+
+def compact(rule: Optional[Rule]) -> Optional[Rule]:
+    """Drops all per-sample attributes of a rule, leaving its bounds, local model, error, fitness and experience."""
+    if rule is not None:
+        for attribute in ("match_set_", "pred_", "fingerprint_"):
+            rule.__dict__.pop(attribute, None)
+    return rule
+
+
+def restore(rule: Optional[Rule], X: np.ndarray) -> Optional[Rule]:
+    """Recomputes the per-sample attributes dropped by `compact()`."""
+    if rule is not None:
+        rule.match_set_ = rule.match(X)
+        if rule.is_fitted_ and np.any(rule.match_set_):
+            rule.pred_ = rule.model.predict(X[rule.match_set_])
+        else:
+            rule.pred_ = np.array([])
+    return rule
+
+
+def _release(executor: ProcessPoolExecutor, memory: list[shared_memory.SharedMemory]):
+    executor.shutdown(wait=True, cancel_futures=True)
+    for block in memory:
+        block.close()
+        block.unlink()
+
+
+class RuleDiscoveryWorkers:
+    """Worker processes that keep the training data in shared memory and a copy of a rule discovery optimizer,
+    such that tasks only consist of an (unfitted) initial rule and a seed.
+
+    The workers are meant to live for a whole `SupRB.fit()` and are released with `close()`, or at the latest
+    when this object is garbage collected.
+
+    Parameters
+    ----------
+    optimizer: ParallelSingleRuleDiscovery
+        Unfitted copy of the optimizer whose `_optimize()` the workers run.
+    X: np.ndarray
+    y: np.ndarray
+    n_jobs: int
+        Number of worker processes.
+    """
+
+    def __init__(self, optimizer, X: np.ndarray, y: np.ndarray, n_jobs: int):
+        self.X = X
+        self.y = y
+
+        X_memory, X_spec = _share(np.ascontiguousarray(X))
+        y_memory, y_spec = _share(np.ascontiguousarray(y))
+        self._executor = ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_init_worker, initargs=(optimizer, X_spec, y_spec)
+        )
+        self._finalizer = weakref.finalize(self, _release, self._executor, [X_memory, y_memory])
+
+    def is_for(self, X: np.ndarray, y: np.ndarray) -> bool:
+        return self._finalizer.alive and X is self.X and y is self.y
+
+    def optimize(self, initial_rules: list[Rule], seeds: list[np.random.SeedSequence]) -> list[Optional[Rule]]:
+        """Runs `_optimize()` for every initial rule in the workers and returns the (restored) results in order."""
+        rules = self._executor.map(_optimize_in_worker, initial_rules, seeds)
+        return [restore(rule, self.X) for rule in rules]
+
+    def close(self):
+        self._finalizer()
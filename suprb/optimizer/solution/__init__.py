@@ -1,3 +1,4 @@
 from .archive import SolutionArchive
 from .base import SolutionComposition
+from .cache import FitnessCache
 from .sampler import SolutionSampler
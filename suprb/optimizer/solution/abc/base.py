@@ -5,6 +5,7 @@ from suprb.solution import SolutionInit
 from suprb.solution.initialization import RandomInit
 from .food import FoodSourceUpdate, Sigmoid, FoodSource
 from ..archive import Elitist, SolutionArchive
+from ..cache import FitnessCache
 from ..base import PopulationBasedSolutionComposition
 
 
@@ -31,6 +32,7 @@ class ArtificialBeeColonyAlgorithm(PopulationBasedSolutionComposition):
         If True, solutions are used from previous runs.
     n_jobs: int
         The number of threads / processes the optimization uses.
+    fitness_cache: FitnessCache
     """
 
     food_sources_: list[FoodSource]
@@ -46,6 +48,7 @@ class ArtificialBeeColonyAlgorithm(PopulationBasedSolutionComposition):
         random_state: int = None,
         n_jobs: int = 1,
         warm_start: bool = True,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -55,6 +58,7 @@ class ArtificialBeeColonyAlgorithm(PopulationBasedSolutionComposition):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
         self.trials_limit = trials_limit
@@ -81,24 +85,26 @@ class ArtificialBeeColonyAlgorithm(PopulationBasedSolutionComposition):
         for _ in range(self.n_iter):
 
             # Employed bee phase: Crossover with random other solution
-            new_solutions = []
             other_food_sources = self.random_state_.choice(self.food_sources_, size=self.population_size)
-            for food_source, other in zip(self.food_sources_, other_food_sources):
-                new = self.food(food_source, other, random_state=self.random_state_).fit(X, y)
-                new_solutions.append(new)
+            new_solutions = [
+                self.food(food_source, other, random_state=self.random_state_)
+                for food_source, other in zip(self.food_sources_, other_food_sources)
+            ]
+            new_solutions = self.evaluate(new_solutions, X, y)
 
             self.greedy_update(new_solutions)
 
             # Outlooker bee phase: Crossover with roulette wheel selection
-            new_solutions = []
             weights = np.array([source.solution.fitness_ for source in self.food_sources_])
             normalized_weights = weights / weights.sum()
             other_food_sources = self.random_state_.choice(
                 self.food_sources_, p=normalized_weights, size=self.population_size
             )
-            for food_source, other in zip(self.food_sources_, other_food_sources):
-                new = self.food(food_source, other, random_state=self.random_state_).fit(X, y)
-                new_solutions.append(new)
+            new_solutions = [
+                self.food(food_source, other, random_state=self.random_state_)
+                for food_source, other in zip(self.food_sources_, other_food_sources)
+            ]
+            new_solutions = self.evaluate(new_solutions, X, y)
 
             self.greedy_update(new_solutions)
 
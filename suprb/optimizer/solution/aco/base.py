@@ -6,6 +6,7 @@ from .builder import SolutionBuilder, Complete
 from .pheromones import PheromoneUpdate, Fitness
 from .selection import AntSelection, NBest
 from ..archive import Elitist, SolutionArchive
+from ..cache import FitnessCache
 from ..base import PopulationBasedSolutionComposition
 
 
@@ -36,6 +37,7 @@ class AntColonyOptimization(PopulationBasedSolutionComposition):
         If True, solutions are used from previous runs.
     n_jobs: int
         The number of threads / processes the optimization uses.
+    fitness_cache: FitnessCache
     """
 
     pheromone_matrix_: np.ndarray
@@ -55,6 +57,7 @@ class AntColonyOptimization(PopulationBasedSolutionComposition):
         random_state: int = None,
         n_jobs: int = 1,
         warm_start: bool = True,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -64,6 +67,7 @@ class AntColonyOptimization(PopulationBasedSolutionComposition):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
         self.evaporation_rate = evaporation_rate
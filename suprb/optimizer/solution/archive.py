@@ -4,6 +4,8 @@ import numpy as np
 
 from suprb.base import BaseComponent
 from suprb.solution import Solution
+from suprb.solution.base import fit_solutions
+from suprb.solution.genome import pad
 from suprb.rule import Rule
 
 
@@ -17,16 +19,15 @@ class SolutionArchive(BaseComponent, metaclass=ABCMeta):
     def __init__(self):
         self.population_ = []
 
-    def refit(self, X: np.ndarray, y: np.ndarray):
-        self.population_ = [solution.fit(X, y) for solution in self.population_]
+    def refit(self, X: np.ndarray, y: np.ndarray, fitness_cache=None):
+        if fitness_cache is not None:
+            self.population_ = fitness_cache(self.population_, X, y)
+        else:
+            self.population_ = fit_solutions(self.population_, X, y)
 
     def pad(self):
         for solution in self.population_:
-            solution.genome = np.pad(
-                solution.genome,
-                (0, len(self.pool_) - solution.genome.shape[0]),
-                mode="constant",
-            )
+            solution.genome = pad(solution.genome, np.zeros(len(self.pool_) - solution.genome.shape[0], dtype="bool"))
 
     @abstractmethod
     def __call__(self, new_population: list[Solution]):
@@ -1,13 +1,20 @@
 from abc import ABCMeta, abstractmethod
+from contextvars import copy_context
 from typing import Union, Optional
 
 import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
 
 from suprb.solution import Solution, SolutionInit
+from suprb.solution.base import fit_solutions
+from suprb.solution.genome import pad
+from suprb.solution.initialization import padding_size
 from suprb.optimizer import BaseOptimizer
-from suprb.rule import Rule
+from suprb.rule import Rule, RulePool
+from suprb.profiling import timer
 from suprb.utils import check_random_state
 from .archive import SolutionArchive
+from .cache import FitnessCache
 from .sampler import SolutionSampler
 
 
@@ -26,7 +33,11 @@ class SolutionComposition(BaseOptimizer, metaclass=ABCMeta):
         If False, solutions are generated new for every `optimize()` call.
         If True, solutions are used from previous runs.
     n_jobs: int
-        The number of threads / processes the optimization uses.
+        The number of threads used to fit solutions. Every call of `evaluate()` splits its solutions into up to
+        n_jobs chunks that are fitted concurrently and share the matrices of the `RulePool` without copying them.
+    fitness_cache: FitnessCache
+        If set, the fitting results of solutions are memoized, such that genomes that are encountered again
+        are not mixed anew. None disables caching.
     """
 
     pool_: list[Rule]
@@ -39,12 +50,14 @@ class SolutionComposition(BaseOptimizer, metaclass=ABCMeta):
         random_state: int,
         n_jobs: int,
         warm_start: bool,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(random_state=random_state, n_jobs=n_jobs)
         self.n_iter = n_iter
         self.init = init
         self.archive = archive
         self.warm_start = warm_start
+        self.fitness_cache = fitness_cache
 
     @abstractmethod
     def optimize(self, X: np.ndarray, y: np.ndarray, **kwargs) -> Union[Solution, list[Solution], None]:
@@ -54,10 +67,41 @@ class SolutionComposition(BaseOptimizer, metaclass=ABCMeta):
     def elitist(self) -> Optional[Solution]:
         pass
 
+    def evaluate(self, solutions: list[Solution], X: np.ndarray, y: np.ndarray) -> list[Solution]:
+        """Fits the given solutions, using the `fitness_cache` if there is one."""
+        if self.fitness_cache is not None:
+            return self.fitness_cache(solutions, X, y, fit=self._fit_solutions)
+        return self._fit_solutions(solutions, X, y)
+
+    def _fit_solutions(self, solutions: list[Solution], X: np.ndarray, y: np.ndarray) -> list[Solution]:
+        """Fits the solutions in up to `n_jobs` threads, each fitting a contiguous chunk as a batch.
+        Solutions with mixing models that are not `deterministic` are fitted sequentially, because the threads would
+        draw from their shared random state in the order they happen to be scheduled in."""
+
+        n_jobs = min(effective_n_jobs(self.n_jobs), len(solutions))
+        if n_jobs <= 1 or not all(solution.mixing.deterministic for solution in solutions):
+            return fit_solutions(solutions, X, y)
+
+        # Pools stack their matrices lazily, which must not happen concurrently
+        for pool in {id(solution.pool): solution.pool for solution in solutions}.values():
+            if isinstance(pool, RulePool):
+                pool.sync()
+
+        bounds = np.linspace(0, len(solutions), n_jobs + 1).astype(int)
+        with Parallel(n_jobs=n_jobs, prefer="threads") as parallel:
+            # Every thread runs in its own copy of the current context, e.g., to count into the active profile
+            parallel(
+                delayed(copy_context().run)(fit_solutions, solutions[start:stop], X, y)
+                for start, stop in zip(bounds, bounds[1:])
+            )
+        return solutions
+
     def _reset(self):
         super()._reset()
         if hasattr(self, "pool_"):
             del self.pool_
+        if self.fitness_cache is not None:
+            self.fitness_cache.clear()
 
 
 class PopulationBasedSolutionComposition(SolutionComposition, metaclass=ABCMeta):
@@ -75,6 +119,7 @@ class PopulationBasedSolutionComposition(SolutionComposition, metaclass=ABCMeta)
         random_state: int,
         n_jobs: int,
         warm_start: bool,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -83,6 +128,7 @@ class PopulationBasedSolutionComposition(SolutionComposition, metaclass=ABCMeta)
             warm_start=warm_start,
             random_state=random_state,
             n_jobs=n_jobs,
+            fitness_cache=fitness_cache,
         )
         self.population_size = population_size
 
@@ -99,19 +145,21 @@ class PopulationBasedSolutionComposition(SolutionComposition, metaclass=ABCMeta)
         # Pad solutions in the archive with zeros and update their fitness value,
         # because rules may were added to the pool
         if self.archive is not None:
-            self.archive.pad()
-            self.archive.pool_ = self.pool_
-            self.archive.refit(X, y)
+            with timer("archive_refit"):
+                self.archive.pad()
+                self.archive.pool_ = self.pool_
+                self.archive.refit(X, y, fitness_cache=self.fitness_cache)
 
         if self.pool_:
             self._optimize(X, y)
         else:
-            self.population_ = [self.init(self.pool_, self.random_state_).fit(X, y)]
+            self.population_ = self.evaluate([self.init(self.pool_, self.random_state_)], X, y)
 
         # Check if new solutions should be stored in the archive, store them and refit
         if self.archive is not None:
-            self.archive(self.population_)
-            self.archive.refit(X, y)
+            with timer("archive_refit"):
+                self.archive(self.population_)
+                self.archive.refit(X, y, fitness_cache=self.fitness_cache)
 
         return self.population_
 
@@ -140,7 +188,25 @@ class PopulationBasedSolutionComposition(SolutionComposition, metaclass=ABCMeta)
             self.population_ = [self.init.pad(solution, self.random_state_) for solution in self.population_]
 
     def fit_population(self, X, y):
-        self.population_ = [solution.fit(X, y) for solution in self.population_]
+        self.population_ = self.evaluate(self.population_, X, y)
+
+    def immigrate(self, solutions: list[Solution]):
+        """Replaces the least fit members of the population with the given (fitted) solutions,
+        e.g., migrants from other islands."""
+
+        self._pad_with_zeros()
+        order = sorted(range(len(self.population_)), key=lambda i: self.population_[i].fitness_)
+        for i, solution in zip(order, solutions):
+            self.population_[i] = solution
+
+    def _pad_with_zeros(self):
+        """Deselects rules that were added to the pool outside of `optimize()` in all current solutions,
+        such that their genomes match the pool again."""
+
+        for solution in self.population_:
+            solution.genome = pad(solution.genome, np.zeros(padding_size(solution), dtype=bool))
+        if self.archive is not None:
+            self.archive.pad()
 
     def _reset(self):
         super()._reset()
@@ -174,6 +240,7 @@ class MOSolutionComposition(PopulationBasedSolutionComposition, metaclass=ABCMet
         warm_start: bool,
         early_stopping_patience: int = -1,
         early_stopping_delta: float = 0,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             population_size=population_size,
@@ -183,6 +250,7 @@ class MOSolutionComposition(PopulationBasedSolutionComposition, metaclass=ABCMet
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
         self.sampler = sampler
         self.early_stopping_patience = early_stopping_patience
@@ -214,6 +282,13 @@ class MOSolutionComposition(PopulationBasedSolutionComposition, metaclass=ABCMet
     def pareto_front(self) -> list[Solution]:
         pass
 
+    def immigrate(self, solutions: list[Solution]):
+        """Adds the given (fitted) solutions to the population, leaving it to selection which solutions survive,
+        because the fitness of multiple objectives is not totally ordered."""
+
+        self._pad_with_zeros()
+        self.population_.extend(solutions)
+
     def hypervolume(self) -> float:
         return hypervolume(self.pareto_front())
 
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from suprb.base import BaseComponent
+from suprb.profiling import count
+from suprb.solution import Solution
+from suprb.solution.base import fit_solutions
+from suprb.solution.genome import pack
+
+
+class FitnessCache(BaseComponent):
+    """Bounded least-recently-used cache of the fitting results of `Solution`s.
+
+    Solutions are identified by their bit-packed genome, together with their mixing model and fitness.
+    Cache hits obtain `error_`, `complexity_` and `fitness_` without calling the mixing model.
+    Solutions whose mixing model is not `deterministic` (e.g., filters the subpopulation randomly) bypass the cache,
+    as their fitness differs between fits.
+    All entries belong to the pool (and therefore the training data) they were computed on
+    and are discarded as soon as the pool is replaced or grows, e.g., before `SolutionArchive.pad()`.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of cached solutions. The least recently used entry is evicted first.
+    """
+
+    hits_: int
+    misses_: int
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+
+        self.hits_ = 0
+        self.misses_ = 0
+        self._reset_entries()
+
+    def _reset_entries(self, pool: list = None):
+        self._entries = OrderedDict()
+        self._pool = pool
+        self._n_rules = None if pool is None else len(pool)
+
+    def validate(self, pool: list):
+        """Clear the cache if its entries were computed for another pool or for fewer rules."""
+        if pool is not self._pool or len(pool) != self._n_rules:
+            self._reset_entries(pool)
+
+    def clear(self):
+        """Discard all entries and reset the counters."""
+        self._reset_entries()
+        self.hits_ = 0
+        self.misses_ = 0
+
+    @property
+    def currsize(self) -> int:
+        return len(self._entries)
+
+    def _is_valid(self, solution: Solution) -> bool:
+        return solution.pool is self._pool and len(solution.genome) == self._n_rules and solution.mixing.deterministic
+
+    @staticmethod
+    def _key(solution: Solution) -> tuple:
+        return pack(solution.genome).tobytes(), id(solution.mixing), id(solution.fitness)
+
+    def __call__(self, solutions: list[Solution], X: np.ndarray, y: np.ndarray, fit=fit_solutions) -> list[Solution]:
+        """Fits all solutions that are not cached with `fit` (as a batch, see `fit_solutions()`)
+        and returns all solutions."""
+
+        if not solutions:
+            return solutions
+
+        self.validate(solutions[0].pool)
+
+        misses = []
+        for solution in solutions:
+            key = self._key(solution) if self._is_valid(solution) else None
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None:
+                misses.append(solution)
+                continue
+            self._entries.move_to_end(key)
+            solution.error_, solution.complexity_, solution.fitness_ = entry
+            solution.input_size_ = self._n_rules
+            solution.is_fitted_ = True
+        self.hits_ += len(solutions) - len(misses)
+        self.misses_ += len(misses)
+        count("fitness_cache_hits", len(solutions) - len(misses))
+        count("fitness_cache_misses", len(misses))
+
+        for solution in fit(misses, X, y):
+            if self._is_valid(solution):
+                key = self._key(solution)
+                self._entries[key] = (solution.error_, solution.complexity_, solution.fitness_)
+                self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return solutions
@@ -1,12 +1,19 @@
+from typing import Optional
+
 import numpy as np
 
+from suprb.rule import RulePool
+from suprb.solution import Solution
+from suprb.solution.base import fit_solutions
 from suprb.solution.initialization import SolutionInit, RandomInit
 from suprb.utils import flatten
 from .crossover import SolutionCrossover, NPoint
 from .mutation import SolutionMutation, BitFlips
 from .selection import SolutionSelection, Tournament
 from ..archive import SolutionArchive, Elitist
+from ..cache import FitnessCache
 from ..base import PopulationBasedSolutionComposition
+from ...subsample import Subsample
 
 
 class GeneticAlgorithm(PopulationBasedSolutionComposition):
@@ -30,9 +37,17 @@ class GeneticAlgorithm(PopulationBasedSolutionComposition):
         If True, solutions are used from previous runs.
     n_jobs: int
         The number of threads / processes the optimization uses.
+    fitness_cache: FitnessCache
+    subsample: Subsample
+        If set, every generation is evaluated on the next subsample of its schedule only, elitists included.
+        The best solution of a generation is then fitted on all samples, unless `Subsample.promote()` finds it
+        to be significantly worse than the best fully fitted solution so far (the incumbent), which is put back
+        into the final population. The final population is fitted on all samples again.
+        Requires the pool to be a `RulePool`, otherwise all solutions are fitted on all samples.
     """
 
     n_elitists_: int
+    incumbent_: Optional[Solution]
 
     def __init__(
         self,
@@ -49,6 +64,8 @@ class GeneticAlgorithm(PopulationBasedSolutionComposition):
         warm_start: bool = True,
         mutation_rate: float = 0.001,
         crossover_rate: float = 0.9,
+        fitness_cache: FitnessCache = None,
+        subsample: Subsample = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -58,6 +75,7 @@ class GeneticAlgorithm(PopulationBasedSolutionComposition):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
         self.mutation = mutation
@@ -66,12 +84,18 @@ class GeneticAlgorithm(PopulationBasedSolutionComposition):
         self.elitist_ratio = elitist_ratio
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
+        self.subsample = subsample
 
     def _optimize(self, X: np.ndarray, y: np.ndarray):
         self.fit_population(X, y)
 
         self.n_elitists_ = int(self.population_size * self.elitist_ratio)
 
+        subsamples = None
+        if self.subsample is not None and isinstance(self.pool_, RulePool):
+            subsamples = self.subsample.schedule(X.shape[0], self.random_state_)
+            self.incumbent_ = max(self.population_, key=lambda solution: solution.fitness_).clone()
+
         for _ in range(self.n_iter):
             # Eltitism
             elitists = sorted(self.population_, key=lambda i: i.fitness_, reverse=True)[: self.n_elitists_]
@@ -110,4 +134,36 @@ class GeneticAlgorithm(PopulationBasedSolutionComposition):
             self.population_ = elitists
             self.population_.extend(mutated_children)
 
+            if subsamples is not None:
+                self._fit_subsample(X, y, next(subsamples))
+            else:
+                self.fit_population(X, y)
+
+        if subsamples is not None:
+            # Keep the best promoted solution and make the fitness of the final population exact again
+            if not any(np.array_equal(solution.genome, self.incumbent_.genome) for solution in self.population_):
+                worst = min(range(len(self.population_)), key=lambda i: self.population_[i].fitness_)
+                self.population_[worst] = self.incumbent_
             self.fit_population(X, y)
+
+    def _fit_subsample(self, X: np.ndarray, y: np.ndarray, samples: np.ndarray):
+        """Fits the population on the given samples and promotes its best solution to a fit on all samples."""
+
+        # Fitting the solutions on a pool restricted to the subsample yields their error on it
+        pool = self.pool_.take(samples)
+        X_sub, y_sub = X[samples], y[samples]
+        candidates = fit_solutions([solution.clone(pool=pool) for solution in self.population_], X_sub, y_sub)
+        for solution, candidate in zip(self.population_, candidates):
+            for attribute in ("error_", "complexity_", "input_size_", "fitness_", "is_fitted_"):
+                setattr(solution, attribute, getattr(candidate, attribute))
+
+        best = max(range(len(candidates)), key=lambda i: candidates[i].fitness_)
+        if np.array_equal(self.population_[best].genome, self.incumbent_.genome):
+            return
+
+        incumbent = self.incumbent_.clone(pool=pool)
+        pred, incumbent_pred = candidates[best].predict(X_sub, cache=True), incumbent.predict(X_sub, cache=True)
+        if self.subsample.promote((pred - y_sub) ** 2, (incumbent_pred - y_sub) ** 2):
+            promoted = self.evaluate([self.population_[best].clone()], X, y)[0]
+            if promoted.fitness_ > self.incumbent_.fitness_:
+                self.incumbent_ = promoted
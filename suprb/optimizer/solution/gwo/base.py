@@ -4,6 +4,7 @@ from suprb.solution import SolutionInit
 from suprb.solution.initialization import RandomInit
 from .position import SolutionPositionUpdate, Sigmoid
 from ..archive import Elitist, SolutionArchive
+from ..cache import FitnessCache
 from ..base import PopulationBasedSolutionComposition
 
 
@@ -28,6 +29,7 @@ class GreyWolfOptimizer(PopulationBasedSolutionComposition):
         If True, solutions are used from previous runs.
     n_jobs: int
         The number of threads / processes the optimization uses.
+    fitness_cache: FitnessCache
     """
 
     def __init__(
@@ -41,6 +43,7 @@ class GreyWolfOptimizer(PopulationBasedSolutionComposition):
         random_state: int = None,
         n_jobs: int = 1,
         warm_start: bool = True,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -50,6 +53,7 @@ class GreyWolfOptimizer(PopulationBasedSolutionComposition):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
         self.n_leaders = n_leaders
@@ -4,6 +4,7 @@ import scipy.stats as stats
 from suprb import Solution
 from suprb.optimizer.solution.nsga2.sorting import fast_non_dominated_sort
 from suprb.solution.initialization import SolutionInit, RandomInit
+from ..cache import FitnessCache
 from ..base import MOSolutionComposition
 from suprb.solution.fitness import NormalizedMOSolutionFitness
 
@@ -35,6 +36,7 @@ class MultiObjectiveEvolutionaryAlgorithmDecomposition(MOSolutionComposition):
     random_state : int, RandomState instance or None, default=None
     warm_start: bool
     n_jobs: int
+    fitness_cache: FitnessCache
     """
 
     def __init__(
@@ -54,6 +56,7 @@ class MultiObjectiveEvolutionaryAlgorithmDecomposition(MOSolutionComposition):
         warm_start: bool = True,
         early_stopping_patience: int = -1,
         early_stopping_delta: float = 0,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -64,6 +67,7 @@ class MultiObjectiveEvolutionaryAlgorithmDecomposition(MOSolutionComposition):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
             early_stopping_patience=early_stopping_patience,
             early_stopping_delta=early_stopping_delta,
         )
@@ -136,7 +140,7 @@ class MultiObjectiveEvolutionaryAlgorithmDecomposition(MOSolutionComposition):
 
                 # crossover and mutation
                 child = self.crossover(A, B, random_state=self.random_state_)
-                child = self.mutation(child, random_state=self.random_state_).fit(X, y)
+                child = self.evaluate([self.mutation(child, random_state=self.random_state_)], X, y)[0]
 
                 # update ideal point
                 ideal_updated = False
@@ -3,6 +3,7 @@ import scipy.stats as stats
 
 from suprb import Solution
 from suprb.solution.initialization import SolutionInit, RandomInit
+from ..cache import FitnessCache
 from ..base import MOSolutionComposition
 from suprb.solution.fitness import NormalizedMOSolutionFitness
 from suprb.utils import flatten
@@ -37,6 +38,7 @@ class NonDominatedSortingGeneticAlgorithm2(MOSolutionComposition):
         If True, solutions are used from previous runs.
     n_jobs: int
         The number of threads / processes the optimization uses.
+    fitness_cache: FitnessCache
     """
 
     def __init__(
@@ -55,6 +57,7 @@ class NonDominatedSortingGeneticAlgorithm2(MOSolutionComposition):
         warm_start: bool = True,
         early_stopping_patience: int = -1,
         early_stopping_delta: float = 0,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -65,6 +68,7 @@ class NonDominatedSortingGeneticAlgorithm2(MOSolutionComposition):
             sampler=sampler,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
             early_stopping_patience=early_stopping_patience,
             early_stopping_delta=early_stopping_delta,
         )
@@ -112,7 +116,8 @@ class NonDominatedSortingGeneticAlgorithm2(MOSolutionComposition):
                 children.append(parents[-1])
 
             # Mutation
-            mutated_children = [self.mutation(child, random_state=self.random_state_).fit(X, y) for child in children]
+            mutated_children = [self.mutation(child, random_state=self.random_state_) for child in children]
+            mutated_children = self.evaluate(mutated_children, X, y)
             intermediate_pop = self.population_ + mutated_children
 
             # Selecting the next generation by the elitist of pareto rank and crowding score
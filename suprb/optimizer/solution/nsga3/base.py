@@ -3,6 +3,7 @@ import scipy.stats as stats
 
 from suprb import Solution
 from suprb.solution.initialization import SolutionInit, RandomInit
+from ..cache import FitnessCache
 from ..base import MOSolutionComposition
 from suprb.solution.fitness import NormalizedMOSolutionFitness
 from suprb.utils import flatten
@@ -39,6 +40,7 @@ class NonDominatedSortingGeneticAlgorithm3(MOSolutionComposition):
         If True, solutions are used from previous runs.
     n_jobs: int
         The number of threads / processes the optimization uses.
+    fitness_cache: FitnessCache
     """
 
     def __init__(
@@ -60,6 +62,7 @@ class NonDominatedSortingGeneticAlgorithm3(MOSolutionComposition):
         warm_start: bool = True,
         early_stopping_patience: int = -1,
         early_stopping_delta: float = 0,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -70,6 +73,7 @@ class NonDominatedSortingGeneticAlgorithm3(MOSolutionComposition):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
             early_stopping_patience=early_stopping_patience,
             early_stopping_delta=early_stopping_delta,
         )
@@ -134,7 +138,8 @@ class NonDominatedSortingGeneticAlgorithm3(MOSolutionComposition):
                 children.append(parents[-1])
 
             # Mutation
-            mutated_children = [self.mutation(child, random_state=self.random_state_).fit(X, y) for child in children]
+            mutated_children = [self.mutation(child, random_state=self.random_state_) for child in children]
+            mutated_children = self.evaluate(mutated_children, X, y)
             union_pop = self.population_ + mutated_children
             union_fitness_values = np.array([solution.fitness_ for solution in union_pop])
             union_pareto_ranks = fast_non_dominated_sort(union_fitness_values)
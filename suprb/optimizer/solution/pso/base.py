@@ -4,6 +4,7 @@ from suprb.solution import SolutionInit
 from suprb.solution.initialization import RandomInit
 from .movement import ParticleMovement, Sigmoid, Particle
 from ..archive import Elitist, SolutionArchive
+from ..cache import FitnessCache
 from ..base import PopulationBasedSolutionComposition
 
 
@@ -32,6 +33,7 @@ class ParticleSwarmOptimization(PopulationBasedSolutionComposition):
         If True, solutions are used from previous runs.
     n_jobs: int
         The number of threads / processes the optimization uses.
+    fitness_cache: FitnessCache
     """
 
     particles: list[Particle]
@@ -48,6 +50,7 @@ class ParticleSwarmOptimization(PopulationBasedSolutionComposition):
         random_state: int = None,
         n_jobs: int = 1,
         warm_start: bool = True,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -57,6 +60,7 @@ class ParticleSwarmOptimization(PopulationBasedSolutionComposition):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
         self.a_min = a_min
@@ -3,6 +3,7 @@ from abc import ABCMeta
 import numpy as np
 from suprb import Solution
 from suprb.base import BaseComponent
+from suprb.solution.genome import hamming_distance
 from suprb.utils import RandomState
 
 from suprb.optimizer.solution.utils import sigmoid_binarize
@@ -153,12 +154,6 @@ def best_random_subset_particle(particles: list[Particle], n: int, random_state:
     return max(subset, key=lambda p: p.best_solution.fitness_)
 
 
-def hamming_distance(x1: np.ndarray, x2: np.ndarray) -> int:
-    """Calculates the hamming distance between two binary arrays."""
-
-    return np.count_nonzero(x1 ^ x2)
-
-
 class BinaryQuantum(ParticleMovement):
     """
     Performs 'quantum' movement of particles completely in binary space.
@@ -3,6 +3,7 @@ import numpy as np
 from suprb.solution import SolutionInit
 from suprb.solution.initialization import RandomInit
 from ..archive import Elitist, SolutionArchive
+from ..cache import FitnessCache
 from ..base import PopulationBasedSolutionComposition
 
 
@@ -25,6 +26,7 @@ class RandomSearch(PopulationBasedSolutionComposition):
         If True, solutions are used from previous runs.
     n_jobs: int
         The number of threads / processes the optimization uses.
+    fitness_cache: FitnessCache
     """
 
     def __init__(
@@ -36,6 +38,7 @@ class RandomSearch(PopulationBasedSolutionComposition):
         random_state: int = None,
         n_jobs: int = 1,
         warm_start: bool = True,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -45,6 +48,7 @@ class RandomSearch(PopulationBasedSolutionComposition):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
     def _optimize(self, X: np.ndarray, y: np.ndarray):
@@ -52,7 +56,7 @@ class RandomSearch(PopulationBasedSolutionComposition):
 
         new_population = []
         for _ in range(self.population_size):
-            solutions = [self.init(self.pool_, self.random_state_).fit(X, y) for _ in range(self.n_iter)]
+            solutions = self.evaluate([self.init(self.pool_, self.random_state_) for _ in range(self.n_iter)], X, y)
             new_population.append(max(solutions, key=lambda i: i.fitness_))
 
         self.population_ = new_population
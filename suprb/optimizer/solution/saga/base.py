@@ -11,6 +11,7 @@ from suprb.solution.initialization import SolutionInit, RandomInit, Solution
 from suprb.utils import flatten
 
 from ..archive import Elitist, SolutionArchive
+from ..cache import FitnessCache
 from ..base import PopulationBasedSolutionComposition
 from suprb.utils import RandomState
 
@@ -44,6 +45,7 @@ class SelfAdaptingGeneticAlgorithmBase(PopulationBasedSolutionComposition):
         Pass an int for reproducible results across multiple function calls.
     n_jobs: int
         The number of threads / processes the optimization uses.
+    fitness_cache: FitnessCache
     warm_start: bool
         If False, solutions are generated new for every `optimize()` call.
         If True, solutions are used from previous runs.
@@ -66,6 +68,7 @@ class SelfAdaptingGeneticAlgorithmBase(PopulationBasedSolutionComposition):
         random_state: int,
         n_jobs: int,
         warm_start: bool,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -75,6 +78,7 @@ class SelfAdaptingGeneticAlgorithmBase(PopulationBasedSolutionComposition):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
         self.mutation = mutation
@@ -175,6 +179,7 @@ class SelfAdaptingGeneticAlgorithm1(SelfAdaptingGeneticAlgorithmBase):
         random_state: int = None,
         n_jobs: int = 1,
         warm_start: bool = True,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -190,6 +195,7 @@ class SelfAdaptingGeneticAlgorithm1(SelfAdaptingGeneticAlgorithmBase):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
         self.mutation_rate_multiplier = mutation_rate_multiplier
@@ -252,6 +258,7 @@ class SelfAdaptingGeneticAlgorithm2(SelfAdaptingGeneticAlgorithmBase):
         random_state: int = None,
         n_jobs: int = 1,
         warm_start: bool = True,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -267,6 +274,7 @@ class SelfAdaptingGeneticAlgorithm2(SelfAdaptingGeneticAlgorithmBase):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
         self.mutation_rate_min = mutation_rate_min
@@ -299,8 +307,7 @@ class SelfAdaptingGeneticAlgorithm2(SelfAdaptingGeneticAlgorithmBase):
         return solution.clone(genome=genome)
 
     def mutate_children(self, children, X, y):
-        for child in children:
-            child.fit(X, y)
+        self.evaluate(children, X, y)
 
         mutated_children = [self.mutate_func(child) for child in children]
 
@@ -398,6 +405,7 @@ class SelfAdaptingGeneticAlgorithm3(SelfAdaptingGeneticAlgorithmBase):
         n_jobs: int = 1,
         warm_start: bool = True,
         parameter_mutation_rate=0.05,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -413,6 +421,7 @@ class SelfAdaptingGeneticAlgorithm3(SelfAdaptingGeneticAlgorithmBase):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
         self.parameter_mutation_rate = parameter_mutation_rate
@@ -453,6 +462,7 @@ class SasGeneticAlgorithm(SelfAdaptingGeneticAlgorithmBase):
         warm_start: bool = True,
         mutation_rate: float = 0.001,
         crossover_rate: float = 0.9,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -468,6 +478,7 @@ class SasGeneticAlgorithm(SelfAdaptingGeneticAlgorithmBase):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
         )
 
         self.initial_population_size = initial_population_size
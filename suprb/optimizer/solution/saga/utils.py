@@ -12,6 +12,7 @@ from sklearn.metrics import mean_squared_error
 
 from suprb.rule import Rule
 from suprb.solution.base import MixingModel, Solution, SolutionFitness
+from suprb.solution.genome import pack_like, pad, popcount
 from suprb.base import BaseComponent
 from suprb.utils import RandomState
 from suprb.optimizer.solution.archive import SolutionArchive
@@ -42,12 +43,14 @@ class SagaSolution(Solution):
         pred = self.predict(X, cache=True)
         self.error_ = max(mean_squared_error(y, pred), 1e-4)
         self.input_size_ = self.genome.shape[0]
-        self.complexity_ = np.sum(self.genome).item()  # equivalent to np.count_nonzero, but possibly faster
+        self.complexity_ = popcount(self.genome)
         self.fitness_ = self.fitness(self)
         self.is_fitted_ = True
         return self
 
     def clone(self, **kwargs) -> SagaSolution:
+        if "genome" in kwargs:
+            kwargs["genome"] = pack_like(kwargs["genome"], self.genome)
         args = dict(
             genome=self.genome.copy() if "genome" not in kwargs else None,
             pool=self.pool,
@@ -67,6 +70,8 @@ class SagaSolution(Solution):
                 "input_size_",
             ]
             solution.__dict__ |= {key: getattr(self, key) for key in attributes}
+        if hasattr(self, "mixture_") and "mixing" not in kwargs:
+            solution.mixture_ = self.mixture_
         return solution
 
 
@@ -90,21 +95,19 @@ class SagaRandomInit(SolutionInit):
         mixing: MixingModel = None,
         fitness: SolutionFitness = None,
         p: float = 0.5,
+        packed: bool = False,
     ):
-        super().__init__(mixing=mixing, fitness=fitness)
+        super().__init__(mixing=mixing, fitness=fitness, packed=packed)
         self.p = p
 
     def __call__(self, pool: list[Rule], random_state: RandomState) -> SagaSolution:
         return SagaSolution(
-            genome=random(len(pool), self.p, random_state),
+            genome=self._make_genome(random(len(pool), self.p, random_state)),
             pool=pool,
             mixing=self.mixing,
             fitness=self.fitness,
         )
 
     def pad(self, solution: SagaSolution, random_state: RandomState) -> SagaSolution:
-        solution.genome = np.concatenate(
-            (solution.genome, random(padding_size(solution), self.p, random_state)),
-            axis=0,
-        )
+        solution.genome = pad(solution.genome, random(padding_size(solution), self.p, random_state))
         return solution
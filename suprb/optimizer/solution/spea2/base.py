@@ -7,6 +7,7 @@ from suprb.solution.initialization import SolutionInit, RandomInit
 from suprb.utils import flatten
 from .sorting import fast_non_dominated_sort
 
+from ..cache import FitnessCache
 from ..base import MOSolutionComposition
 from .mutation import SolutionMutation, BitFlips
 from .selection import SolutionSelection, BinaryTournament
@@ -38,6 +39,7 @@ class StrengthParetoEvolutionaryAlgorithm2(MOSolutionComposition):
         If True, solutions are used from previous runs.
     n_jobs: int
         The number of threads / processes the optimization uses.
+    fitness_cache: FitnessCache
     """
 
     def __init__(
@@ -58,6 +60,7 @@ class StrengthParetoEvolutionaryAlgorithm2(MOSolutionComposition):
         warm_start: bool = True,
         early_stopping_patience: int = -1,
         early_stopping_delta: float = 0,
+        fitness_cache: FitnessCache = None,
     ):
         super().__init__(
             n_iter=n_iter,
@@ -70,6 +73,7 @@ class StrengthParetoEvolutionaryAlgorithm2(MOSolutionComposition):
             random_state=random_state,
             n_jobs=n_jobs,
             warm_start=warm_start,
+            fitness_cache=fitness_cache,
             early_stopping_patience=early_stopping_patience,
             early_stopping_delta=early_stopping_delta,
         )
@@ -115,7 +119,8 @@ class StrengthParetoEvolutionaryAlgorithm2(MOSolutionComposition):
                 children.append(parents[-1])
 
             # Mutation
-            mutated_children = [self.mutation(child, random_state=self.random_state_).fit(X, y) for child in children]
+            mutated_children = [self.mutation(child, random_state=self.random_state_) for child in children]
+            mutated_children = self.evaluate(mutated_children, X, y)
             self.population_ = mutated_children
 
             if self.check_early_stopping():
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Iterator, Union
+
+import numpy as np
+import scipy.stats as stats
+
+from suprb.base import BaseComponent
+from suprb.utils import RandomState
+
+
+class Subsample(BaseComponent):
+    """Schedule of rotating subsamples that candidates are scored on instead of the whole training data.
+
+    The samples are shuffled once, and every draw takes the next window of this order, such that consecutive
+    draws see different samples and every sample is seen before any sample is seen twice. The window starts at
+    `size` and grows by `growth` after every draw until it covers all samples, so that estimates become more
+    precise as the optimization converges.
+
+    Candidates are only fitted on all samples once they are promoted. Whether a candidate is worth promoting is
+    decided by `promote()`, a one-sided paired t-test of its squared errors against those of the incumbent on
+    the same subsample.
+
+    Parameters
+    ----------
+    size: float or int
+        Initial size of the subsample, either as fraction of the samples (if at most 1) or as number of samples.
+    growth: float
+        Factor the size of the subsample is multiplied with after every draw.
+    min_samples: int
+        Lower bound of the size of the subsample.
+    confidence: float
+        Candidates are not promoted if they are worse than the incumbent at this confidence level.
+    """
+
+    def __init__(
+        self,
+        size: Union[float, int] = 0.1,
+        growth: float = 1.0,
+        min_samples: int = 256,
+        confidence: float = 0.95,
+    ):
+        self.size = size
+        self.growth = growth
+        self.min_samples = min_samples
+        self.confidence = confidence
+
+    def initial_size(self, n_samples: int) -> int:
+        size = self.size * n_samples if self.size <= 1 else self.size
+        return int(min(max(size, self.min_samples), n_samples))
+
+    def schedule(self, n_samples: int, random_state: RandomState) -> Iterator[np.ndarray]:
+        """Yields the (sorted) indices of the samples of every subsample.
+        The schedule has no state outside of the generator, so that concurrent optimizations can draw their own."""
+
+        size = float(self.initial_size(n_samples))
+        order = random_state.permutation(n_samples)
+        position = 0
+
+        while True:
+            n = min(int(size), n_samples)
+            if n >= n_samples:
+                yield np.arange(n_samples)
+            else:
+                if position + n > n_samples:
+                    order = random_state.permutation(n_samples)
+                    position = 0
+                yield np.sort(order[position : position + n])
+                position += n
+            size *= self.growth
+
+    def promote(self, candidate_errors: np.ndarray, incumbent_errors: np.ndarray) -> bool:
+        """Whether a candidate should be fitted on all samples, given its squared errors and the ones of the
+        incumbent on the same subsample. Candidates are promoted unless they are significantly worse."""
+
+        differences = np.asarray(candidate_errors) - np.asarray(incumbent_errors)
+        if differences.shape[0] < 2 or np.allclose(differences, differences[0]):
+            return differences.shape[0] == 0 or differences[0] <= 0
+        p_value = stats.ttest_1samp(differences, 0, alternative="greater").pvalue
+        return p_value >= 1 - self.confidence
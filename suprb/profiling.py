@@ -0,0 +1,93 @@
+"""Low-overhead timers and counters for the phases of fitting.
+
+The fitting code is instrumented with `timer()` and `count()` throughout. Both do nothing but check a flag unless
+profiling was enabled with `profiling()`, e.g., by `SupRB(profile=True)`, which then logs the collected times and
+counts of every iteration as metrics (see `DefaultLogger`).
+
+The active profile is held in a context variable, such that fits running concurrently in threads of the same process
+are profiled separately. Threads started on behalf of a fit only count into its profile if they run in a copy of its
+context (see `contextvars.copy_context()`), while code running in other processes (e.g., rule discovery with
+`n_jobs > 1`) is not profiled at all.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Optional
+
+
+class Profile:
+    """Accumulated wall-clock seconds spent in every phase and number of occurrences of every event.
+
+    Nested phases are timed independently, e.g., the time of 'rule_fit' is also part of 'rule_discovery'.
+    """
+
+    def __init__(self):
+        self.times = defaultdict(float)
+        self.counts = defaultdict(int)
+
+    @contextmanager
+    def timer(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[phase] += time.perf_counter() - start
+
+    def count(self, event: str, n: int = 1):
+        self.counts[event] += n
+
+    def metrics(self) -> dict:
+        """The times as 'time_<phase>' and the counts as 'count_<event>'."""
+        return {f"time_{phase}": value for phase, value in self.times.items()} | {
+            f"count_{event}": value for event, value in self.counts.items()
+        }
+
+    def snapshot(self) -> Profile:
+        """A copy of the current times and counts."""
+        profile = Profile()
+        profile.times.update(self.times)
+        profile.counts.update(self.counts)
+        return profile
+
+    def __sub__(self, other: Profile) -> Profile:
+        profile = Profile()
+        for phase, value in self.times.items():
+            profile.times[phase] = value - other.times.get(phase, 0.0)
+        for event, value in self.counts.items():
+            profile.counts[event] = value - other.counts.get(event, 0)
+        return profile
+
+
+_active: ContextVar[Optional[Profile]] = ContextVar("suprb_profile", default=None)
+_disabled = nullcontext()
+
+
+@contextmanager
+def profiling(profile: Profile = None):
+    """Collects all times and counts into `profile` (a new one if None) while the context is active."""
+
+    profile = profile if profile is not None else Profile()
+    token = _active.set(profile)
+    try:
+        yield profile
+    finally:
+        _active.reset(token)
+
+
+def timer(phase: str):
+    """Context manager that adds the time spent inside it to `phase`, if profiling is enabled."""
+    profile = _active.get()
+    if profile is None:
+        return _disabled
+    return profile.timer(phase)
+
+
+def count(event: str, n: int = 1):
+    """Counts `n` occurrences of `event`, if profiling is enabled."""
+    profile = _active.get()
+    if profile is not None:
+        profile.count(event, n)
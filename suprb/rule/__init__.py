@@ -1,3 +1,4 @@
 from .base import Rule, RuleFitness
 from .initialization import RuleInit
 from .fitness import VolumeRuleFitness
+from .pool import RulePool
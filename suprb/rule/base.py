@@ -9,6 +9,8 @@ from sklearn.metrics import mean_squared_error
 
 from suprb.base import SolutionBase
 from suprb.fitness import BaseFitness
+from suprb.profiling import count
+from .index import MatchFingerprint
 from .matching import MatchingFunction
 
 
@@ -37,6 +39,7 @@ class Rule(SolutionBase):
     experience_: float
     match_set_: np.ndarray
     pred_: Union[np.ndarray, None]  # only the prediction of matching points, so of x[match_]
+    fingerprint_: Union[MatchFingerprint, None]  # only available if matched with a `SampleIndex`
 
     def __init__(
         self,
@@ -50,34 +53,50 @@ class Rule(SolutionBase):
         self.model = model
         self.fitness = fitness
 
-    def fit(self, X: np.ndarray, y: np.ndarray) -> Rule:
+    def fit(
+        self, X: np.ndarray, y: np.ndarray, match_set: np.ndarray = None, fingerprint: MatchFingerprint = None
+    ) -> Rule:
+        """Fits the local model on the matched data. A precomputed `match_set` of `X` may be passed,
+        together with its `fingerprint`, which then replaces the elementwise comparison with the previous match set."""
 
         # Match input data
-        match_set = self.match(X)
+        if match_set is None:
+            match_set = self.match(X)
 
         # No reason to fit if no data point matches
-        if not np.any(match_set):
+        if (fingerprint.count == 0) if fingerprint is not None else not np.any(match_set):
             self.is_fitted_ = False
             self.error_ = np.inf
             self.fitness_ = -np.inf
             self.experience_ = 0
             self.pred_ = np.array([])
             self.match_set_ = match_set
+            self.fingerprint_ = fingerprint
             return self
 
         # No reason to refit if matched data points did not change
-        if hasattr(self, "match_set_"):
+        if fingerprint is not None and getattr(self, "fingerprint_", None) is not None:
+            if fingerprint == self.fingerprint_:
+                self.fingerprint_ = fingerprint
+                self.is_fitted_ = True
+                count("rule_fit_cache_hits")
+                return self
+        elif hasattr(self, "match_set_"):
             if (self.match_set_ == match_set).all():
                 self.is_fitted_ = True
+                count("rule_fit_cache_hits")
                 return self
 
         self.match_set_ = match_set
+        self.fingerprint_ = fingerprint
 
         # Get all data points which match the bounds.
         X, y = X[self.match_set_], y[self.match_set_]
 
         # Create and fit the model
         self.model.fit(X, y)
+        count("rules_fitted")
+        count("sklearn_fits")
 
         self.pred_ = self.model.predict(X)
         self.error_ = max(mean_squared_error(y, self.pred_), 1e-4)  # TODO: make min a parameter?
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import numpy as np
+from sklearn.base import RegressorMixin
+from sklearn.linear_model import LinearRegression, Ridge
+
+from suprb.profiling import count
+from suprb.utils import iter_chunks
+from .base import Rule
+
+
+def supports_batch_fit(model: RegressorMixin) -> bool:
+    """Whether the closed-form backend can fit `model` identically to its own `fit()`."""
+    if type(model) is Ridge:
+        return model.alpha > 0 and not model.positive and model.solver in ("auto", "cholesky")
+    if type(model) is LinearRegression:
+        return not model.positive
+    return False
+
+
+def masked_means(X: np.ndarray, y: np.ndarray, match_sets: np.ndarray) -> tuple[np.ndarray, ...]:
+    """The number of matched samples and the means of x and y over them for every match set."""
+
+    counts, sum_y = np.zeros(match_sets.shape[0]), np.zeros(match_sets.shape[0])
+    sum_x = np.zeros((match_sets.shape[0], X.shape[1]))
+    for chunk in iter_chunks(X.shape[0], row_bytes=8 * match_sets.shape[0]):
+        weights = match_sets[:, chunk].astype(float)
+        counts += weights.sum(axis=1)
+        sum_x += weights @ X[chunk]
+        sum_y += weights @ y[chunk]
+    safe_counts = np.maximum(counts, 1)
+    return counts, sum_x / safe_counts[:, None], sum_y / safe_counts
+
+
+def masked_sums(
+    X: np.ndarray, y: np.ndarray, match_sets: np.ndarray, shift_x: np.ndarray = None, shift_y: np.ndarray = None
+) -> tuple[np.ndarray, ...]:
+    """The sufficient statistics of a linear fit on every match set, i.e., the number of matched samples
+    and the sums of x, x x^T, y and x y over them.
+    If given, `shift_x` and `shift_y` of every match set are subtracted from the samples before summing. Shifting by
+    the means of the matched samples avoids the cancellation of deriving centered sums from uncentered ones."""
+
+    n_rules, n_features = match_sets.shape[0], X.shape[1]
+    counts, sum_y = np.zeros(n_rules), np.zeros(n_rules)
+    sum_x, sum_xy = np.zeros((n_rules, n_features)), np.zeros((n_rules, n_features))
+    sum_xx = np.zeros((n_rules, n_features, n_features))
+
+    # Only the matched samples are visited, which are usually few compared to all samples
+    for i, match_set in enumerate(match_sets):
+        X_matched, y_matched = X[match_set], y[match_set]
+        if shift_x is not None:
+            X_matched, y_matched = X_matched - shift_x[i], y_matched - shift_y[i]
+        counts[i] = X_matched.shape[0]
+        sum_x[i] = X_matched.sum(axis=0)
+        sum_xx[i] = X_matched.T @ X_matched
+        sum_y[i] = y_matched.sum()
+        sum_xy[i] = X_matched.T @ y_matched
+
+    return counts, sum_x, sum_xx, sum_y, sum_xy
+
+
+def solve_linear(
+    counts: np.ndarray,
+    sum_x: np.ndarray,
+    sum_xx: np.ndarray,
+    sum_y: np.ndarray,
+    sum_xy: np.ndarray,
+    alpha: float,
+    fit_intercept: bool,
+    shift_x: np.ndarray = None,
+    shift_y: np.ndarray = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Solves the (regularised) normal equations of several linear fits given by their sufficient statistics at once.
+
+    For `alpha == 0`, the pseudo-inverse yields the minimum norm solution like `lstsq`.
+    If the sums are over samples shifted by `shift_x` and `shift_y` (see `masked_sums()`), which only leaves the
+    coefficients unchanged if `fit_intercept`, the intercepts are corrected to those of the unshifted samples.
+    Returns coefficients with shape (n_rules, n_features), intercepts and the (centered) Gram matrices.
+    """
+
+    if fit_intercept:
+        mean_x = sum_x / counts[:, None]
+        mean_y = sum_y / counts
+        gram = sum_xx - counts[:, None, None] * mean_x[:, :, None] * mean_x[:, None, :]
+        rhs = sum_xy - counts[:, None] * mean_x * mean_y[:, None]
+    else:
+        gram, rhs = sum_xx, sum_xy
+
+    if alpha > 0:
+        coef = np.linalg.solve(gram + alpha * np.eye(gram.shape[1]), rhs[:, :, None])[:, :, 0]
+    else:
+        coef = (np.linalg.pinv(gram, hermitian=True) @ rhs[:, :, None])[:, :, 0]
+
+    if not fit_intercept:
+        return coef, np.zeros(counts.shape[0]), gram
+
+    intercept = mean_y - np.sum(mean_x * coef, axis=1)
+    if shift_x is not None:
+        intercept += shift_y - np.sum(shift_x * coef, axis=1)
+    return coef, intercept, gram
+
+
+def fit_rules(rules: list[Rule], X: np.ndarray, y: np.ndarray, match_sets: np.ndarray = None) -> list[Rule]:
+    """Fits several rules at once and returns them.
+
+    Rules whose local models are `Ridge` or `LinearRegression` estimators with the same parameters are fitted
+    with a single batched closed-form solve. Their models end up with the same fitted attributes `Ridge.fit()` or
+    `LinearRegression.fit()` would set, so that they can be used (and serialized) as usual.
+    All other rules, and rules that match no sample, are fitted on their own.
+    """
+
+    if match_sets is None:
+        match_sets = np.stack([rule.match(X) for rule in rules]) if rules else np.zeros((0, X.shape[0]), dtype=bool)
+
+    groups = {}
+    for index, (rule, match_set) in enumerate(zip(rules, match_sets)):
+        if supports_batch_fit(rule.model) and match_set.any():
+            key = (type(rule.model), tuple(sorted(rule.model.get_params().items())))
+            groups.setdefault(key, []).append(index)
+        else:
+            rule.fit(X, y, match_set=match_set)
+
+    for indices in groups.values():
+        model = rules[indices[0]].model
+        alpha = model.alpha if isinstance(model, Ridge) else 0
+        shift_x = shift_y = None
+        if model.fit_intercept:
+            # Two passes, such that the sums are taken over the samples centered on the means of each match set
+            _, shift_x, shift_y = masked_means(X, y, match_sets[indices])
+        sums = masked_sums(X, y, match_sets[indices], shift_x=shift_x, shift_y=shift_y)
+        coefs, intercepts, grams = solve_linear(
+            *sums, alpha=alpha, fit_intercept=model.fit_intercept, shift_x=shift_x, shift_y=shift_y
+        )
+        count("rules_fitted", len(indices))
+
+        for i, index in enumerate(indices):
+            rule, match_set = rules[index], match_sets[index]
+            set_fitted_attributes(rule.model, coefs[i], intercepts[i], grams[i], X.shape[1])
+
+            rule.match_set_ = match_set
+            # Only the matched samples are predicted, like Rule.fit() does
+            rule.pred_ = X[match_set] @ coefs[i] + intercepts[i]
+            rule.error_ = max(np.mean((y[match_set] - rule.pred_) ** 2), 1e-4)
+            rule.fitness_ = rule.fitness(rule)
+            rule.experience_ = float(np.count_nonzero(match_set))
+            rule.is_fitted_ = True
+
+    return rules
+
+
+def set_fitted_attributes(model: RegressorMixin, coef: np.ndarray, intercept: float, gram: np.ndarray, n_features):
+    model.n_features_in_ = n_features
+    model.coef_ = coef
+    model.intercept_ = np.float64(intercept) if model.fit_intercept else 0.0
+    if isinstance(model, Ridge):
+        model.n_iter_ = None
+        model.solver_ = "cholesky"
+    else:
+        # The singular values of the centered data are the square roots of the eigenvalues of its Gram matrix
+        singular = np.sqrt(np.clip(np.linalg.eigvalsh(gram)[::-1], 0, None))
+        model.singular_ = singular
+        model.rank_ = int(np.count_nonzero(singular > singular[0] * n_features * np.finfo(float).eps))
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from abc import ABCMeta, abstractmethod
+
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.dummy import DummyRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import PolynomialFeatures
+
+
+class PolynomialModel(RegressorMixin, BaseEstimator):
+    """A lightweight polynomial regression model, i.e., a linear model on the monomials of the input given by
+    `powers`, which is the common form all local models are serialised and compiled in.
+
+    Parameters
+    ----------
+    powers: np.ndarray
+        The exponent of every feature in every monomial, with shape (n_terms, n_features), like
+        `PolynomialFeatures.powers_`. The identity matrix makes a linear model, no terms at all a constant model.
+    """
+
+    coef_: np.ndarray
+    intercept_: float
+
+    def __init__(self, powers: np.ndarray = None):
+        self.powers = powers
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """The monomials of `X` with shape (n_samples, n_terms)."""
+        X = np.asarray(X, dtype=float)
+        if self.powers is None:
+            return X
+        return monomials(X, self.powers)
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> PolynomialModel:
+        features = self.transform(X)
+        features_mean, y_mean = np.mean(features, axis=0), np.mean(y)
+        self.coef_ = np.linalg.lstsq(features - features_mean, y - y_mean, rcond=None)[0]
+        self.intercept_ = float(y_mean - features_mean @ self.coef_)
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.transform(X) @ self.coef_ + self.intercept_
+
+
+def monomials(X: np.ndarray, powers: np.ndarray) -> np.ndarray:
+    """The products of the features of `X` raised to `powers`, with shape (n_samples, n_terms)."""
+
+    out = np.ones((X.shape[0], powers.shape[0]))
+    for i in range(powers.shape[1]):
+        for term in np.flatnonzero(powers[:, i]):
+            out[:, term] *= X[:, i] ** powers[term, i]
+    return out
+
+
+class LocalModelCodec(metaclass=ABCMeta):
+    """Converts fitted local models of some kind into a `PolynomialModel` with the same predictions, which only
+    holds the parameters of the model as arrays and can therefore be serialised and compiled without pickling."""
+
+    name: str
+
+    @abstractmethod
+    def accepts(self, model) -> bool:
+        pass
+
+    @abstractmethod
+    def encode(self, model, n_features: int) -> PolynomialModel:
+        pass
+
+
+class PolynomialCodec(LocalModelCodec):
+    """`PolynomialModel`s themselves."""
+
+    name = "polynomial"
+
+    def accepts(self, model) -> bool:
+        return isinstance(model, PolynomialModel)
+
+    def encode(self, model: PolynomialModel, n_features: int) -> PolynomialModel:
+        powers = model.powers if model.powers is not None else np.eye(n_features, dtype=int)
+        return _polynomial(powers, model.coef_, model.intercept_)
+
+
+class PolynomialPipelineCodec(LocalModelCodec):
+    """Pipelines of `PolynomialFeatures` followed by a linear model, e.g., `make_pipeline(PolynomialFeatures(2),
+    Ridge())`."""
+
+    name = "polynomial_pipeline"
+
+    def accepts(self, model) -> bool:
+        return (
+            isinstance(model, Pipeline)
+            and len(model.steps) == 2
+            and isinstance(model.steps[0][1], PolynomialFeatures)
+            and LinearCodec().accepts(model.steps[1][1])
+        )
+
+    def encode(self, model: Pipeline, n_features: int) -> PolynomialModel:
+        features, linear = model.steps[0][1], model.steps[1][1]
+        return _polynomial(features.powers_, linear.coef_, linear.intercept_)
+
+
+class ConstantCodec(LocalModelCodec):
+    """`DummyRegressor`s, which predict a constant."""
+
+    name = "constant"
+
+    def accepts(self, model) -> bool:
+        # Multi-output models predict one constant per target
+        return isinstance(model, DummyRegressor) and np.size(getattr(model, "constant_", 0)) == 1
+
+    def encode(self, model: DummyRegressor, n_features: int) -> PolynomialModel:
+        return _polynomial(np.zeros((0, n_features), dtype=int), np.zeros(0), model.constant_)
+
+
+class LinearCodec(LocalModelCodec):
+    """Linear models with `coef_` and `intercept_`, e.g., `LinearRegression` and `Ridge`, fitted on a single target."""
+
+    name = "linear"
+
+    def accepts(self, model) -> bool:
+        return (
+            not isinstance(model, Pipeline)
+            and hasattr(model, "coef_")
+            and hasattr(model, "intercept_")
+            and np.ndim(model.coef_) == 1
+        )
+
+    def encode(self, model, n_features: int) -> PolynomialModel:
+        return _polynomial(np.eye(n_features, dtype=int), model.coef_, model.intercept_)
+
+
+# Codecs are tried in order, such that more specific ones take precedence
+codecs: list[LocalModelCodec] = [PolynomialCodec(), PolynomialPipelineCodec(), ConstantCodec(), LinearCodec()]
+
+
+def register_codec(codec: LocalModelCodec):
+    """Adds a codec for further kinds of local models, which takes precedence over the existing ones."""
+    codecs.insert(0, codec)
+
+
+def get_codec(model) -> LocalModelCodec:
+    for codec in codecs:
+        if codec.accepts(model):
+            return codec
+    raise ValueError(f"local models of type {type(model).__name__} are not supported, register a LocalModelCodec")
+
+
+def encode_model(model, n_features: int) -> PolynomialModel:
+    """The `PolynomialModel` equivalent to a fitted local model, using the first codec that accepts it."""
+    return get_codec(model).encode(model, n_features)
+
+
+def _polynomial(powers: np.ndarray, coef: np.ndarray, intercept) -> PolynomialModel:
+    model = PolynomialModel(powers=np.asarray(powers, dtype=int))
+    model.coef_ = np.ravel(coef).astype(float)
+    model.intercept_ = float(np.ravel(intercept)[0])
+    return model
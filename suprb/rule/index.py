@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import hashlib
+from bisect import bisect_left
+
+import numpy as np
+
+from .matching import OrderedBound
+
+
+class MatchFingerprint:
+    """Compact description of the match set of an `OrderedBound` with respect to a `SampleIndex`.
+
+    Parameters
+    ----------
+    count: int
+        Number of matched samples.
+    digest: bytes
+        Hash of the bit-packed match set.
+    lower: np.ndarray
+        Per feature, the sorted position of the first sample that lies on or above the lower bound.
+    upper: np.ndarray
+        Per feature, the sorted position after the last sample that lies on or below the upper bound.
+    """
+
+    def __init__(self, count: int, digest: bytes, lower: np.ndarray, upper: np.ndarray):
+        self.count = count
+        self.digest = digest
+        self.lower = lower
+        self.upper = upper
+
+    @staticmethod
+    def hash(match_set: np.ndarray) -> bytes:
+        return hashlib.blake2b(np.packbits(match_set).tobytes(), digest_size=16).digest()
+
+    def same_boundaries(self, other: MatchFingerprint) -> bool:
+        """Equal boundary positions imply equal match sets, without looking at any sample."""
+        return np.array_equal(self.lower, other.lower) and np.array_equal(self.upper, other.upper)
+
+    def __eq__(self, other) -> bool:
+        """Whether both fingerprints describe the same match set."""
+        if not isinstance(other, MatchFingerprint):
+            return NotImplemented
+        return self.count == other.count and (self.same_boundaries(other) or self.digest == other.digest)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(count={self.count})"
+
+
+class SampleIndex:
+    """Index over the training samples that answers `OrderedBound` matching queries without comparing every sample.
+
+    For every feature, the sample indices sorted by that feature (and the sorted values) are stored.
+    The samples with l_i <= x_i <= u_i then form a contiguous range of the sorted order, which is found with
+    two binary searches. Only the samples in the smallest of these ranges are checked against the full box,
+    so that the cost of a query depends on the number of candidates instead of the number of samples.
+    If it fits into `max_table_size` floats, a copy of `X` sorted by every feature is kept as well, such that the
+    candidates are a contiguous slice instead of a gather.
+
+    Parameters
+    ----------
+    X: np.ndarray
+        The samples matching is calculated on.
+    max_table_size: int
+        Maximum number of floats the copies of `X` sorted by every feature may consist of.
+    """
+
+    # Boxes whose candidates make up more than this fraction of the samples are matched without the index
+    max_candidate_fraction = 0.75
+
+    def __init__(self, X: np.ndarray, max_table_size: int = 2**24):
+        self.X = X
+        self.n_samples, self.n_features = X.shape
+
+        self.order_ = [np.argsort(X[:, i], kind="stable") for i in range(self.n_features)]
+        self.sorted_ = [X[order, i] for i, order in enumerate(self.order_)]
+
+        self.sorted_X_ = None
+        if X.size * self.n_features <= max_table_size:
+            # Feature-major, such that every feature of a candidate slice is contiguous
+            self.sorted_X_ = [np.ascontiguousarray(X[order].T) for order in self.order_]
+
+    def is_for(self, X: np.ndarray) -> bool:
+        return X is self.X
+
+    def ranges(self, bounds: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """The sorted positions [lower, upper) of the samples inside every interval of bounds with shape
+        (..., n_features, 2), each with shape (..., n_features)."""
+
+        bounds = np.asarray(bounds)
+        lower = np.empty(bounds.shape[:-1], dtype=np.intp)
+        upper = np.empty(bounds.shape[:-1], dtype=np.intp)
+        for i in range(self.n_features):
+            lower[..., i] = np.searchsorted(self.sorted_[i], bounds[..., i, 0], side="left")
+            upper[..., i] = np.searchsorted(self.sorted_[i], bounds[..., i, 1], side="right")
+        return lower, np.maximum(upper, lower)
+
+    def _candidates(self, bounds: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """The samples inside the interval of the most selective feature and which of them lie inside the box."""
+
+        feature = np.argmin(upper - lower)
+        start, stop = lower[feature], upper[feature]
+        candidates = self.order_[feature][start:stop]
+
+        if self.sorted_X_ is not None:
+            X = self.sorted_X_[feature][:, start:stop]
+        else:
+            X = self.X[candidates].T
+
+        inside = np.ones(candidates.shape[0], dtype=bool)
+        for i in range(self.n_features):
+            if i != feature:
+                inside &= (bounds[i, 0] <= X[i]) & (X[i] <= bounds[i, 1])
+        return candidates, inside
+
+    def match_indices(self, bounds: np.ndarray) -> np.ndarray:
+        """The (unsorted) indices of the samples matched by `OrderedBound` bounds with shape (n_features, 2)."""
+        candidates, inside = self._candidates(bounds, *self.ranges(bounds))
+        return candidates[inside]
+
+    def match(self, bounds: np.ndarray) -> np.ndarray:
+        """The match set of `OrderedBound` bounds with shape (n_features, 2), equal to `OrderedBound(bounds)(X)`."""
+        return self.match_batch(np.asarray(bounds)[None])[0]
+
+    def match_batch(self, bounds: np.ndarray) -> np.ndarray:
+        """The match sets of stacked bounds with shape (n_rules, n_features, 2), equal to
+        `OrderedBound.match_batch(bounds, X)`.
+
+        Boxes that are not selective in any feature gain nothing from the index and are compared against
+        all samples at once instead.
+        """
+
+        lower, upper = self.ranges(bounds)
+        selective = np.min(upper - lower, axis=1) <= self.max_candidate_fraction * self.n_samples
+
+        match_sets = np.empty((bounds.shape[0], self.n_samples), dtype=bool)
+        if not selective.all():
+            match_sets[~selective] = OrderedBound.match_batch(bounds[~selective], self.X)
+        for k in np.flatnonzero(selective):
+            candidates, inside = self._candidates(bounds[k], lower[k], upper[k])
+            match_sets[k] = False
+            match_sets[k, candidates] = inside
+        return match_sets
+
+    def fingerprint(self, bounds: np.ndarray, match_set: np.ndarray = None) -> MatchFingerprint:
+        """The fingerprint of `OrderedBound` bounds with shape (n_features, 2) and their match set,
+        which is computed if not given."""
+
+        lower, upper = self.ranges(bounds)
+        if match_set is None:
+            match_set = self.match(bounds)
+        return MatchFingerprint(int(np.count_nonzero(match_set)), MatchFingerprint.hash(match_set), lower, upper)
+
+    def rematch(
+        self, bounds: np.ndarray, match_set: np.ndarray, fingerprint: MatchFingerprint
+    ) -> tuple[np.ndarray, MatchFingerprint]:
+        """Derives the match set and fingerprint of `bounds` from the match set and fingerprint of other bounds,
+        usually those of the parent of a mutated rule.
+
+        Only the samples whose sorted positions lie between the old and the new boundary of a feature can change.
+        Samples a bound moved away from are dropped, samples a bound moved across are checked against the new box.
+        If no boundary moved across any sample, the given match set itself is returned.
+        """
+
+        lower, upper = self.ranges(bounds)
+        if np.array_equal(lower, fingerprint.lower) and np.array_equal(upper, fingerprint.upper):
+            return match_set, MatchFingerprint(fingerprint.count, fingerprint.digest, lower, upper)
+
+        match_set = match_set.copy()
+        count = fingerprint.count
+
+        # Widened intervals: samples between the old and new boundary may now lie inside the box
+        for i in range(self.n_features):
+            for start, stop in ((lower[i], fingerprint.lower[i]), (fingerprint.upper[i], upper[i])):
+                if start < stop:
+                    added = self.order_[i][start:stop]
+                    X = self.X[added]
+                    inside = np.all((bounds[:, 0] <= X) & (X <= bounds[:, 1]), axis=1) & ~match_set[added]
+                    count += int(np.count_nonzero(inside))
+                    match_set[added[inside]] = True
+
+        # Narrowed intervals: samples between the old and new boundary now lie outside the box
+        for i in range(self.n_features):
+            for start, stop in ((fingerprint.lower[i], lower[i]), (upper[i], fingerprint.upper[i])):
+                if start < stop:
+                    removed = self.order_[i][start:stop]
+                    count -= int(np.count_nonzero(match_set[removed]))
+                    match_set[removed] = False
+
+        return match_set, MatchFingerprint(count, MatchFingerprint.hash(match_set), lower, upper)
+
+
+class RuleIndex:
+    """Index over the hyperrectangles of rules that finds the rules matching a sample without testing every rule.
+
+    For every feature, the sorted endpoints of all intervals split the axis into elementary cells, namely the
+    endpoints themselves and the open gaps between them. Every cell is covered by a fixed set of rules, which is
+    stored as a bitset (a Python int with bit r set for rule r) for single samples and as sorted array of rule ids
+    for batches. A single sample is located in one cell per feature with a binary search, and the rules matching it
+    are the intersection of the bitsets of these cells. For batches, the rules covering the smallest cell of every
+    sample are the candidates, which are then verified against the bounds, such that the cost is proportional to the
+    overlap of the rules instead of their number.
+
+    Parameters
+    ----------
+    bounds: np.ndarray
+        Lower and upper bounds of the rules with shape (n_rules, n_features, 2).
+    """
+
+    def __init__(self, bounds: np.ndarray):
+        self.bounds = bounds
+        self.n_rules, self.n_features = bounds.shape[:2]
+        self.edges_ = []
+        self.cells_ = []
+
+        # The cells of all features in one array of rule ids, cell c of feature i being
+        # members_[indptr_[offsets_[i] + c]:indptr_[offsets_[i] + c + 1]]
+        self.offsets_ = np.zeros(self.n_features + 1, dtype=np.intp)
+        members = []
+
+        rules = np.arange(self.n_rules)
+        for i in range(self.n_features):
+            lower, upper = bounds[:, i, 0], bounds[:, i, 1]
+            edges = np.unique(bounds[:, i])
+
+            # Cell 2k is the gap below edges[k] (and above edges[k - 1]), cell 2k + 1 is edges[k] itself
+            covered = []
+            for k, edge in enumerate(edges):
+                below = edges[k - 1] if k > 0 else -np.inf
+                covered.append(rules[(lower <= below) & (upper >= edge)])
+                covered.append(rules[(lower <= edge) & (upper >= edge)])
+            covered.append(rules[upper >= np.inf])
+
+            self.edges_.append(edges.tolist())
+            self.cells_.append([_bitset(cell) for cell in covered])
+            self.offsets_[i + 1] = self.offsets_[i] + len(covered)
+            members.extend(covered)
+
+        self.indptr_ = np.concatenate(([0], np.cumsum([cell.shape[0] for cell in members]))).astype(np.intp)
+        self.members_ = np.concatenate(members).astype(np.intp) if members else np.zeros(0, dtype=np.intp)
+        self._edge_arrays = [np.asarray(edges, dtype=float) for edges in self.edges_]
+
+    @property
+    def max_candidates_(self) -> int:
+        """The largest number of rules covering a single cell, which bounds the candidates of every sample."""
+        return int(np.max(np.diff(self.indptr_), initial=0))
+
+    def _cell(self, i: int, value: float) -> int:
+        edges = self.edges_[i]
+        k = bisect_left(edges, value)
+        return 2 * k + 1 if k < len(edges) and edges[k] == value else 2 * k
+
+    def _cells(self, i: int, values: np.ndarray) -> np.ndarray:
+        edges = self._edge_arrays[i]
+        k = np.searchsorted(edges, values, side="left")
+        if not edges.shape[0]:
+            return 2 * k
+        return 2 * k + (edges[np.minimum(k, edges.shape[0] - 1)] == values)
+
+    def query_bitset(self, x) -> int:
+        """The rules matching sample `x` as bitset."""
+        matched = (1 << self.n_rules) - 1
+        for i, value in enumerate(x):
+            matched &= self.cells_[i][self._cell(i, value)]
+            if not matched:
+                break
+        return matched
+
+    def query(self, x) -> list[int]:
+        """The indices of the rules matching sample `x`, in ascending order."""
+        matched = self.query_bitset(x)
+        rules = []
+        while matched:
+            lowest = matched & -matched
+            rules.append(lowest.bit_length() - 1)
+            matched ^= lowest
+        return rules
+
+    def query_batch(self, X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """All pairs of samples of `X` and rules matching them, as arrays of sample and rule indices that are sorted
+        by sample and then by rule."""
+
+        n_samples = X.shape[0]
+        if not self.n_features or not n_samples:
+            samples = np.repeat(np.arange(n_samples), self.n_rules)
+            return samples, np.tile(np.arange(self.n_rules), n_samples)
+
+        # Locate every sample in the smallest of its cells
+        cells = np.empty((self.n_features, n_samples), dtype=np.intp)
+        for i in range(self.n_features):
+            cells[i] = self.offsets_[i] + self._cells(i, X[:, i])
+        sizes = self.indptr_[cells + 1] - self.indptr_[cells]
+        pivot = np.argmin(sizes, axis=0)
+        cell = cells[pivot, np.arange(n_samples)]
+
+        # Expand the rules of these cells into candidate pairs
+        counts = sizes[pivot, np.arange(n_samples)]
+        samples = np.repeat(np.arange(n_samples), counts)
+        starts = np.repeat(self.indptr_[cell] - (np.cumsum(counts) - counts), counts)
+        rules = self.members_[starts + np.arange(samples.shape[0])]
+
+        # Verify the candidates on all features
+        matched = np.ones(samples.shape[0], dtype=bool)
+        for i in range(self.n_features):
+            values = X[samples, i]
+            matched &= (self.bounds[rules, i, 0] <= values) & (values <= self.bounds[rules, i, 1])
+        return samples[matched], rules[matched]
+
+
+def _bitset(indices: np.ndarray) -> int:
+    bitset = 0
+    for index in indices.tolist():
+        bitset |= 1 << index
+    return bitset
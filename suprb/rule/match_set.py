@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from abc import ABCMeta, abstractmethod
+from typing import Iterable, Union
+
+import numpy as np
+
+from suprb.utils import popcount_words
+
+# Roaring bitmaps split the samples into containers of this many samples
+_CONTAINER_SIZE = 2**16
+# Containers with more samples than this are stored as bitmaps, sparser ones as sorted arrays
+_ARRAY_CONTAINER_LIMIT = 4096
+
+
+class MatchSet(metaclass=ABCMeta):
+    """A compact, immutable representation of the match set of a rule over `n_samples` samples.
+
+    It behaves like a one-dimensional boolean array wherever the match set is read (by converting itself with
+    `__array__`), but the functions of this module, e.g., `coverage()` and `hamming_distance()`, operate on the
+    compact representation directly.
+    """
+
+    n_samples: int
+
+    @abstractmethod
+    def indices(self) -> np.ndarray:
+        """The sorted indices of the matched samples."""
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int:
+        pass
+
+    @property
+    def shape(self) -> tuple[int]:
+        return (self.n_samples,)
+
+    @property
+    def dtype(self):
+        return np.dtype(bool)
+
+    def __len__(self) -> int:
+        return self.n_samples
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        bits = np.zeros(self.n_samples, dtype=bool)
+        bits[self.indices()] = True
+        return bits if dtype is None else bits.astype(dtype)
+
+    def __iter__(self):
+        return iter(np.asarray(self))
+
+    def __getitem__(self, item):
+        return np.asarray(self)[item]
+
+    def __eq__(self, other):
+        return np.asarray(self) == np.asarray(other)
+
+    def any(self) -> bool:
+        return self.count() > 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(count={self.count()}, n_samples={self.n_samples})"
+
+
+class IndexMatchSet(MatchSet):
+    """Stores the sorted indices of the matched samples, which is the most compact representation for sparse
+    match sets."""
+
+    def __init__(self, indices: np.ndarray, n_samples: int):
+        self.n_samples = n_samples
+        self._indices = np.asarray(indices, dtype=np.uint32 if n_samples <= 2**32 else np.int64)
+
+    def indices(self) -> np.ndarray:
+        return self._indices
+
+    def count(self) -> int:
+        return self._indices.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self._indices.nbytes
+
+
+class PackedMatchSet(MatchSet):
+    """Stores eight samples per byte, using `np.packbits`, which is the most compact representation for dense
+    match sets."""
+
+    def __init__(self, words: np.ndarray, n_samples: int):
+        self.n_samples = n_samples
+        self.words = words
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        bits = np.unpackbits(self.words, count=self.n_samples).astype(bool)
+        return bits if dtype is None else bits.astype(dtype)
+
+    def indices(self) -> np.ndarray:
+        return np.flatnonzero(np.asarray(self))
+
+    def count(self) -> int:
+        return int(popcount_words(self.words))
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes
+
+
+class RoaringMatchSet(MatchSet):
+    """Splits the samples into containers of 2^16 samples and stores every non-empty container either as sorted
+    array of 16 bit offsets or, if it holds more than 4096 matched samples, as packed bitmap,
+    similar to roaring bitmaps. This adapts to match sets whose density differs between regions of the data."""
+
+    def __init__(self, keys: np.ndarray, containers: list[np.ndarray], n_samples: int):
+        self.n_samples = n_samples
+        self.keys = keys
+        self.containers = containers
+
+    @classmethod
+    def from_indices(cls, indices: np.ndarray, n_samples: int) -> RoaringMatchSet:
+        indices = np.asarray(indices, dtype=np.int64)
+        keys, starts = np.unique(indices // _CONTAINER_SIZE, return_index=True)
+        containers = []
+        for offsets in np.split((indices % _CONTAINER_SIZE).astype(np.uint16), starts[1:]):
+            if offsets.shape[0] > _ARRAY_CONTAINER_LIMIT:
+                bits = np.zeros(_CONTAINER_SIZE, dtype=bool)
+                bits[offsets] = True
+                containers.append(np.packbits(bits))
+            else:
+                containers.append(offsets)
+        return cls(keys, containers, n_samples)
+
+    def indices(self) -> np.ndarray:
+        if not self.containers:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(
+            [
+                key * _CONTAINER_SIZE
+                + (np.flatnonzero(np.unpackbits(container)) if container.dtype == np.uint8 else container)
+                for key, container in zip(self.keys, self.containers)
+            ]
+        ).astype(np.int64)
+
+    def count(self) -> int:
+        return sum(
+            int(popcount_words(container)) if container.dtype == np.uint8 else container.shape[0]
+            for container in self.containers
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.keys.nbytes + sum(container.nbytes for container in self.containers)
+
+
+MatchSetLike = Union[MatchSet, np.ndarray]
+
+storages = ("dense", "auto", "indices", "bitmap", "roaring")
+
+
+def compress(match_set: MatchSetLike, storage: str = "auto") -> MatchSetLike:
+    """Converts a match set into the given representation.
+
+    Parameters
+    ----------
+    match_set: MatchSetLike
+    storage: str
+        One of 'dense' (a boolean array), 'indices' (`IndexMatchSet`), 'bitmap' (`PackedMatchSet`),
+        'roaring' (`RoaringMatchSet`) or 'auto', which chooses whichever of 'indices' and 'bitmap' is smaller,
+        i.e., indices for match sets with a density below 1/32.
+    """
+
+    if storage not in storages:
+        raise ValueError(f"unknown match set storage '{storage}', expected one of {storages}")
+    if storage == "dense":
+        return np.asarray(match_set)
+
+    n_samples = match_set.shape[0]
+    indices = match_indices(match_set)
+    if storage == "auto":
+        storage = "indices" if 4 * indices.shape[0] < n_samples / 8 else "bitmap"
+
+    if storage == "indices":
+        return IndexMatchSet(indices, n_samples)
+    if storage == "bitmap":
+        return PackedMatchSet(np.packbits(np.asarray(match_set)), n_samples)
+    return RoaringMatchSet.from_indices(indices, n_samples)
+
+
+def match_indices(match_set: MatchSetLike) -> np.ndarray:
+    """The sorted indices of the matched samples."""
+    if isinstance(match_set, MatchSet):
+        return match_set.indices()
+    return np.flatnonzero(match_set)
+
+
+def as_index(match_set: MatchSetLike) -> np.ndarray:
+    """An array that selects the matched samples of data when used as index, without expanding sparse match sets."""
+    if isinstance(match_set, MatchSet):
+        return np.asarray(match_set) if isinstance(match_set, PackedMatchSet) else match_set.indices()
+    return match_set
+
+
+def match_count(match_set: MatchSetLike) -> int:
+    if isinstance(match_set, MatchSet):
+        return match_set.count()
+    return int(np.count_nonzero(match_set))
+
+
+def coverage(match_sets: Iterable[MatchSetLike], n_samples: int) -> np.ndarray:
+    """The number of match sets every sample is part of."""
+
+    counts = np.zeros(n_samples, dtype=np.int64)
+    sparse = []
+    for match_set in match_sets:
+        if isinstance(match_set, (IndexMatchSet, RoaringMatchSet)):
+            sparse.append(match_set.indices())
+        else:
+            counts += np.asarray(match_set)
+    if sparse:
+        counts += np.bincount(np.concatenate(sparse).astype(np.intp), minlength=n_samples)
+    return counts
+
+
+def hamming_distance(a: MatchSetLike, b: MatchSetLike) -> int:
+    """Number of samples exactly one of both match sets contains."""
+
+    if isinstance(a, PackedMatchSet) and isinstance(b, PackedMatchSet):
+        return int(popcount_words(a.words ^ b.words))
+    if isinstance(a, MatchSet) or isinstance(b, MatchSet):
+        a, b = match_indices(a), match_indices(b)
+        return a.shape[0] + b.shape[0] - 2 * np.intersect1d(a, b, assume_unique=True).shape[0]
+    return int(np.count_nonzero(np.asarray(a) != np.asarray(b)))
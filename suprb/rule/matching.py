@@ -3,6 +3,7 @@ from abc import ABCMeta, abstractmethod, abstractproperty
 import numpy as np
 
 from suprb.base import BaseComponent
+from suprb.utils import iter_chunks
 
 
 class MatchingFunction(BaseComponent, metaclass=ABCMeta):
@@ -55,7 +56,32 @@ class OrderedBound(MatchingFunction):
         self.bounds = np.array([]) if bounds is None else bounds
 
     def __call__(self, X: np.ndarray):
-        return np.all((self.bounds[:, 0] <= X) & (X <= self.bounds[:, 1]), axis=1)
+        # Large (e.g. memory-mapped) inputs are compared in chunks that fit into the working memory
+        chunks = list(iter_chunks(X.shape[0], row_bytes=3 * X.shape[1]))
+        if len(chunks) <= 1:
+            return np.all((self.bounds[:, 0] <= X) & (X <= self.bounds[:, 1]), axis=1)
+
+        match_set = np.empty(X.shape[0], dtype=bool)
+        for chunk in chunks:
+            X_chunk = X[chunk]
+            match_set[chunk] = np.all((self.bounds[:, 0] <= X_chunk) & (X_chunk <= self.bounds[:, 1]), axis=1)
+        return match_set
+
+    @staticmethod
+    def match_batch(bounds: np.ndarray, X: np.ndarray) -> np.ndarray:
+        """
+        Determine the match sets of several bounds at once
+        :param bounds: stacked bounds with shape (n_rules, n_features, 2)
+        :param X: data matching is calculated on
+        :return: a boolean array with shape (n_rules, n_samples)
+        """
+        match_sets = np.ones((bounds.shape[0], X.shape[0]), dtype=bool)
+        for chunk in iter_chunks(X.shape[0], row_bytes=3 * bounds.shape[0]):
+            X_chunk, match_chunk = X[chunk], match_sets[:, chunk]
+            # Broadcasting feature by feature avoids allocating an (n_rules, n_samples, n_features) array
+            for i in range(X.shape[1]):
+                match_chunk &= (bounds[:, i, 0, None] <= X_chunk[:, i]) & (X_chunk[:, i] <= bounds[:, i, 1, None])
+        return match_sets
 
     @property
     def volume_(self):
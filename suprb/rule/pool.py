@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import scipy.sparse as sparse
+
+from suprb.utils import memmap_zeros
+from .base import Rule
+from .match_set import as_index, match_indices
+
+
+class RulePool(list):
+    """A list of `Rule`s that additionally stacks the cached fitting results of its rules into matrices.
+
+    Row i of `match_matrix_` holds the `match_set_` of the i-th rule in the pool and row i of `pred_matrix_` its
+    `pred_`, scattered to the matched samples and zero everywhere else.
+    The matrices are synchronised lazily and grown with amortised doubling, so that the mixing model can compute
+    the cached prediction of any subpopulation with a single matrix-vector product instead of a loop over rules.
+
+    Note that the pool is assumed to only grow by appending fitted rules, which is the case during fitting.
+    Removing rules triggers a full rebuild, replacing rules in place is not detected.
+
+    Parameters
+    ----------
+    rules: Iterable[Rule]
+    memmap: bool
+        If True, the matrices are backed by anonymous temporary files instead of memory, which is useful if the
+        training data is memory-mapped as well because it does not fit into memory.
+    sparse: bool
+        If True, the matrices are `scipy.sparse.csr_array`s that only hold the matched samples of every rule,
+        which suits pools whose rules store compact match sets (see `suprb.rule.match_set`).
+    """
+
+    n_synced_: int
+
+    def __init__(self, rules: Iterable[Rule] = (), memmap: bool = False, sparse: bool = False):
+        super().__init__(rules)
+        self.memmap = memmap
+        self.sparse = sparse
+        self._reset_matrices()
+
+    def _reset_matrices(self):
+        self.n_synced_ = 0
+        self._match_matrix = None
+        self._pred_matrix = None
+        self._rows = {}
+
+    def sync(self):
+        """Stack all rules that were added since the last call.
+        Must be called before the matrices are read from several threads at once."""
+
+        n_rules = len(self)
+        if n_rules < self.n_synced_:
+            self._reset_matrices()
+        if n_rules == self.n_synced_:
+            return
+
+        if self.sparse:
+            self._sync_sparse(n_rules)
+            return
+
+        capacity = 0 if self._match_matrix is None else self._match_matrix.shape[0]
+        if n_rules > capacity:
+            capacity = max(n_rules, 2 * capacity, 16)
+            n_samples = self[0].match_set_.shape[0]
+            zeros = memmap_zeros if self.memmap else np.zeros
+            match_matrix = zeros((capacity, n_samples))
+            pred_matrix = zeros((capacity, n_samples))
+            if self.n_synced_:
+                match_matrix[: self.n_synced_] = self._match_matrix[: self.n_synced_]
+                pred_matrix[: self.n_synced_] = self._pred_matrix[: self.n_synced_]
+            self._match_matrix, self._pred_matrix = match_matrix, pred_matrix
+
+        for i in range(self.n_synced_, n_rules):
+            rule = self[i]
+            self._match_matrix[i] = rule.match_set_
+            self._pred_matrix[i, as_index(rule.match_set_)] = rule.pred_
+            self._rows[id(rule)] = i
+
+        self.n_synced_ = n_rules
+
+    def _sync_sparse(self, n_rules: int):
+        """Appends the rows of the new rules to the sparse matrices, which are kept at their exact size."""
+
+        rules = self[self.n_synced_ : n_rules]
+        indices = [match_indices(rule.match_set_) for rule in rules]
+        indptr = np.concatenate(([0], np.cumsum([row.shape[0] for row in indices])))
+        shape = (len(rules), self[0].match_set_.shape[0])
+        columns = np.concatenate(indices).astype(np.int64) if indices else np.zeros(0, dtype=np.int64)
+
+        match_rows = sparse.csr_array((np.ones(columns.shape[0]), columns, indptr), shape=shape)
+        pred_rows = sparse.csr_array((np.concatenate([rule.pred_ for rule in rules]), columns, indptr), shape=shape)
+        if self.n_synced_:
+            match_rows = sparse.vstack((self._match_matrix, match_rows), format="csr")
+            pred_rows = sparse.vstack((self._pred_matrix, pred_rows), format="csr")
+        self._match_matrix, self._pred_matrix = match_rows, pred_rows
+
+        for i, rule in enumerate(rules, start=self.n_synced_):
+            self._rows[id(rule)] = i
+        self.n_synced_ = n_rules
+
+    @property
+    def match_matrix_(self) -> np.ndarray:
+        """The match sets of all rules as float matrix with shape (n_rules, n_samples)."""
+        self.sync()
+        if self._match_matrix is None:
+            return np.zeros((0, 0))
+        return self._match_matrix if self.sparse else self._match_matrix[: len(self)]
+
+    @property
+    def pred_matrix_(self) -> np.ndarray:
+        """The cached predictions of all rules, zero for unmatched samples, with shape (n_rules, n_samples)."""
+        self.sync()
+        if self._pred_matrix is None:
+            return np.zeros((0, 0))
+        return self._pred_matrix if self.sparse else self._pred_matrix[: len(self)]
+
+    def indices(self, rules: Iterable[Rule]) -> np.ndarray:
+        """Returns the positions of the given rules in the pool."""
+        self.sync()
+        return np.array([self._rows[id(rule)] for rule in rules], dtype=int)
+
+    def take(self, samples: np.ndarray) -> RulePool:
+        """A pool of the same rules whose matrices only hold the columns of the given samples,
+        e.g., to score solutions on a subsample of the training data."""
+
+        pool = RulePool(self, sparse=self.sparse)
+        if self:
+            pool._match_matrix = self.match_matrix_[:, samples]
+            pool._pred_matrix = self.pred_matrix_[:, samples]
+            pool._rows = dict(self._rows)
+            pool.n_synced_ = len(self)
+        return pool
+
+    def __getstate__(self):
+        # The matrices are a pure cache and rebuilt on demand, so they are not pickled or copied
+        return {
+            "memmap": self.memmap,
+            "sparse": self.sparse,
+            "n_synced_": 0,
+            "_match_matrix": None,
+            "_pred_matrix": None,
+            "_rows": {},
+        }
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .batch import solve_linear
+
+
+class SufficientStatistics:
+    """Index over the training data that yields the sufficient statistics of a linear fit on any `OrderedBound` box
+    without touching the matched samples.
+
+    For one feature, cumulative sums over the samples sorted by that feature are stored, such that the sums over
+    an interval are the difference of two prefix sums, found with binary search in O(log n).
+    For two features, a summed-area table over the ranks of both features is stored, which yields the sums over a
+    box from four entries. As it needs (n + 1)^2 entries per statistic, it is only built if it has at most
+    `max_table_size` entries in total. Higher-dimensional inputs are not supported.
+    The sums are taken over the samples centered on the means of all samples, which keeps the cancellation small
+    when the centered sums of a box are derived from them.
+
+    Parameters
+    ----------
+    X: np.ndarray
+    y: np.ndarray
+    max_table_size: int
+        Maximum number of floats the summed-area table for two-dimensional inputs may consist of.
+    """
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, max_table_size: int = 2**23):
+        self.X = X
+        self.y = y
+        self.n_features = X.shape[1]
+        self.shift_x_ = X.mean(axis=0)
+        self.shift_y_ = y.mean()
+
+        # Per centered sample: 1, x, x x^T (flattened), y, x y and y^2
+        X_centered, y_centered = X - self.shift_x_, y - self.shift_y_
+        statistics = np.hstack(
+            (
+                np.ones((X.shape[0], 1)),
+                X_centered,
+                (X_centered[:, :, None] * X_centered[:, None, :]).reshape(X.shape[0], -1),
+                y_centered[:, None],
+                X_centered * y_centered[:, None],
+                y_centered[:, None] ** 2,
+            )
+        )
+
+        self.sorted_ = [np.sort(X[:, i]) for i in range(self.n_features)]
+        self.table_ = None
+
+        if self.n_features == 1:
+            order = np.argsort(X[:, 0], kind="stable")
+            self.table_ = np.zeros((X.shape[0] + 1, statistics.shape[1]))
+            np.cumsum(statistics[order], axis=0, out=self.table_[1:])
+
+        elif self.n_features == 2 and (X.shape[0] + 1) ** 2 * statistics.shape[1] <= max_table_size:
+            ranks = [np.argsort(np.argsort(X[:, i], kind="stable"), kind="stable") for i in range(2)]
+            self.table_ = np.zeros((X.shape[0] + 1, X.shape[0] + 1, statistics.shape[1]))
+            self.table_[ranks[0] + 1, ranks[1] + 1] = statistics
+            np.cumsum(self.table_, axis=0, out=self.table_)
+            np.cumsum(self.table_, axis=1, out=self.table_)
+
+    @property
+    def supported(self) -> bool:
+        return self.table_ is not None
+
+    def is_for(self, X: np.ndarray, y: np.ndarray) -> bool:
+        return X is self.X and y is self.y
+
+    def sums(self, bounds: np.ndarray) -> tuple[np.ndarray, ...]:
+        """The number of matched samples and the sums of x, x x^T, y, x y and y^2 over them for stacked
+        `OrderedBound` bounds with shape (n_rules, n_features, 2)."""
+
+        counts, sum_x, sum_xx, sum_y, sum_xy, sum_yy = self._centered_sums(bounds)
+
+        # Expansion of the sums of (x + shift_x) and (y + shift_y)
+        a, b = self.shift_x_, self.shift_y_
+        return (
+            counts,
+            sum_x + counts[:, None] * a,
+            sum_xx
+            + sum_x[:, :, None] * a[None, None, :]
+            + a[None, :, None] * sum_x[:, None, :]
+            + counts[:, None, None] * np.outer(a, a),
+            sum_y + counts * b,
+            sum_xy + b * sum_x + sum_y[:, None] * a + counts[:, None] * a * b,
+            sum_yy + 2 * b * sum_y + counts * b**2,
+        )
+
+    def _centered_sums(self, bounds: np.ndarray) -> tuple[np.ndarray, ...]:
+        """Like `sums()`, but over the samples centered on `shift_x_` and `shift_y_`."""
+
+        # Samples with l <= x <= u lie at the sorted positions [lower, upper)
+        lower = [np.searchsorted(self.sorted_[i], bounds[:, i, 0], side="left") for i in range(self.n_features)]
+        upper = [np.searchsorted(self.sorted_[i], bounds[:, i, 1], side="right") for i in range(self.n_features)]
+        upper = [np.maximum(u, l) for l, u in zip(lower, upper)]
+
+        if self.n_features == 1:
+            sums = self.table_[upper[0]] - self.table_[lower[0]]
+        else:
+            sums = (
+                self.table_[upper[0], upper[1]]
+                - self.table_[lower[0], upper[1]]
+                - self.table_[upper[0], lower[1]]
+                + self.table_[lower[0], lower[1]]
+            )
+
+        d = self.n_features
+        counts = np.rint(sums[:, 0])
+        sum_x = sums[:, 1 : 1 + d]
+        sum_xx = sums[:, 1 + d : 1 + d + d * d].reshape(-1, d, d)
+        sum_y = sums[:, 1 + d + d * d]
+        sum_xy = sums[:, 2 + d + d * d : 2 + 2 * d + d * d]
+        sum_yy = sums[:, -1]
+        return counts, sum_x, sum_xx, sum_y, sum_xy, sum_yy
+
+    def fit(self, bounds: np.ndarray, alpha: float, fit_intercept: bool = True) -> tuple[np.ndarray, ...]:
+        """Fits linear models on all boxes with at least one matched sample, without accessing the samples.
+
+        Returns the number of matched samples, coefficients, intercepts, centered Gram matrices and mean squared
+        errors. Entries of boxes that match no sample are undefined.
+        """
+
+        # Without intercept, the coefficients depend on the position of the samples, so they are fitted uncentered
+        sums = self._centered_sums if fit_intercept else self.sums
+        counts, sum_x, sum_xx, sum_y, sum_xy, sum_yy = sums(bounds)
+        safe_counts = np.maximum(counts, 1)
+        coef, intercept, gram = solve_linear(safe_counts, sum_x, sum_xx, sum_y, sum_xy, alpha, fit_intercept)
+
+        # Expansion of sum((y - intercept - x w)^2)
+        sse = (
+            sum_yy
+            - 2 * intercept * sum_y
+            - 2 * np.sum(coef * sum_xy, axis=1)
+            + safe_counts * intercept**2
+            + 2 * intercept * np.sum(coef * sum_x, axis=1)
+            + np.einsum("ki,kij,kj->k", coef, sum_xx, coef)
+        )
+        if fit_intercept:
+            # Translate the intercept of the centered samples back
+            intercept = intercept + self.shift_y_ - coef @ self.shift_x_
+        return counts, coef, intercept, gram, np.maximum(sse, 0) / safe_counts
@@ -1,3 +1,5 @@
 from .base import Solution, MixingModel, SolutionFitness
 from .fitness import ComplexitySolutionFitness, MultiObjectiveSolutionFitness
 from .initialization import SolutionInit
+from .genome import PackedGenome
+from .compiled import CompiledSolution
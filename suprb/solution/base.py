@@ -8,14 +8,20 @@ import numpy as np
 from sklearn.base import RegressorMixin
 from sklearn.metrics import mean_squared_error
 
-from suprb.rule import Rule
+from suprb.rule import Rule, RulePool
 from suprb.base import BaseComponent, SolutionBase
 from suprb.fitness import BaseFitness
+from suprb.profiling import count
+from suprb.utils import iter_chunks
+from .genome import pack_like, popcount
 
 
 class MixingModel(BaseComponent, metaclass=ABCMeta):
     """Performs mixing of local `Rule`s to obtain a complete prediction of the input space."""
 
+    # Whether solutions should carry a `Mixture` and update it from genome deltas, see `update_mixture()`
+    incremental: bool = False
+
     def __init__(self):
         pass
 
@@ -23,6 +29,32 @@ class MixingModel(BaseComponent, metaclass=ABCMeta):
     def __call__(self, X: np.ndarray, subpopulation: list[Rule], cache=False) -> np.ndarray:
         pass
 
+    def predict_genome(self, X: np.ndarray, genome: np.ndarray, pool: list[Rule]) -> np.ndarray:
+        """Mixes the cached predictions of the rules in `pool` that are selected by `genome`.
+
+        Subclasses may override this to operate on the stacked matrices of a `RulePool` directly.
+        """
+        return self(X=X, subpopulation=list(itertools.compress(pool, genome)), cache=True)
+
+    def predict_genomes(self, X: np.ndarray, genomes: np.ndarray, pool: list[Rule]) -> np.ndarray:
+        """Mixes the cached predictions for every row of `genomes`, which has shape (n_genomes, n_rules).
+        Returns an array of shape (n_genomes, n_samples).
+        """
+        return np.stack([self.predict_genome(X=X, genome=genome, pool=pool) for genome in genomes])
+
+    def update_mixture(self, X: np.ndarray, genome: np.ndarray, pool: RulePool, mixture=None):
+        """Returns the `Mixture` of `genome`, derived from the `mixture` of another genome if possible.
+        Only needs to be implemented by mixing models that support `incremental` updates.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support incremental mixing")
+
+    @property
+    def deterministic(self) -> bool:
+        """Whether mixing the same rules always yields the same prediction, i.e., no random draws are involved.
+        Only the results of deterministic mixing models may be cached or computed in any order.
+        """
+        return True
+
 
 class SolutionFitness(BaseFitness, metaclass=ABCMeta):
     """Evaluate the fitness of a `Solution`."""
@@ -56,7 +88,7 @@ class Solution(SolutionBase, RegressorMixin):
         pred = self.predict(X, cache=cache)
         self.error_ = max(mean_squared_error(y, pred), 1e-4)
         self.input_size_ = self.genome.shape[0]
-        self.complexity_ = np.sum(self.genome).item()  # equivalent to np.count_nonzero, but possibly faster
+        self.complexity_ = popcount(self.genome)
         self.fitness_ = self.fitness(self)
         self.is_fitted_ = True
         return self
@@ -69,17 +101,39 @@ class Solution(SolutionBase, RegressorMixin):
         includes rule error, fitness, predictions and the binary match string.
         It is True while fitting, because the data is identical there and caching saves a good amount of time.
         For predictions after fitting, it is false because all data needs to be recalculated from scratch.
+        If the pool is a `RulePool`, the cached prediction is computed from its stacked matrices.
+        Otherwise, inputs whose local predictions do not fit into the working memory are predicted in chunks of
+        samples (note that subpopulation filters that draw rules at random then draw them for every chunk).
         """
 
-        return self.mixing(X=X, subpopulation=self.subpopulation, cache=cache)
+        if cache and isinstance(self.pool, RulePool):
+            self._check_genome()
+            if self.mixing.incremental:
+                # Only add or subtract the rules that differ from the genome the (inherited) mixture belongs to
+                mixture = getattr(self, "mixture_", None)
+                self.mixture_ = self.mixing.update_mixture(X=X, genome=self.genome, pool=self.pool, mixture=mixture)
+                return self.mixture_.predict()
+            return self.mixing.predict_genome(X=X, genome=self.genome, pool=self.pool)
+
+        subpopulation = self.subpopulation
+        chunks = list(iter_chunks(X.shape[0], row_bytes=16 * max(len(subpopulation), 1)))
+        if cache or len(chunks) <= 1:
+            return self.mixing(X=X, subpopulation=subpopulation, cache=cache)
+        return np.concatenate([self.mixing(X=X[chunk], subpopulation=subpopulation, cache=False) for chunk in chunks])
 
     @property
     def subpopulation(self) -> list[Rule]:
         """Get all rules in the subpopulation."""
-        assert len(self.genome) == len(self.pool)
+        self._check_genome()
         return list(itertools.compress(self.pool, self.genome))
 
+    def _check_genome(self):
+        if len(self.genome) != len(self.pool):
+            raise ValueError(f"genome of length {len(self.genome)} does not match the pool of {len(self.pool)} rules")
+
     def clone(self, **kwargs) -> Solution:
+        if "genome" in kwargs:
+            kwargs["genome"] = pack_like(kwargs["genome"], self.genome)
         args = dict(
             genome=self.genome.copy() if "genome" not in kwargs else None,
             pool=self.pool,
@@ -96,7 +150,55 @@ class Solution(SolutionBase, RegressorMixin):
                 "input_size_",
             ]
             solution.__dict__ |= {key: getattr(self, key) for key in attributes}
+        if hasattr(self, "mixture_") and "mixing" not in kwargs:
+            # The mixture is never modified in place, so the clone can derive its own from it
+            solution.mixture_ = self.mixture_
         return solution
 
     def _more_str_attributes(self) -> dict:
         return {"complexity": self.complexity_}
+
+
+def fit_solutions(solutions: list[Solution], X: np.ndarray, y: np.ndarray) -> list[Solution]:
+    """Fits several solutions at once and returns them.
+
+    If all solutions share the same `RulePool` and mixing model, their predictions are computed as a single batch
+    of matrix products and error, complexity and fitness are derived vectorised from it.
+    Otherwise, or if the mixing model updates mixtures incrementally, every solution is fitted on its own.
+    If the predictions of all solutions do not fit into the working memory, the squared errors are accumulated
+    over chunks of samples.
+    """
+
+    if not solutions:
+        return solutions
+    count("solutions_fitted", len(solutions))
+
+    pool, mixing = solutions[0].pool, solutions[0].mixing
+    if (
+        not isinstance(pool, RulePool)
+        or mixing.incremental
+        or any(
+            solution.pool is not pool or solution.mixing is not mixing or len(solution.genome) != len(pool)
+            for solution in solutions
+        )
+    ):
+        return [solution.fit(X, y) for solution in solutions]
+
+    genomes = np.stack([solution.genome for solution in solutions])
+    chunks = list(iter_chunks(X.shape[0], row_bytes=24 * len(solutions)))
+    errors = np.zeros(len(solutions))
+    for chunk in chunks:
+        chunk_pool = pool if len(chunks) == 1 else pool.take(chunk)
+        pred = mixing.predict_genomes(X=X[chunk], genomes=genomes, pool=chunk_pool)
+        errors += np.sum((pred - y[chunk]) ** 2, axis=1)
+    errors = np.maximum(errors / X.shape[0], 1e-4)
+    complexities = np.count_nonzero(genomes, axis=1)
+
+    for solution, error, complexity in zip(solutions, errors, complexities):
+        solution.error_ = error.item()
+        solution.input_size_ = genomes.shape[1]
+        solution.complexity_ = complexity.item()
+        solution.fitness_ = solution.fitness(solution)
+        solution.is_fitted_ = True
+
+    return solutions
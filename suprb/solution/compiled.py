@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import numpy as np
+
+from suprb.rule.codec import encode_model, monomials
+from suprb.rule.index import RuleIndex
+from suprb.rule.matching import OrderedBound, UnorderedBound
+from suprb.utils import iter_chunks
+from .base import Solution
+from .mixing_model import ErrorExperienceHeuristic
+
+
+class CompiledSolution:
+    """A fitted `Solution` frozen into flat arrays and a `RuleIndex` over the bounds of its rules, such that
+    predicting only evaluates the rules matching each sample instead of matching and predicting every rule on all
+    samples.
+
+    Only solutions mixed with the `ErrorExperienceHeuristic`, whose rules use interval-based matching and local
+    models a `LocalModelCodec` can convert into a `PolynomialModel` (see `suprb.rule.codec`), can be compiled. The subpopulation filter of the
+    mixing model is applied once during compilation, so filters that draw rules at random are frozen as well.
+
+    Parameters
+    ----------
+    bounds: np.ndarray
+        Lower and upper bounds of all rules with shape (n_rules, n_features, 2).
+    coef: np.ndarray
+        Coefficients of the local models with shape (n_rules, n_terms).
+    intercept: np.ndarray
+        Intercepts of the local models with shape (n_rules,).
+    taus: np.ndarray
+        Mixing weights of the rules with shape (n_rules,).
+    errors: np.ndarray
+        Errors of the rules with shape (n_rules,). Not needed for predicting, but kept for serialisation.
+    experiences: np.ndarray
+        Experiences of the rules with shape (n_rules,). Not needed for predicting, but kept for serialisation.
+    powers: np.ndarray
+        Exponents of the monomials the local models are linear in, with shape (n_terms, n_features) (see
+        `PolynomialModel`). None if all local models are linear in the features themselves.
+    """
+
+    index_: RuleIndex
+
+    def __init__(
+        self,
+        bounds: np.ndarray,
+        coef: np.ndarray,
+        intercept: np.ndarray,
+        taus: np.ndarray,
+        errors: np.ndarray = None,
+        experiences: np.ndarray = None,
+        powers: np.ndarray = None,
+    ):
+        self.bounds = bounds
+        self.coef = coef
+        self.intercept = intercept
+        self.taus = taus
+        self.errors = errors
+        self.experiences = experiences
+        self.powers = powers
+
+        # Plain Python copies, which are faster to access than arrays when predicting single samples
+        self.index_ = RuleIndex(bounds)
+        self._rules = list(zip(coef.tolist(), intercept.tolist(), taus.tolist()))
+
+    @property
+    def n_rules(self) -> int:
+        return self.bounds.shape[0]
+
+    @property
+    def n_features(self) -> int:
+        return self.bounds.shape[1]
+
+    @classmethod
+    def from_solution(cls, solution: Solution, n_features: int) -> CompiledSolution:
+        mixing = solution.mixing
+        if not isinstance(mixing, ErrorExperienceHeuristic):
+            raise ValueError(f"solutions mixed with {type(mixing).__name__} can not be compiled")
+
+        subpopulation = solution.subpopulation
+        if subpopulation:
+            subpopulation = list(mixing.filter_subpopulation(subpopulation))
+
+        bounds = np.empty((len(subpopulation), n_features, 2))
+        models = []
+        for i, rule in enumerate(subpopulation):
+            if isinstance(rule.match, OrderedBound):
+                bounds[i] = rule.match.bounds
+            elif isinstance(rule.match, UnorderedBound):
+                bounds[i] = np.sort(rule.match.bounds, axis=1)
+            else:
+                raise ValueError(f"rules matching with {type(rule.match).__name__} can not be compiled")
+            models.append(encode_model(rule.model, n_features))
+
+        powers, coef = _stack_terms(models, n_features)
+        intercept = np.array([model.intercept_ for model in models], dtype=float)
+
+        taus = mixing._get_taus(subpopulation, n_features) if subpopulation else np.zeros(0)
+        return cls(
+            bounds=bounds,
+            coef=coef,
+            intercept=intercept,
+            taus=np.asarray(taus, dtype=float),
+            errors=np.array([rule.error_ for rule in subpopulation], dtype=float),
+            experiences=np.array([rule.experience_ for rule in subpopulation], dtype=float),
+            powers=powers,
+        )
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Mixes the predictions of all matching rules like `ErrorExperienceHeuristic`, but only evaluates the local
+        models of the rules the `RuleIndex` finds to match every sample. Samples are processed in chunks whose
+        candidate pairs fit into the working memory."""
+
+        X = np.asarray(X, dtype=float)
+        out = np.zeros(X.shape[0])
+        if not self.n_rules:
+            return out
+
+        n_terms = self.coef.shape[1]
+        row_bytes = 8 * (self.n_features + n_terms) + (64 + 8 * n_terms) * max(self.index_.max_candidates_, 1)
+        for chunk in iter_chunks(X.shape[0], row_bytes=row_bytes):
+            out[chunk] = self._predict_chunk(X[chunk])
+        return out
+
+    def predict_one(self, x) -> float:
+        """Predicts a single sample without any validation, only evaluating the local models of the rules the
+        `RuleIndex` finds to match it."""
+
+        if isinstance(x, np.ndarray):
+            x = x.tolist()
+
+        numerator = denominator = 0.0
+        features = x if self.powers is None else monomials(np.array([x], dtype=float), self.powers)[0].tolist()
+        for rule in self.index_.query(x):
+            coef, intercept, tau = self._rules[rule]
+            numerator += tau * (sum(c * v for c, v in zip(coef, features)) + intercept)
+            denominator += tau
+        return numerator / denominator if denominator != 0 else 0.0
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        samples, rules = self.index_.query_batch(X)
+
+        features = X if self.powers is None else monomials(X, self.powers)
+        local_pred = np.einsum("ij,ij->i", features[samples], self.coef[rules]) + self.intercept[rules]
+        taus = self.taus[rules]
+
+        pred = np.bincount(samples, weights=taus * local_pred, minlength=X.shape[0])
+        tau_sum = np.bincount(samples, weights=taus, minlength=X.shape[0])
+        tau_sum[tau_sum == 0] = 1
+        return pred / tau_sum
+
+
+def _stack_terms(models: list, n_features: int) -> tuple[np.ndarray, np.ndarray]:
+    """The union of the monomials of all models and their coefficients on it. If all models are linear in the
+    features, no monomials are needed and None is returned instead."""
+
+    identity = np.eye(n_features, dtype=int)
+    if all(np.array_equal(model.powers, identity) for model in models):
+        return None, np.array([model.coef_ for model in models], dtype=float).reshape(len(models), n_features)
+
+    powers, inverse = np.unique(
+        np.concatenate([model.powers for model in models]).reshape(-1, n_features), axis=0, return_inverse=True
+    )
+    coef = np.zeros((len(models), powers.shape[0]))
+    start = 0
+    for i, model in enumerate(models):
+        terms = np.ravel(inverse)[start : start + model.powers.shape[0]]
+        np.add.at(coef[i], terms, model.coef_)
+        start += model.powers.shape[0]
+    return powers, coef
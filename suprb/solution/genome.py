@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+
+from suprb.utils import popcount_words as _popcount
+
+
+class PackedGenome:
+    """A bit string that stores eight bits per byte, using `np.packbits`.
+
+    It behaves like a one-dimensional boolean array wherever the genome is read (by converting itself with
+    `__array__`), but takes up an eighth of the memory, supports amortised growth with `pad()` and computes
+    popcounts and hamming distances directly on its packed words.
+    Bits beyond `n_bits` are always zero, so that whole words can be compared and counted.
+    """
+
+    def __init__(self, bits=()):
+        bits = np.asarray(bits, dtype=bool)
+        self.n_bits = bits.shape[0]
+        self._words = np.packbits(bits)
+
+    @property
+    def words(self) -> np.ndarray:
+        """The packed words holding exactly `n_bits` bits."""
+        return self._words[: -(-self.n_bits // 8)]
+
+    @property
+    def shape(self) -> tuple[int]:
+        return (self.n_bits,)
+
+    @property
+    def dtype(self):
+        return np.dtype(bool)
+
+    def __len__(self) -> int:
+        return self.n_bits
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        bits = np.unpackbits(self.words, count=self.n_bits).astype(bool)
+        return bits if dtype is None else bits.astype(dtype)
+
+    def __iter__(self):
+        return iter(np.asarray(self))
+
+    def __getitem__(self, item):
+        return np.asarray(self)[item]
+
+    def __setitem__(self, key, value):
+        bits = np.asarray(self)
+        bits[key] = value
+        self._words[: -(-self.n_bits // 8)] = np.packbits(bits)
+
+    def __eq__(self, other):
+        return np.asarray(self) == np.asarray(other)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({np.asarray(self).astype(int)})"
+
+    def astype(self, dtype) -> np.ndarray:
+        return np.asarray(self, dtype=dtype)
+
+    def copy(self) -> PackedGenome:
+        genome = PackedGenome.__new__(PackedGenome)
+        genome.n_bits = self.n_bits
+        genome._words = self.words.copy()
+        return genome
+
+    def tobytes(self) -> bytes:
+        return self.words.tobytes()
+
+    def pad(self, bits) -> PackedGenome:
+        """Appends `bits` in place. The underlying buffer grows with amortised doubling."""
+
+        bits = np.asarray(bits, dtype=bool)
+        n_bits = self.n_bits + bits.shape[0]
+        n_words = -(-n_bits // 8)
+        if n_words > self._words.shape[0]:
+            words = np.zeros(max(n_words, 2 * self._words.shape[0]), dtype=np.uint8)
+            words[: self._words.shape[0]] = self._words
+            self._words = words
+
+        # Repack the bits of the last, partially filled word together with the new bits
+        start, offset = divmod(self.n_bits, 8)
+        head = np.unpackbits(self._words[start : start + 1], count=offset).astype(bool)
+        packed = np.packbits(np.concatenate((head, bits)))
+        self._words[start : start + packed.shape[0]] = packed
+        self.n_bits = n_bits
+        return self
+
+    def popcount(self) -> int:
+        return int(_popcount(self.words))
+
+    def hamming(self, other: Union[PackedGenome, np.ndarray]) -> int:
+        return int(_popcount(self.words ^ pack(other)))
+
+
+def pack(genome: Union[PackedGenome, np.ndarray]) -> np.ndarray:
+    """Returns the packed words of a genome."""
+    if isinstance(genome, PackedGenome):
+        return genome.words
+    return np.packbits(np.asarray(genome, dtype=bool))
+
+
+def pack_like(genome: Union[PackedGenome, np.ndarray], template: Union[PackedGenome, np.ndarray]):
+    """Packs `genome` if `template` is packed, such that operators that return plain arrays keep the representation."""
+    if isinstance(template, PackedGenome) and not isinstance(genome, PackedGenome):
+        return PackedGenome(genome)
+    return genome
+
+
+def pad(genome: Union[PackedGenome, np.ndarray], bits: np.ndarray) -> Union[PackedGenome, np.ndarray]:
+    """Returns a new genome with `bits` appended, leaving `genome` unchanged, as solutions may share it.
+    Packed genomes are copied together with their spare words, such that later pads still grow amortised."""
+    if isinstance(genome, PackedGenome):
+        padded = PackedGenome.__new__(PackedGenome)
+        padded.n_bits = genome.n_bits
+        padded._words = genome._words.copy()
+        return padded.pad(bits)
+    return np.concatenate((genome, np.asarray(bits, dtype=genome.dtype)), axis=0)
+
+
+def popcount(genome: Union[PackedGenome, np.ndarray]) -> int:
+    """Number of selected rules."""
+    if isinstance(genome, PackedGenome):
+        return genome.popcount()
+    return int(np.count_nonzero(genome))
+
+
+def hamming_distance(a: Union[PackedGenome, np.ndarray], b: Union[PackedGenome, np.ndarray]) -> int:
+    """Number of differing bits, computed on packed words if either genome is packed."""
+    if isinstance(a, PackedGenome):
+        return a.hamming(b)
+    if isinstance(b, PackedGenome):
+        return b.hamming(a)
+    return np.count_nonzero(a ^ b)
+
+
+def pairwise_hamming_distances(genomes: list) -> np.ndarray:
+    """Hamming distances of all pairs of genomes (in the order of `itertools.combinations`),
+    computed as XOR and popcount of their packed words."""
+
+    words = np.stack([pack(genome) for genome in genomes])
+    return np.concatenate(
+        [_popcount(words[i] ^ words[i + 1 :], axis=1) for i in range(len(genomes) - 1)] or [np.zeros(0, dtype=int)]
+    )
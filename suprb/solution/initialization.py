@@ -6,6 +6,7 @@ from suprb.base import BaseComponent
 from suprb.rule import Rule
 from . import Solution, MixingModel, SolutionFitness
 from .fitness import ComplexityWu
+from .genome import PackedGenome, pad
 from .mixing_model import ErrorExperienceHeuristic
 from ..utils import RandomState
 
@@ -23,14 +24,26 @@ def random(n: int, p: float, random_state: RandomState):
 
 
 class SolutionInit(BaseComponent, metaclass=ABCMeta):
-    """Generates initial genomes and pads existing genomes."""
+    """Generates initial genomes and pads existing genomes.
 
-    def __init__(self, mixing: MixingModel = None, fitness: SolutionFitness = None):
+    Parameters
+    ----------
+    mixing: MixingModel
+    fitness: SolutionFitness
+    packed: bool
+        If True, genomes are stored as `PackedGenome`s, which use one bit per rule and grow amortised when padded.
+    """
+
+    def __init__(self, mixing: MixingModel = None, fitness: SolutionFitness = None, packed: bool = False):
         self.mixing = mixing
         self.fitness = fitness
+        self.packed = packed
 
         self._validate_components(mixing=ErrorExperienceHeuristic(), fitness=ComplexityWu())
 
+    def _make_genome(self, genome: np.ndarray):
+        return PackedGenome(genome) if self.packed else genome
+
     @abstractmethod
     def __call__(self, pool: list[Rule], random_state: RandomState) -> Solution:
         pass
@@ -45,14 +58,14 @@ class ZeroInit(SolutionInit):
 
     def __call__(self, pool: list[Rule], random_state: RandomState) -> Solution:
         return Solution(
-            genome=np.zeros(len(pool), dtype="bool"),
+            genome=self._make_genome(np.zeros(len(pool), dtype="bool")),
             pool=pool,
             mixing=self.mixing,
             fitness=self.fitness,
         )
 
     def pad(self, solution: Solution, random_state: RandomState = None) -> Solution:
-        solution.genome = np.pad(solution.genome, (0, padding_size(solution)), mode="constant")
+        solution.genome = pad(solution.genome, np.zeros(padding_size(solution), dtype="bool"))
         return solution
 
 
@@ -64,21 +77,19 @@ class RandomInit(SolutionInit):
         mixing: MixingModel = None,
         fitness: SolutionFitness = None,
         p: float = 0.5,
+        packed: bool = False,
     ):
-        super().__init__(mixing=mixing, fitness=fitness)
+        super().__init__(mixing=mixing, fitness=fitness, packed=packed)
         self.p = p
 
     def __call__(self, pool: list[Rule], random_state: RandomState) -> Solution:
         return Solution(
-            genome=random(len(pool), self.p, random_state),
+            genome=self._make_genome(random(len(pool), self.p, random_state)),
             pool=pool,
             mixing=self.mixing,
             fitness=self.fitness,
         )
 
     def pad(self, solution: Solution, random_state: RandomState) -> Solution:
-        solution.genome = np.concatenate(
-            (solution.genome, random(padding_size(solution), self.p, random_state)),
-            axis=0,
-        )
+        solution.genome = pad(solution.genome, random(padding_size(solution), self.p, random_state))
         return solution
@@ -1,6 +1,8 @@
 import numpy as np
 
-from suprb.rule import Rule
+from suprb.rule import Rule, RulePool
+from suprb.rule.match_set import as_index
+from suprb.profiling import count
 from suprb.utils import check_random_state, RandomState
 from . import MixingModel
 
@@ -66,11 +68,56 @@ class CapExperienceWithDimensionality(ExperienceCalculation):
         return np.clip(experiences, self.lower_bound * dim, self.upper_bound * dim)
 
 
+class Mixture:
+    """
+    The running sums the prediction of a genome is mixed from, i.e., the sum of tau times local prediction
+    (`numerator`), the sum of taus (`denominator`) and the number of selected rules (`coverage`) for every sample.
+    The genome they belong to is stored alongside, such that the mixture of a slightly different genome can be
+    derived by only adding or subtracting the contributions of the rules that differ.
+    Arrays are never modified in place, so mixtures can safely be shared between solutions.
+    """
+
+    def __init__(
+        self,
+        genome: np.ndarray,
+        pool: RulePool,
+        numerator: np.ndarray,
+        denominator: np.ndarray,
+        coverage: np.ndarray,
+        n_updates: int = 0,
+    ):
+        self.genome = genome
+        self.pool = pool
+        self.numerator = numerator
+        self.denominator = denominator
+        self.coverage = coverage
+        self.n_updates = n_updates
+
+    def predict(self) -> np.ndarray:
+        # Samples no rule matches are predicted as zero. The coverage is tracked separately, because after
+        # subtracting rules the sums of these samples may only be approximately zero.
+        matched = self.coverage > 0
+        tau_sum = np.where(matched & (self.denominator != 0), self.denominator, 1)
+        return np.where(matched, self.numerator, 0) / tau_sum
+
+
 class ErrorExperienceHeuristic(MixingModel):
     """
     Performs mixing similar to the Inverse Variance Heuristic from
     https://researchportal.bath.ac.uk/en/studentTheses/learning-classifier-systems-from-first-principles-a-probabilistic,
     but using (error / experience) as a mixing function.
+
+    Parameters
+    ----------
+    filter_subpopulation: FilterSubpopulation
+    experience_calculation: ExperienceCalculation
+    experience_weight: float
+    incremental: bool
+        If True, solutions on a `RulePool` carry their `Mixture` and children derive theirs from the parent by only
+        adding or subtracting the rules that changed. Only applies to the default `FilterSubpopulation`.
+    max_updates: int
+        Number of consecutive incremental updates after which a mixture is recomputed from scratch,
+        which bounds the accumulation of floating point errors.
     """
 
     def __init__(
@@ -78,14 +125,24 @@ class ErrorExperienceHeuristic(MixingModel):
         filter_subpopulation: FilterSubpopulation = FilterSubpopulation(),
         experience_calculation: ExperienceCalculation = ExperienceCalculation(),
         experience_weight: float = 1,
+        incremental: bool = False,
+        max_updates: int = 16,
     ):
         self.input_size = None
         self.filter_subpopulation = filter_subpopulation
         self.experience_calculation = experience_calculation
         self.experience_weight = experience_weight
+        self.incremental = incremental
+        self.max_updates = max_updates
+
+    @property
+    def deterministic(self) -> bool:
+        # Subclasses of the filters may draw from their random state, like `NRandom` and `RouletteWheel` do
+        return type(self.filter_subpopulation) in (FilterSubpopulation, NBestFitness)
 
     def __call__(self, X: np.ndarray, subpopulation: list[Rule], cache=False) -> np.ndarray:
         self.input_size = X.shape[0]
+        count("mixing_calls")
 
         # No need to perform any calculation if no rule was selected.
         if not subpopulation:
@@ -104,6 +161,102 @@ class ErrorExperienceHeuristic(MixingModel):
         out = pred / tau_sum
         return out
 
+    def predict_genome(self, X: np.ndarray, genome: np.ndarray, pool: list[Rule]) -> np.ndarray:
+        if not isinstance(pool, RulePool):
+            return super().predict_genome(X=X, genome=genome, pool=pool)
+
+        return self.predict_genomes(X=X, genomes=np.asarray(genome)[None, :], pool=pool)[0]
+
+    def predict_genomes(self, X: np.ndarray, genomes: np.ndarray, pool: list[Rule]) -> np.ndarray:
+        if not isinstance(pool, RulePool):
+            return super().predict_genomes(X=X, genomes=genomes, pool=pool)
+
+        self.input_size = X.shape[0]
+        count("mixing_calls", len(genomes))
+
+        # No need to perform any calculation if the pool is empty.
+        if not pool:
+            return np.zeros((len(genomes), self.input_size))
+
+        # Prediction and normalisation of all genomes are a single matrix product each
+        weights = self._get_genome_weights(genomes, pool, X.shape[1])
+        pred = weights @ pool.pred_matrix_
+        tau_sum = weights @ pool.match_matrix_
+        tau_sum[tau_sum == 0] = 1
+
+        return pred / tau_sum
+
+    def update_mixture(self, X: np.ndarray, genome: np.ndarray, pool: RulePool, mixture: Mixture = None) -> Mixture:
+        genome = np.array(genome, dtype=bool)
+        dim = X.shape[1]
+        count("mixing_calls")
+
+        if (
+            mixture is None
+            or mixture.pool is not pool
+            or mixture.numerator.shape[0] != X.shape[0]
+            or mixture.genome.shape[0] > genome.shape[0]
+            or mixture.n_updates >= self.max_updates
+            or type(self.filter_subpopulation) is not FilterSubpopulation
+        ):
+            return self._full_mixture(X, genome, pool)
+
+        # Rules that were added to the pool since are not part of the previous genome
+        previous = np.zeros_like(genome)
+        previous[: mixture.genome.shape[0]] = mixture.genome
+        changed = np.flatnonzero(genome != previous)
+
+        if not changed.size:
+            return Mixture(genome, pool, mixture.numerator, mixture.denominator, mixture.coverage, mixture.n_updates)
+        if 2 * changed.size > genome.shape[0]:
+            return self._full_mixture(X, genome, pool)
+
+        signs = np.where(genome[changed], 1.0, -1.0)
+        taus = self._get_taus([pool[i] for i in changed], dim)
+        weights = signs * taus
+        matches = pool.match_matrix_[changed]
+
+        return Mixture(
+            genome=genome,
+            pool=pool,
+            numerator=mixture.numerator + weights @ pool.pred_matrix_[changed],
+            denominator=mixture.denominator + weights @ matches,
+            coverage=mixture.coverage + (signs * (taus != 0)) @ matches,
+            n_updates=mixture.n_updates + 1,
+        )
+
+    def _full_mixture(self, X: np.ndarray, genome: np.ndarray, pool: RulePool) -> Mixture:
+        if not pool:
+            zeros = np.zeros(X.shape[0])
+            return Mixture(genome, pool, zeros, zeros, zeros)
+
+        weights = self._get_genome_weights(genome[None, :], pool, X.shape[1])[0]
+        matches = pool.match_matrix_
+
+        return Mixture(
+            genome=genome,
+            pool=pool,
+            numerator=weights @ pool.pred_matrix_,
+            denominator=weights @ matches,
+            coverage=(weights != 0) @ matches,
+        )
+
+    def _get_genome_weights(self, genomes: np.ndarray, pool: RulePool, dim: int) -> np.ndarray:
+        """Scatters the taus of the rules each genome selects into a weight matrix of shape (n_genomes, n_rules)."""
+
+        if type(self.filter_subpopulation) is FilterSubpopulation:
+            # The default filter keeps every rule, so the weights are simply the masked taus of the pool
+            return genomes.astype(bool) * self._get_taus(pool, dim)
+
+        weights = np.zeros(genomes.shape)
+        for weight, genome in zip(weights, genomes):
+            subpopulation = [pool[i] for i in np.flatnonzero(genome)]
+            if subpopulation:
+                subpopulation = self.filter_subpopulation(subpopulation)
+                weight[pool.indices(subpopulation)] = self._get_taus(subpopulation, dim)
+
+        return weights
+
     def _get_local_pred(self, X: np.ndarray, subpopulation: list[Rule], cache: bool):
         local_pred = np.zeros((len(subpopulation), self.input_size))
 
@@ -111,7 +264,7 @@ class ErrorExperienceHeuristic(MixingModel):
             # Use the precalculated matches and predictions from fit()
             matches = [rule.match_set_ for rule in subpopulation]
             for i, rule in enumerate(subpopulation):
-                local_pred[i][matches[i]] = rule.pred_
+                local_pred[i][as_index(matches[i])] = rule.pred_
         else:
             # Generate all data new
             matches = [rule.match(X) for rule in subpopulation]
@@ -133,7 +286,7 @@ class ErrorExperienceHeuristic(MixingModel):
         # Sum all taus
         local_taus = np.zeros((len(subpopulation), self.input_size))
         for i in range(len(subpopulation)):
-            local_taus[i][matches[i]] = taus[i]
+            local_taus[i][as_index(matches[i])] = taus[i]
 
         tau_sum = np.sum(local_taus, axis=0)
         tau_sum[tau_sum == 0] = 1  # Needed, otherwise "out = pred / tau_sum" might become a divison by 0
@@ -1,24 +1,35 @@
+from __future__ import annotations
+
+import copy
 import warnings
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from contextlib import nullcontext
+from functools import partial
 
 import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
 from sklearn import clone
-from sklearn.utils import check_X_y
-from sklearn.utils.validation import check_is_fitted, check_array, validate_data
+from sklearn.utils import check_X_y, _safe_indexing
+from sklearn.utils.validation import check_is_fitted, check_array, validate_data, _num_samples
 
 
 from .base import BaseRegressor
 from .exceptions import PopulationEmptyWarning
-from .solution import Solution
+from .profiling import Profile, profiling, timer
+from .solution import CompiledSolution, Solution
 from .logging import BaseLogger, DefaultLogger
 from .optimizer.solution import SolutionComposition, ga
+from .optimizer.solution.base import PopulationBasedSolutionComposition
 from .optimizer.solution.ga import GeneticAlgorithm
 from .optimizer.rule import RuleDiscovery
 from .optimizer.rule.es import ES1xLambda
-from .rule import Rule
+from .rule import Rule, RulePool
+from .rule.match_set import compress
 from .rule.matching import MatchingFunction, OrderedBound
-from .utils import check_random_state, estimate_bounds
-from .solution.mixing_model import ErrorExperienceHeuristic
+from .utils import check_random_state, estimate_bounds, is_memory_mapped, iter_chunks
+from .solution.mixing_model import ErrorExperienceHeuristic, FilterSubpopulation
 from .solution.fitness import PseudoBIC
 
 
@@ -69,11 +80,32 @@ class SupRB(BaseRegressor):
         Sets the patience for how many iteration we try to find a better result before we do an early stopping (-1 disabling the early stopping).
     early_stopping_delta: int
         The current fitness needs to be higher than this delta of the previous iteration fitness to be considered a "better" iteration
+    pipelined: bool
+        If True, the rules of iteration t + 1 are discovered in a background thread while solutions are composed in
+        iteration t, and merged into the pool at the start of iteration t + 1. Their origins are therefore based on
+        the elitist of iteration t - 1. This pays off most if rule discovery itself runs in worker processes.
+    n_islands: int
+        If larger than one, this many independent copies of the estimator (islands) are fitted in up to n_jobs
+        processes, each with its own child of the seed sequence of `random_state`. The island with the fittest
+        elitist is adopted in the end, all of them are kept in `islands_`.
+    migration_interval: int
+        Number of iterations after which every island copies the rules of its elitist into the pool of the next
+        island and adds a solution selecting them to its population. Zero disables migration.
+    match_set_storage: str
+        Representation of the match sets of rules once they enter the pool, see `suprb.rule.match_set.compress()`.
+        Anything but 'dense' also stores the matrices of the pool as sparse matrices, which makes large pools
+        over many samples fit into memory.
+    profile: bool
+        If True, the time spent in every phase of fitting (rule discovery, origin generation, rule mutation and
+        fitting, acceptance, solution composition, archive refitting and logging) and counts of events like fitted
+        rules, sklearn fits, mixing model calls and cache hits are collected (see `suprb.profiling`). The totals are
+        stored in `profile_`, those of every iteration in `step_profile_`, which `DefaultLogger` logs as metrics.
+        The logging time of an iteration is only part of the profile of the next one.
     """
 
     step_: int = 0
 
-    pool_: list[Rule]
+    pool_: RulePool
     elitist_: Solution
 
     random_state_: np.random.Generator
@@ -90,6 +122,13 @@ class SupRB(BaseRegressor):
 
     logger_: BaseLogger
 
+    islands_: list[SupRB]
+
+    compiled_: CompiledSolution
+
+    profile_: Profile
+    step_profile_: Profile
+
     def __init__(
         self,
         rule_discovery: RuleDiscovery = None,
@@ -104,6 +143,11 @@ class SupRB(BaseRegressor):
         n_jobs: int = 1,
         early_stopping_patience: int = -1,
         early_stopping_delta: float = 0,
+        pipelined: bool = False,
+        n_islands: int = 1,
+        migration_interval: int = 8,
+        match_set_storage: str = "dense",
+        profile: bool = False,
     ):
         self.n_iter = n_iter
         self.n_initial_rules = n_initial_rules
@@ -117,6 +161,22 @@ class SupRB(BaseRegressor):
         self.n_jobs = n_jobs
         self.early_stopping_patience = early_stopping_patience
         self.early_stopping_delta = early_stopping_delta
+        self.pipelined = pipelined
+        self.n_islands = n_islands
+        self.migration_interval = migration_interval
+        self.match_set_storage = match_set_storage
+        self.profile = profile
+
+    def _log_iteration(self, X: np.ndarray, y: np.ndarray):
+        """Logs the current step, after storing its times and counts in `step_profile_` if profiling."""
+
+        if self.profile and hasattr(self, "_profile_snapshot"):
+            snapshot = self.profile_.snapshot()
+            self.step_profile_ = snapshot - self._profile_snapshot
+            self._profile_snapshot = snapshot
+
+        with timer("logging"):
+            self.logger_.log_iteration(X, y, self, iteration=self.step_)
 
     def check_early_stopping(self):
         if self.early_stopping_patience > 0:
@@ -140,7 +200,10 @@ class SupRB(BaseRegressor):
         Parameters
         ----------
         X : {array-like, sparse matrix}, shape (n_samples, n_features)
-            The training input samples.
+            The training input samples. Can be memory-mapped (e.g. `np.load(..., mmap_mode="r")` or
+            `suprb.utils.load_shards()`), in which case the matrices of the rule pool are memory-mapped as well.
+            Matching and fitting process data in chunks that fit into the `working_memory` of the sklearn
+            configuration, which can be set with `sklearn.config_context()`.
         y : array-like, shape (n_samples,) or (n_samples, n_outputs)
             The target values.
         cleanup : bool
@@ -152,6 +215,9 @@ class SupRB(BaseRegressor):
             Returns self.
         """
 
+        # A compiled elitist of a previous fit is outdated
+        self.__dict__.pop("compiled_", None)
+
         # Set these values so we gracefully exit on error
         self.early_stopping_counter_ = 0
         self.previous_fitness_ = 0
@@ -167,14 +233,46 @@ class SupRB(BaseRegressor):
         # Init sklearn interface
         self.n_features_in_ = X.shape[1]
 
+        if self.profile:
+            self.profile_ = Profile()
+            self._profile_snapshot = Profile()
+
+        with profiling(self.profile_) if self.profile else nullcontext():
+            if self.n_islands > 1:
+                return self._fit_islands(X, y, cleanup=cleanup)
+
+            if self._init_fit(X, y):
+                return self
+
+            if self._run_iterations(X, y, range(self.n_iter)) and self.is_error_:
+                return self
+
+            self._finish_fit(X, y, cleanup=cleanup)
+        return self
+
+    def _seed_sequence(self) -> np.random.SeedSequence:
+        if isinstance(self.random_state, np.random.SeedSequence):
+            # Spawning advances the sequence, so a copy keeps refits (and clones sharing it) reproducible
+            seed = self.random_state
+            return np.random.SeedSequence(
+                seed.entropy,
+                spawn_key=seed.spawn_key,
+                pool_size=seed.pool_size,
+                n_children_spawned=seed.n_children_spawned,
+            )
+        return np.random.SeedSequence(self.random_state)
+
+    def _init_fit(self, X: np.ndarray, y: np.ndarray) -> bool:
+        """Initialises all components and generates the initial rules. Returns True if an error occurred."""
+
         # Random state
         self.random_state_ = check_random_state(self.random_state)
-        seeds = np.random.SeedSequence(self.random_state).spawn(self.n_iter * 2)
+        seeds = self._seed_sequence().spawn(self.n_iter * 2)
         self.rule_discovery_seeds_ = seeds[::2]
         self.solution_composition_seeds_ = seeds[1::2]
 
         # Initialise components
-        self.pool_ = []
+        self.pool_ = RulePool(memmap=is_memory_mapped(X), sparse=self.match_set_storage != "dense")
 
         self._validate_rule_discovery(default=ES1xLambda())
         self._validate_solution_composition(default=GeneticAlgorithm())
@@ -196,28 +294,78 @@ class SupRB(BaseRegressor):
         # Fill population before first step
         if self.n_initial_rules > 0:
             if self._catch_errors(self._discover_rules, X, y, self.n_initial_rules):
-                return self
+                return True
+
+        return False
 
-        # Main loop
-        for self.step_ in range(self.n_iter):
+    def _run_iterations(self, X: np.ndarray, y: np.ndarray, steps: range) -> bool:
+        """Performs the given steps of the main loop.
+        Returns True if fitting has to stop, because an error occurred or because of early stopping."""
+
+        if self.pipelined:
+            return self._run_pipelined(X, y, steps)
+
+        for self.step_ in steps:
             # Insert new rules into population
             if self._catch_errors(self._discover_rules, X, y, self.n_rules):
-                return self
+                return True
 
             # Optimize solutions
             if self._catch_errors(self._compose_solution, X, y, False):
-                return self
+                return True
 
             # Log Iteration
-            self.logger_.log_iteration(X, y, self, iteration=self.step_)
+            self._log_iteration(X, y)
 
             if self.check_early_stopping():
-                break
+                return True
 
             self.previous_fitness_ = self.solution_composition_.elitist().fitness_
 
+        return False
+
+    def _run_pipelined(self, X: np.ndarray, y: np.ndarray, steps: range) -> bool:
+        """Performs the given steps of the main loop, while the rules of every next step are discovered in a
+        background thread during solution composition. They are merged into the pool at the start of that step."""
+
+        if not steps:
+            return False
+
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                pending = self._submit_rule_discovery(executor, X, y, steps.start)
+
+                for self.step_ in steps:
+                    # Insert the rules discovered in the background into the population
+                    if self._catch_errors(partial(self._receive_rules, pending=pending), X, y, False):
+                        return True
+
+                    if self.step_ + 1 < steps.stop:
+                        pending = self._submit_rule_discovery(executor, X, y, self.step_ + 1)
+
+                    # Optimize solutions
+                    if self._catch_errors(self._compose_solution, X, y, False):
+                        return True
+
+                    # Log Iteration
+                    self._log_iteration(X, y)
+
+                    if self.check_early_stopping():
+                        return True
+
+                    self.previous_fitness_ = self.solution_composition_.elitist().fitness_
+        finally:
+            self.rule_discovery_.pool_ = self.pool_
+
+        return False
+
+    def _finish_fit(self, X: np.ndarray, y: np.ndarray, cleanup=False):
+        # Release worker processes the rule discovery may have kept between iterations
+        self.rule_discovery_.close()
+
         self.elitist_ = self.solution_composition_.elitist().clone()
         self.is_fitted_ = True
+        self._index_elitist()
 
         # Log final result
         self.logger_.log_final(X, y, self)
@@ -225,8 +373,107 @@ class SupRB(BaseRegressor):
         if cleanup:
             self._cleanup()
 
+    def _fit_islands(self, X: np.ndarray, y: np.ndarray, cleanup=False):
+        """Fits `n_islands` independent copies of this estimator in parallel, which exchange the rules of their
+        elitists every `migration_interval` iterations, and adopts the island with the fittest elitist."""
+
+        self.random_state_ = check_random_state(self.random_state)
+        self._validate_logger(default=DefaultLogger())
+        self.logger_.log_init(X, y, self)
+
+        # Every island derives all of its seeds from its own child of the seed sequence
+        islands = [
+            clone(self).set_params(n_islands=1, n_jobs=1, random_state=seed)
+            for seed in self._seed_sequence().spawn(self.n_islands)
+        ]
+        running = [True] * self.n_islands
+
+        interval = self.migration_interval if self.migration_interval > 0 else self.n_iter
+        with Parallel(n_jobs=min(effective_n_jobs(self.n_jobs), self.n_islands)) as parallel:
+            results = parallel(delayed(_start_island)(island, X, y) for island in islands)
+            islands = [island for island, _ in results]
+            running = [not stopped for _, stopped in results]
+
+            for start in range(0, self.n_iter, interval):
+                steps = range(start, min(start + interval, self.n_iter))
+                results = parallel(
+                    delayed(_run_island)(island, X, y, steps if running[i] else range(0))
+                    for i, island in enumerate(islands)
+                )
+                islands = [island for island, _ in results]
+                running = [was_running and not stopped for was_running, (_, stopped) in zip(running, results)]
+
+                if steps.stop < self.n_iter:
+                    self._migrate(islands, running, X, y, n_remaining=self.n_iter - steps.stop)
+
+        self.islands_ = islands
+        fitted = [island for island in islands if not island.is_error_]
+        if not fitted:
+            self.is_fitted_ = True
+            self.is_error_ = True
+            return self
+
+        for island in fitted:
+            island._finish_fit(X, y)
+
+        best = max(fitted, key=lambda island: island.elitist_.fitness_)
+        self.step_ = best.step_
+        self.pool_ = best.pool_
+        self.elitist_ = best.elitist_
+        self.rule_discovery_ = best.rule_discovery_
+        self.solution_composition_ = best.solution_composition_
+        self.is_fitted_ = True
+        self._index_elitist()
+
+        self.logger_.log_final(X, y, self)
+
+        if cleanup:
+            self._cleanup()
+
         return self
 
+    def _migrate(self, islands: list, running: list[bool], X: np.ndarray, y: np.ndarray, n_remaining: int):
+        """Copies the rules of the elitist of every island into the pool of the next island (in a ring) and adds a
+        solution selecting exactly these rules to its population.
+        Islands without a population-based solution composition neither send nor receive migrants."""
+
+        emigrants = [
+            (
+                copy.deepcopy(island.solution_composition_.elitist().subpopulation)
+                if running[i] and isinstance(island.solution_composition_, PopulationBasedSolutionComposition)
+                else []
+            )
+            for i, island in enumerate(islands)
+        ]
+
+        for i, island in enumerate(islands):
+            rules = emigrants[i - 1]
+            composition = island.solution_composition_
+            if (
+                not running[i]
+                or not rules
+                or not isinstance(composition, PopulationBasedSolutionComposition)
+                or not getattr(composition, "population_", None)
+            ):
+                continue
+
+            pool = island.pool_
+            positions = []
+            for rule in rules:
+                position = next((j for j, other in enumerate(pool) if _same_condition(other, rule)), None)
+                if position is None:
+                    pool.append(rule)
+                    position = len(pool) - 1
+                positions.append(position)
+
+            fitness = composition.init.fitness
+            fitness.max_genome_length_ = max(fitness.max_genome_length_, len(pool) + self.n_rules * n_remaining)
+
+            genome = np.zeros(len(pool), dtype=bool)
+            genome[positions] = True
+            immigrant = composition.population_[0].clone(genome=genome)
+            composition.immigrate(composition.evaluate([immigrant], X, y))
+
     def _catch_errors(self, func, X, y, n_rules):
         try:
             if not n_rules:
@@ -241,6 +488,7 @@ class SupRB(BaseRegressor):
             warnings.warn(f"The following ValueError has occurred:\n{e}\nTraceback:\n{tb}")
             self.is_fitted_ = True
             self.is_error_ = True
+            self.rule_discovery_.close()
             return True
         except Exception as e:
             # Capture the full traceback and print it
@@ -248,6 +496,7 @@ class SupRB(BaseRegressor):
             warnings.warn(f"An error has occurred. This is likely due to a bad configuration:\n{e}\nTraceback:\n{tb}")
             self.is_fitted_ = True
             self.is_error_ = True
+            self.rule_discovery_.close()
             return True
 
     def _discover_rules(self, X: np.ndarray, y: np.ndarray, n_rules: int):
@@ -255,14 +504,53 @@ class SupRB(BaseRegressor):
 
         self._log_to_stdout(f"Generating {n_rules} rules", priority=4)
 
-        # Update the current elitist
-        self.rule_discovery_.elitist_ = self.solution_composition_.elitist()
+        new_rules = self._generate_rules(X, y, n_rules, self.step_, self.pool_, self.solution_composition_.elitist())
+        self._merge_rules(new_rules)
+
+    def _generate_rules(
+        self, X: np.ndarray, y: np.ndarray, n_rules: int, step: int, pool: list[Rule], elitist: Solution
+    ) -> list[Rule]:
+        # Update the current pool and elitist
+        self.rule_discovery_.pool_ = pool
+        self.rule_discovery_.elitist_ = elitist
 
         # Update the random state
-        self.rule_discovery_.random_state = self.rule_discovery_seeds_[self.step_]
+        self.rule_discovery_.random_state = self.rule_discovery_seeds_[step]
 
         # Generate new rules
-        new_rules = self.rule_discovery_.optimize(X, y, n_rules=n_rules)
+        with timer("rule_discovery"):
+            return self.rule_discovery_.optimize(X, y, n_rules=n_rules)
+
+    def _submit_rule_discovery(self, executor: ThreadPoolExecutor, X: np.ndarray, y: np.ndarray, step: int) -> Future:
+        """Starts the rule discovery of `step` in the background, based on snapshots of the current pool and elitist,
+        such that solution composition can modify both in the meantime."""
+
+        self._log_to_stdout(f"Generating {self.n_rules} rules in the background", priority=4)
+
+        elitist = self.solution_composition_.elitist()
+        if elitist is not None:
+            elitist = elitist.clone()
+            # The mixing model is copied as well, as subpopulation filters may draw from their random state
+            elitist.mixing = copy.deepcopy(elitist.mixing)
+            elitist.pool = list(self.pool_[: len(elitist.genome)])
+            pool = list(self.pool_)
+        else:
+            # Without any composed solution yet, origins are unbiased like in the very first step
+            pool = []
+
+        # The thread runs in a copy of the current context, which carries the profile of this fit
+        return executor.submit(copy_context().run, self._generate_rules, X, y, self.n_rules, step, pool, elitist)
+
+    def _receive_rules(self, X: np.ndarray, y: np.ndarray, pending: Future):
+        """Waits for the rules discovered in the background and merges them into the pool."""
+        with timer("rule_discovery_wait"):
+            new_rules = pending.result()
+        self._merge_rules(new_rules)
+
+    def _merge_rules(self, new_rules: list[Rule]):
+        if self.match_set_storage != "dense":
+            for rule in new_rules:
+                rule.match_set_ = compress(rule.match_set_, self.match_set_storage)
 
         # Extend the pool with the new rules
         self.pool_.extend(new_rules)
@@ -281,7 +569,8 @@ class SupRB(BaseRegressor):
         # Update the random state
         self.solution_composition_.random_state = self.solution_composition_seeds_[self.step_]
         # Optimize
-        self.solution_composition_.optimize(X, y)
+        with timer("solution_composition"):
+            self.solution_composition_.optimize(X, y)
 
     def predict(self, X):
         check_is_fitted(self)
@@ -289,9 +578,94 @@ class SupRB(BaseRegressor):
 
         if hasattr(self, "is_error_") and self.is_error_:
             return [0] * len(X)
+        elif hasattr(self, "compiled_"):
+            return self.compiled_.predict(X)
         else:
             return self.elitist_.predict(X)
 
+    def predict_iter(self, X, chunk_size: int = None):
+        """Yields the predictions of consecutive blocks of rows of `X`, validating and predicting one block at a time,
+        such that arbitrarily large (e.g. memory-mapped) inputs are predicted in bounded memory.
+
+        Parameters
+        ----------
+        X : array-like, shape (n_samples, n_features)
+            Anything `predict()` accepts, including lists and dataframes.
+        chunk_size : int
+            Number of rows per block. If None, blocks are chosen to fit into the `working_memory` of the sklearn
+            configuration, which can be set with `sklearn.config_context()`.
+        """
+
+        check_is_fitted(self)
+        for chunk in self._prediction_chunks(_num_samples(X), chunk_size):
+            yield np.asarray(self.predict(_safe_indexing(X, chunk)), dtype=float)
+
+    def predict_chunked(self, X, out: np.ndarray = None, chunk_size: int = None) -> np.ndarray:
+        """Like `predict()`, but processes `X` in blocks (see `predict_iter()`) and writes the predictions into `out`,
+        which may be preallocated, e.g., as `np.memmap`, to score inputs whose predictions do not fit into memory
+        either. Returns `out`."""
+
+        n_samples = _num_samples(X)
+        if out is None:
+            out = np.empty(n_samples)
+        elif out.shape[0] != n_samples:
+            raise ValueError(f"out has {out.shape[0]} rows, but X has {n_samples}")
+
+        start = 0
+        for pred in self.predict_iter(X, chunk_size=chunk_size):
+            out[start : start + pred.shape[0]] = pred
+            start += pred.shape[0]
+        return out
+
+    def _prediction_chunks(self, n_samples: int, chunk_size: int = None):
+        if chunk_size is not None:
+            for start in range(0, n_samples, chunk_size):
+                yield slice(start, min(start + chunk_size, n_samples))
+            return
+
+        # Validation copies a block, mixing allocates (n_rules, n_samples) temporaries unless the elitist is compiled
+        n_rules = self.compiled_.n_rules if hasattr(self, "compiled_") else len(self.elitist_.subpopulation)
+        yield from iter_chunks(n_samples, row_bytes=8 * (2 * self.n_features_in_ + 3 * n_rules))
+
+    def compile(self) -> SupRB:
+        """Freezes the elitist into flat arrays of bounds, coefficients, intercepts and mixing weights
+        (see `CompiledSolution`), which `predict()` then uses instead of matching and predicting rule by rule.
+
+        Requires interval-based matching functions and local models that a `LocalModelCodec` accepts (see
+        `suprb.rule.codec`). Fitting and `suprb.json.load()` compile the elitist automatically wherever this is
+        possible without changing its predictions.
+        """
+
+        check_is_fitted(self)
+        self.compiled_ = CompiledSolution.from_solution(self.elitist_, n_features=self.n_features_in_)
+        return self
+
+    def _index_elitist(self):
+        """Compiles the elitist, and thereby builds the `RuleIndex` over its rules that lets `predict()` evaluate only
+        the rules matching each sample. Elitists that can not be compiled, or whose subpopulation filter is not the
+        identity (and might draw different rules on every prediction), keep predicting rule by rule."""
+
+        mixing = self.elitist_.mixing
+        if type(getattr(mixing, "filter_subpopulation", None)) is not FilterSubpopulation:
+            return
+        try:
+            self.compile()
+        except ValueError:
+            self.__dict__.pop("compiled_", None)
+
+    def predict_one(self, x) -> float:
+        """Predicts a single sample, given as sequence of n_features values, for low-latency scoring.
+
+        Unlike `predict()`, the input is not validated, and the prediction is computed from the compiled elitist
+        (see `compile()`, which is called on first use) by only evaluating the rules that match `x`.
+        """
+
+        if getattr(self, "is_error_", False):
+            return 0.0
+        if not hasattr(self, "compiled_"):
+            self.compile()
+        return self.compiled_.predict_one(x)
+
     def _validate_rule_discovery(self, default=None):
         self.rule_discovery_ = clone(self.rule_discovery) if self.rule_discovery is not None else clone(default)
 
@@ -354,3 +728,19 @@ class SupRB(BaseRegressor):
         return {
             "poor_score": True,
         }
+
+
+def _same_condition(a: Rule, b: Rule) -> bool:
+    return type(a.match) is type(b.match) and np.array_equal(a.match.bounds, b.match.bounds)
+
+
+def _start_island(island: SupRB, X: np.ndarray, y: np.ndarray) -> tuple[SupRB, bool]:
+    island.early_stopping_counter_ = 0
+    island.previous_fitness_ = 0
+    island.is_error_ = False
+    island.n_features_in_ = X.shape[1]
+    return island, island._init_fit(X, y)
+
+
+def _run_island(island: SupRB, X: np.ndarray, y: np.ndarray, steps: range) -> tuple[SupRB, bool]:
+    return island, island._run_iterations(X, y, steps)
@@ -1,11 +1,16 @@
 import collections.abc
 import numbers
-from typing import Iterator, Union
+import tempfile
+from typing import Iterable, Iterator, Union
 
 import numpy as np
+from sklearn import get_config
 
 RandomState = Union[np.random.RandomState, np.random.Generator]
 
+# Number of set bits of every possible byte, used if numpy does not provide `bitwise_count`
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
 
 def check_random_state(seed) -> RandomState:
     """Turn seed into a np.random.Generator or np.random.RandomState instance.
@@ -42,6 +47,68 @@ def estimate_bounds(X) -> np.ndarray:
     return np.stack((np.min(X, axis=0), np.max(X, axis=0)), axis=0).T
 
 
+def popcount_words(words: np.ndarray, axis=None) -> Union[int, np.ndarray]:
+    """Counts the set bits of an array of packed uint8 words."""
+    if hasattr(np, "bitwise_count"):
+        counts = np.bitwise_count(words)
+    else:
+        counts = _POPCOUNT_TABLE[words]
+    return np.sum(counts, axis=axis, dtype=np.int64)
+
+
+def is_memory_mapped(X: np.ndarray) -> bool:
+    """Whether `X` is (a view of) a `np.memmap`, e.g., loaded with `np.load(..., mmap_mode="r")`."""
+    while X is not None:
+        if isinstance(X, np.memmap):
+            return True
+        X = getattr(X, "base", None)
+    return False
+
+
+def iter_chunks(n_rows: int, row_bytes: int) -> Iterator[slice]:
+    """Slices of consecutive rows, such that the temporaries of a chunk take up at most the `working_memory`
+    of the sklearn configuration (see `sklearn.config_context()`) if a row takes up `row_bytes` bytes.
+    Yields a single slice over all rows if they fit."""
+    chunk_size = max(int(get_config()["working_memory"] * 2**20 // max(row_bytes, 1)), 1)
+    for start in range(0, n_rows, chunk_size):
+        yield slice(start, min(start + chunk_size, n_rows))
+
+
+def load_shards(paths: Iterable[str], filename: str = None) -> np.memmap:
+    """Concatenates .npy shards along their first axis into a single memory-mapped array,
+    copying one shard at a time, such that the data never has to fit into memory as a whole.
+
+    Parameters
+    ----------
+    paths: Iterable[str]
+        The .npy files, which must agree in all but the first dimension.
+    filename: str
+        The .npy file the concatenation is written to. If None, an anonymous temporary file is used,
+        which is removed as soon as the returned array is garbage collected.
+    """
+
+    shards = [np.load(path, mmap_mode="r") for path in paths]
+    shape = (sum(shard.shape[0] for shard in shards),) + shards[0].shape[1:]
+    dtype = np.result_type(*shards)
+
+    if filename is None:
+        out = memmap_zeros(shape, dtype=dtype)
+    else:
+        out = np.lib.format.open_memmap(filename, mode="w+", dtype=dtype, shape=shape)
+
+    start = 0
+    for shard in shards:
+        out[start : start + shard.shape[0]] = shard
+        start += shard.shape[0]
+    out.flush()
+    return out
+
+
+def memmap_zeros(shape: tuple, dtype=float) -> np.memmap:
+    """A zero-initialised array backed by an anonymous temporary file instead of memory."""
+    return np.memmap(tempfile.TemporaryFile(), dtype=dtype, mode="w+", shape=shape)
+
+
 def flatten(iterable):
     """
     Flattens an iterable that itself contains lists or single elements.
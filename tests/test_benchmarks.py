@@ -0,0 +1,30 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks import BENCHMARKS, Dataset, compare, load_results, run, save_results
+from suprb.optimizer.rule.es import ES1xLambda
+from suprb.optimizer.solution.ga import GeneticAlgorithm
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run_compare(self):
+        dataset = Dataset(n_samples=200, n_features=2, pool_size=8)
+        results = run(dataset, repeat=1)
+        self.assertEqual([result.name for result in results], list(BENCHMARKS))
+
+        # The default components that all instances share are left untouched
+        self.assertIsNone(ES1xLambda().constraint.clip.bounds)
+        self.assertIsNone(ES1xLambda().mutation.matching_type)
+        self.assertFalse(hasattr(GeneticAlgorithm().init.fitness, "max_genome_length_"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "baseline.json")
+            save_results(results, dataset, filename)
+            baseline, baseline_dataset = load_results(filename)
+
+        self.assertEqual(baseline_dataset, dataset)
+        rows = compare(results, baseline)
+        self.assertEqual(len(rows), len(BENCHMARKS))
+        self.assertFalse(any(row["regression"] for row in rows))
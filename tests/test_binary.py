@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.dummy import DummyRegressor
+from sklearn.linear_model import Ridge
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+
+import suprb
+import suprb.binary as binary
+import suprb.json as json
+from suprb.optimizer.rule.es import ES1xLambda
+from suprb.optimizer.solution import ga
+from suprb.optimizer.solution.ga import GeneticAlgorithm
+from suprb.rule.codec import PolynomialModel, encode_model
+from suprb.rule.initialization import MeanInit
+from suprb.rule.matching import OrderedBound
+
+
+def fit(X, y, local_model=Ridge()):
+    return suprb.SupRB(
+        n_iter=2,
+        n_rules=4,
+        rule_discovery=ES1xLambda(n_iter=4, lmbda=4, delay=2, init=MeanInit(model=local_model)),
+        solution_composition=GeneticAlgorithm(
+            n_iter=4, population_size=4, crossover=ga.crossover.Uniform(), selection=ga.selection.Tournament()
+        ),
+        matching_type=OrderedBound(np.array([])),
+        random_state=1,
+        verbose=0,
+    ).fit(X, y)
+
+
+class TestBinary(unittest.TestCase):
+
+    def setUp(self):
+        random_state = np.random.default_rng(0)
+        self.X = random_state.uniform(-1, 1, size=(300, 2))
+        self.y = np.sin(3 * self.X[:, 0]) + self.X[:, 1]
+
+    def test_dump_load(self):
+        X = self.X
+        model = fit(X, self.y)
+        expected = model.predict(X)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "model.suprb")
+            binary.dump(model, filename)
+
+            loaded = binary.load(filename)
+            self.assertIsInstance(loaded.compiled_.bounds, np.memmap)
+            np.testing.assert_array_equal(loaded.predict(X), expected)
+            self.assertEqual(loaded.get_params().keys(), model.get_params().keys())
+
+            loaded = binary.load(filename, mmap_mode=None, rules=True)
+            self.assertNotIsInstance(loaded.compiled_.bounds, np.memmap)
+            self.assertEqual(len(loaded.pool_), model.compiled_.n_rules)
+            self.assertEqual(loaded.elitist_.fitness_, model.elitist_.fitness_)
+            np.testing.assert_allclose(loaded.elitist_.predict(X), expected)
+            del loaded
+
+            with open(filename, "r+b") as f:
+                f.write(b"NOTSUPRB")
+            with self.assertRaises(ValueError):
+                binary.load(filename)
+
+    def test_default_components(self):
+        # Operators and matching type as configured by default, only fewer iterations
+        model = suprb.SupRB(
+            n_iter=2,
+            n_rules=4,
+            rule_discovery=ES1xLambda(n_iter=4, lmbda=4, delay=2),
+            solution_composition=GeneticAlgorithm(n_iter=4, population_size=4),
+            random_state=1,
+            verbose=0,
+        ).fit(self.X, self.y)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "model.suprb")
+            binary.dump(model, filename)
+            loaded = binary.load(filename, rules=True)
+
+        params, expected = loaded.get_params(), model.get_params()
+        self.assertEqual(params.keys(), expected.keys())
+        for key, value in expected.items():
+            if value is None or isinstance(value, (int, float, str)):
+                self.assertEqual(params[key], value, key)
+            elif not key.startswith("logger"):
+                self.assertIs(type(params[key]), type(value), key)
+        np.testing.assert_array_equal(loaded.predict(self.X), model.predict(self.X))
+
+    def test_local_models(self):
+        X = self.X
+        for local_model in [make_pipeline(PolynomialFeatures(2), Ridge()), DummyRegressor()]:
+            fitted = clone(local_model).fit(X, self.y)
+            np.testing.assert_allclose(encode_model(fitted, X.shape[1]).predict(X), fitted.predict(X))
+
+            model = fit(X, self.y, local_model=local_model)
+            expected = model.elitist_.predict(X)
+            np.testing.assert_allclose(model.predict(X), expected)
+
+            with tempfile.TemporaryDirectory() as directory:
+                filename = os.path.join(directory, "model.suprb")
+                binary.dump(model, filename)
+                np.testing.assert_allclose(binary.load(filename).predict(X), expected)
+
+                filename = os.path.join(directory, "model.json")
+                json.dump(model, filename)
+                loaded = json.load(filename)
+                self.assertIsInstance(loaded.pool_[0].model, PolynomialModel)
+                np.testing.assert_allclose(loaded.predict(X), expected)
+
+        with self.assertRaises(ValueError):
+            encode_model(KNeighborsRegressor(), X.shape[1])
+        # Models of several targets can not be mixed into a single prediction
+        for local_model in [Ridge(), DummyRegressor()]:
+            with self.assertRaises(ValueError):
+                encode_model(local_model.fit(X, np.stack((self.y, self.y), axis=1)), X.shape[1])
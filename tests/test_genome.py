@@ -0,0 +1,64 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from suprb.logging.metrics import genome_diversity
+from suprb.solution import PackedGenome, Solution
+from suprb.solution.genome import hamming_distance, pad, popcount
+from suprb.utils import check_random_state
+
+
+class TestPackedGenome(unittest.TestCase):
+
+    def setUp(self):
+        self.random_state = check_random_state(42)
+        self.bits = self.random_state.random(21) < 0.5
+
+    def test_roundtrip(self):
+        genome = PackedGenome(self.bits)
+
+        self.assertEqual(len(genome), 21)
+        self.assertEqual(genome.words.shape[0], 3)
+        np.testing.assert_array_equal(np.asarray(genome), self.bits)
+        np.testing.assert_array_equal(genome[3:9], self.bits[3:9])
+        self.assertEqual(list(itertools.compress(range(21), genome)), list(np.flatnonzero(self.bits)))
+
+        genome[[0, 20]] = True
+        self.bits[[0, 20]] = True
+        np.testing.assert_array_equal(np.asarray(genome), self.bits)
+
+    def test_pad(self):
+        genome = PackedGenome(self.bits)
+        expected = self.bits
+        for n in [0, 3, 5, 8, 17, 1]:
+            bits = self.random_state.random(n) < 0.5
+            words = genome._words
+            padded = pad(genome, bits)
+            expected = pad(expected, bits)
+            np.testing.assert_array_equal(np.asarray(padded), expected)
+            self.assertEqual(popcount(padded), popcount(expected))
+            self.assertIsInstance(popcount(expected), int)
+
+            # Other solutions may share the genome, so only the method pads in place
+            self.assertEqual(len(genome), len(expected) - n)
+            genome.pad(bits)
+            np.testing.assert_array_equal(np.asarray(genome), expected)
+            if genome.words.shape[0] <= words.shape[0]:
+                self.assertIs(genome._words, words)
+
+    def test_hamming(self):
+        other = self.random_state.random(21) < 0.5
+        expected = np.count_nonzero(self.bits ^ other)
+
+        self.assertEqual(hamming_distance(PackedGenome(self.bits), PackedGenome(other)), expected)
+        self.assertEqual(hamming_distance(PackedGenome(self.bits), other), expected)
+        self.assertEqual(hamming_distance(self.bits, other), expected)
+
+    def test_genome_diversity(self):
+        genomes = self.random_state.random((5, 21)) < 0.5
+        expected = sum(np.count_nonzero(a ^ b) for a, b in itertools.combinations(genomes, 2)) / 21
+
+        for genome_type in [np.asarray, PackedGenome]:
+            population = [Solution(genome_type(genome), pool=[], mixing=None, fitness=None) for genome in genomes]
+            self.assertAlmostEqual(genome_diversity(population), expected)
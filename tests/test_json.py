@@ -1,5 +1,6 @@
 import numpy as np
 import os
+import tempfile
 
 from sklearn.model_selection import cross_validate
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
@@ -11,6 +12,7 @@ from suprb.optimizer.solution import ga
 from suprb.optimizer.rule import es
 from suprb.utils import check_random_state
 from suprb.optimizer.rule.mutation import HalfnormIncrease
+from suprb.solution.mixing_model import ErrorExperienceHeuristic
 import suprb.json as json
 
 
@@ -110,3 +112,22 @@ class TestJsonIO:
 
         assert (original_prediction == loaded_prediction).all()
         os.remove("save_state.json")
+
+    def test_incremental_mixing(self):
+        # Solutions fitted one by one with Solution.fit() rather than as a batch, on plain and packed genomes
+        for packed in [False, True]:
+            model, X, y = setup()
+            model.set_params(
+                verbose=0,
+                n_iter=4,
+                solution_composition__n_iter=8,
+                solution_composition__init__mixing=ErrorExperienceHeuristic(incremental=True),
+                solution_composition__init__packed=packed,
+            ).fit(X, y)
+            assert isinstance(model.elitist_.complexity_, int)
+
+            with tempfile.TemporaryDirectory() as directory:
+                filename = os.path.join(directory, "save_state.json")
+                json.dump(model, filename)
+                loaded = json.load(filename)
+            assert (loaded.predict(X) == model.predict(X)).all()
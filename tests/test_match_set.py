@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+
+from suprb.rule import RulePool
+from suprb.rule.match_set import (
+    IndexMatchSet,
+    PackedMatchSet,
+    RoaringMatchSet,
+    compress,
+    coverage,
+    hamming_distance,
+    match_count,
+)
+from suprb.utils import check_random_state
+
+
+class TestMatchSet(unittest.TestCase):
+
+    def setUp(self):
+        self.random_state = check_random_state(42)
+        # Sparse and dense regions, such that roaring bitmaps use both kinds of containers
+        n_samples = 3 * 2**16 + 100
+        self.match_sets = [
+            self.random_state.random(n_samples) < np.where(np.arange(n_samples) < 2**16, 0.5, 0.01) for _ in range(3)
+        ]
+
+    def test_representations(self):
+        for storage, cls in [
+            ("indices", IndexMatchSet),
+            ("bitmap", PackedMatchSet),
+            ("roaring", RoaringMatchSet),
+        ]:
+            for match_set in self.match_sets:
+                compressed = compress(match_set, storage)
+
+                self.assertIsInstance(compressed, cls)
+                self.assertEqual(match_count(compressed), np.count_nonzero(match_set))
+                np.testing.assert_array_equal(np.asarray(compressed), match_set)
+                np.testing.assert_array_equal(compressed.indices(), np.flatnonzero(match_set))
+
+            a, b = (compress(match_set, storage) for match_set in self.match_sets[:2])
+            self.assertEqual(hamming_distance(a, b), np.count_nonzero(self.match_sets[0] ^ self.match_sets[1]))
+            self.assertEqual(hamming_distance(a, self.match_sets[1]), hamming_distance(*self.match_sets[:2]))
+
+            compressed = [compress(match_set, storage) for match_set in self.match_sets]
+            np.testing.assert_array_equal(
+                coverage(compressed, n_samples=len(compressed[0])), np.sum(self.match_sets, axis=0)
+            )
+
+        self.assertIsInstance(compress(np.arange(1000) < 10, "auto"), IndexMatchSet)
+        self.assertIsInstance(compress(np.arange(1000) < 100, "auto"), PackedMatchSet)
+        self.assertGreater(self.match_sets[0].nbytes, 7 * compress(self.match_sets[0], "roaring").nbytes)
+
+    def test_sparse_pool(self):
+        class FittedRule:
+            def __init__(self, match_set, pred):
+                self.match_set_, self.pred_ = match_set, pred
+
+        rules = [
+            FittedRule(match_set, self.random_state.random(np.count_nonzero(match_set)))
+            for match_set in self.match_sets
+        ]
+        dense = RulePool(rules)
+        sparse = RulePool([FittedRule(compress(rule.match_set_, "auto"), rule.pred_) for rule in rules], sparse=True)
+
+        np.testing.assert_array_equal(sparse.match_matrix_.toarray(), dense.match_matrix_)
+        np.testing.assert_array_equal(sparse.pred_matrix_.toarray(), dense.pred_matrix_)
+
+        samples = np.arange(0, len(self.match_sets[0]), 7)
+        np.testing.assert_array_equal(sparse.take(samples).pred_matrix_.toarray(), dense.take(samples).pred_matrix_)
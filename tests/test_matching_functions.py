@@ -1,3 +1,4 @@
+from sklearn.linear_model import Ridge
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.utils import shuffle as apply_shuffle
 
@@ -23,10 +24,20 @@ from suprb.optimizer.rule.mutation import (
     Uniform,
     UniformIncrease,
 )
+from suprb.optimizer.rule.constraint import Clip, CombinedConstraint, MinRange, RuleConstraint
 from suprb.rule.initialization import MeanInit, NormalInit, HalfnormInit
+from suprb.rule.index import RuleIndex, SampleIndex
 import itertools
 
 
+class ClipToInputSpace(RuleConstraint):
+    """A constraint without a vectorised implementation."""
+
+    def __call__(self, rule):
+        rule.match.clip(rule.input_space)
+        return rule
+
+
 class TestMatchingFunction(unittest.TestCase):
     """Test Matching Function Implementation based on Higdon Gramacy Lee"""
 
@@ -135,6 +146,105 @@ class TestMatchingFunction(unittest.TestCase):
                         False
                     ), f"FAILED! Model fit with this config: " f"{matching_func} with {mutation} and {initialization}"
 
+    def test_batch(self):
+        random_state = check_random_state(0)
+        X = random_state.uniform(-1, 1, size=(200, 3))
+        y = X[:, 0] + X[:, 1] * X[:, 2]
+        parent = rule.Rule(
+            match=OrderedBound(np.array([[-0.5, 0.5]] * 3)),
+            input_space=np.array([[-1, 1]] * 3),
+            model=Ridge(alpha=0.01),
+            fitness=rule.fitness.VolumeWu(),
+        ).fit(X, y)
+
+        for mutation in [Normal, HalfnormIncrease, Halfnorm, Uniform, UniformIncrease]:
+            operator = mutation(matching_type=OrderedBound(np.array([])), sigma=0.2)
+            bounds = operator.batch(parent, n=8, random_state=random_state)
+
+            self.assertEqual(bounds.shape, (8, 3, 2))
+            self.assertTrue(np.all(bounds[:, :, 0] <= bounds[:, :, 1]))
+            np.testing.assert_array_equal(
+                OrderedBound.match_batch(bounds, X), np.stack([OrderedBound(b)(X) for b in bounds])
+            )
+
+        for constraint in [CombinedConstraint(MinRange(), Clip(parent.input_space)), ClipToInputSpace()]:
+            optimizer = es.ES1xLambda(
+                n_iter=8,
+                delay=4,
+                lmbda=8,
+                mutation=Normal(matching_type=OrderedBound(np.array([]))),
+                constraint=constraint,
+                batched=True,
+            )
+            child = optimizer._optimize(X, y, initial_rule=parent, random_state=random_state)
+
+            np.testing.assert_array_equal(child.match_set_, child.match(X))
+            self.assertAlmostEqual(child.error_, child.clone().fit(X, y).error_)
+            self.assertTrue(np.all(np.abs(child.match.bounds) <= 1))
+
+        bounds = random_state.uniform(-2, 2, size=(5, 3, 2))
+        bounds.sort(axis=2)
+        expected = np.stack([np.clip(b, -1, 1) for b in bounds])
+        np.testing.assert_array_equal(ClipToInputSpace().batch(bounds, rule=parent), expected)
+
+    def test_sample_index(self):
+        random_state = check_random_state(0)
+        # Rounding produces ties that must match like the bounds themselves
+        X = np.round(random_state.uniform(-1, 1, size=(300, 3)), 1)
+        index = SampleIndex(X)
+
+        lower = random_state.uniform(-1.2, 1, size=(50, 3))
+        bounds = np.stack((lower, lower + random_state.uniform(-0.1, 1, size=(50, 3))), axis=2)
+        bounds[0] = [[-0.5, 0.5]] * 3
+        bounds[1] = [[0.2, 0.2]] * 3
+
+        np.testing.assert_array_equal(index.match_batch(bounds), OrderedBound.match_batch(bounds, X))
+        for b in bounds:
+            np.testing.assert_array_equal(index.match(b), OrderedBound(b)(X))
+
+    def test_rule_index(self):
+        random_state = check_random_state(2)
+        X = np.round(random_state.uniform(-1, 1, size=(300, 3)), 1)
+
+        lower = np.round(random_state.uniform(-1.2, 1, size=(80, 3)), 1)
+        bounds = np.stack((lower, lower + np.round(random_state.uniform(0, 1, size=(80, 3)), 1)), axis=2)
+        bounds[0] = [[0.2, 0.2]] * 3
+        bounds[1] = [[-np.inf, np.inf]] * 3
+        bounds[2, :, 1] = np.inf
+        index = RuleIndex(bounds)
+
+        expected = OrderedBound.match_batch(bounds, X)
+        for x, match in zip(X, expected.T):
+            self.assertEqual(index.query(x), np.flatnonzero(match).tolist())
+
+        samples, rules = index.query_batch(X)
+        np.testing.assert_array_equal(samples, np.nonzero(expected.T)[0])
+        np.testing.assert_array_equal(rules, np.nonzero(expected.T)[1])
+
+    def test_rematch(self):
+        random_state = check_random_state(1)
+        X = np.round(random_state.uniform(-1, 1, size=(300, 3)), 1)
+        index = SampleIndex(X)
+
+        parent = np.array([[-0.5, 0.5]] * 3)
+        match_set = OrderedBound(parent)(X)
+        fingerprint = index.fingerprint(parent)
+        self.assertEqual(fingerprint.count, np.count_nonzero(match_set))
+
+        for _ in range(50):
+            child = parent + random_state.normal(scale=0.3, size=parent.shape)
+            child_match_set, child_fingerprint = index.rematch(child, match_set, fingerprint)
+
+            np.testing.assert_array_equal(child_match_set, OrderedBound(child)(X))
+            self.assertEqual(child_fingerprint.count, np.count_nonzero(child_match_set))
+            self.assertEqual(child_fingerprint == fingerprint, np.array_equal(child_match_set, match_set))
+            self.assertTrue(child_fingerprint == index.fingerprint(child))
+
+        # Moving bounds without crossing a sample keeps the match set itself
+        child_match_set, child_fingerprint = index.rematch(parent + [-0.04, 0.04], match_set, fingerprint)
+        self.assertIs(child_match_set, match_set)
+        self.assertTrue(child_fingerprint.same_boundaries(fingerprint))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,186 @@
+import unittest
+
+import numpy as np
+from sklearn.linear_model import Ridge
+
+from suprb.optimizer.solution import FitnessCache
+from suprb.optimizer.solution.ga import GeneticAlgorithm
+from suprb.rule import Rule, RulePool
+from suprb.rule.fitness import VolumeWu
+from suprb.rule.matching import OrderedBound
+from suprb.solution import Solution
+from suprb.solution.base import fit_solutions
+from suprb.solution.fitness import ComplexityWu
+from suprb.solution.mixing_model import ErrorExperienceHeuristic, NBestFitness, NRandom
+from suprb.utils import check_random_state
+
+
+class TestRulePool(unittest.TestCase):
+
+    def setUp(self):
+        random_state = check_random_state(42)
+        self.X = random_state.uniform(-1, 1, size=(200, 2))
+        self.y = np.sin(3 * self.X[:, 0]) + self.X[:, 1]
+
+        self.rules = []
+        for _ in range(20):
+            center = random_state.uniform(-1, 1, size=2)
+            bounds = np.stack((center - 0.4, center + 0.4), axis=1)
+            rule = Rule(
+                match=OrderedBound(bounds),
+                input_space=np.array([[-1, 1], [-1, 1]]),
+                model=Ridge(alpha=0.01),
+                fitness=VolumeWu(),
+            ).fit(self.X, self.y)
+            if rule.is_fitted_:
+                self.rules.append(rule)
+
+        self.genome = random_state.random(len(self.rules)) < 0.5
+
+    def predict(self, pool, genome, mixing):
+        solution = Solution(genome=genome, pool=pool, mixing=mixing, fitness=ComplexityWu())
+        return solution.predict(self.X, cache=True)
+
+    def test_matrices(self):
+        pool = RulePool(self.rules[:5])
+        pool.extend(self.rules[5:])
+
+        self.assertEqual(pool.match_matrix_.shape, (len(self.rules), self.X.shape[0]))
+        for i, rule in enumerate(self.rules):
+            np.testing.assert_array_equal(pool.match_matrix_[i].astype(bool), rule.match_set_)
+            np.testing.assert_allclose(pool.pred_matrix_[i][rule.match_set_], rule.pred_)
+            self.assertFalse(pool.pred_matrix_[i][~rule.match_set_].any())
+
+        np.testing.assert_array_equal(pool.indices(self.rules[::-1]), np.arange(len(self.rules))[::-1])
+
+    def test_cached_prediction(self):
+        mixing = ErrorExperienceHeuristic()
+        expected = self.predict(self.rules, self.genome, mixing)
+        np.testing.assert_allclose(self.predict(RulePool(self.rules), self.genome, mixing), expected)
+
+        # Genomes that do not fit the pool are rejected even if assertions are disabled
+        with self.assertRaises(ValueError):
+            self.predict(RulePool(self.rules[:-1]), self.genome, mixing)
+
+    def test_cached_prediction_filtered(self):
+        mixing = ErrorExperienceHeuristic(filter_subpopulation=NBestFitness(rule_amount=3))
+        expected = self.predict(self.rules, self.genome, mixing)
+        np.testing.assert_allclose(self.predict(RulePool(self.rules), self.genome, mixing), expected)
+
+    def test_empty_genome(self):
+        prediction = self.predict(
+            RulePool(self.rules), np.zeros(len(self.rules), dtype=bool), ErrorExperienceHeuristic()
+        )
+        np.testing.assert_array_equal(prediction, np.zeros(self.X.shape[0]))
+
+    def test_fit_solutions(self):
+        random_state = check_random_state(1)
+        pool = RulePool(self.rules)
+        mixing = ErrorExperienceHeuristic()
+        fitness = ComplexityWu()
+        fitness.max_genome_length_ = len(pool)
+        genomes = random_state.random((8, len(pool))) < 0.5
+        genomes[0] = False
+
+        solutions = fit_solutions(
+            [Solution(genome=genome, pool=pool, mixing=mixing, fitness=fitness) for genome in genomes],
+            self.X,
+            self.y,
+        )
+
+        for solution, genome in zip(solutions, genomes):
+            expected = Solution(genome=genome, pool=self.rules, mixing=mixing, fitness=fitness).fit(self.X, self.y)
+            self.assertAlmostEqual(solution.error_, expected.error_)
+            self.assertEqual(solution.complexity_, expected.complexity_)
+            self.assertAlmostEqual(solution.fitness_, expected.fitness_)
+
+    def test_incremental_mixture(self):
+        random_state = check_random_state(2)
+        pool = RulePool(self.rules)
+        mixing = ErrorExperienceHeuristic(incremental=True, max_updates=4)
+        fitness = ComplexityWu()
+        fitness.max_genome_length_ = len(pool)
+
+        solution = Solution(genome=self.genome, pool=pool, mixing=mixing, fitness=fitness).fit(self.X, self.y)
+        for _ in range(10):
+            genome = np.logical_xor(solution.genome, random_state.random(len(pool)) < 0.1)
+            solution = solution.clone(genome=genome).fit(self.X, self.y)
+
+            expected = self.predict(self.rules, genome, ErrorExperienceHeuristic())
+            np.testing.assert_allclose(solution.mixture_.predict(), expected, atol=1e-10)
+
+        # Solutions that select no rule at all predict zero everywhere
+        solution = solution.clone(genome=np.zeros(len(pool), dtype=bool)).fit(self.X, self.y)
+        np.testing.assert_array_equal(solution.mixture_.predict(), np.zeros(self.X.shape[0]))
+
+    def test_fitness_cache(self):
+        random_state = check_random_state(3)
+        pool = RulePool(self.rules[:-1])
+        mixing = ErrorExperienceHeuristic()
+        fitness = ComplexityWu()
+        fitness.max_genome_length_ = len(self.rules)
+        cache = FitnessCache(maxsize=4)
+
+        genomes = random_state.random((6, len(pool))) < 0.5
+        solutions = [Solution(genome=genome, pool=pool, mixing=mixing, fitness=fitness) for genome in genomes]
+        cache(solutions, self.X, self.y)
+        self.assertEqual((cache.hits_, cache.misses_, cache.currsize), (0, 6, 4))
+
+        # Only the four most recently used genomes are still cached
+        clones = cache([solution.clone(genome=solution.genome.copy()) for solution in solutions], self.X, self.y)
+        self.assertEqual((cache.hits_, cache.misses_), (4, 8))
+        for solution, clone in zip(solutions, clones):
+            self.assertEqual(solution.fitness_, clone.fitness_)
+
+        # Growing the pool invalidates all entries
+        pool.append(self.rules[-1])
+        padded = [solution.clone(genome=np.append(solution.genome, False)) for solution in solutions]
+        cache(padded, self.X, self.y)
+        self.assertEqual((cache.hits_, cache.misses_), (4, 14))
+        for solution in padded:
+            expected = solution.clone(genome=solution.genome).fit(self.X, self.y)
+            self.assertAlmostEqual(solution.error_, expected.error_)
+
+        # Solutions mixed from a random subpopulation are never cached
+        mixing = ErrorExperienceHeuristic(filter_subpopulation=NRandom(rule_amount=3, random_state=0))
+        self.assertFalse(mixing.deterministic)
+        solutions = [solution.clone(mixing=mixing) for solution in padded]
+        cache(solutions, self.X, self.y)
+        cache([solution.clone(genome=solution.genome.copy()) for solution in solutions], self.X, self.y)
+        self.assertEqual((cache.hits_, cache.misses_, cache.currsize), (4, 26, 4))
+
+    def test_parallel_evaluation(self):
+        random_state = check_random_state(4)
+        pool = RulePool(self.rules)
+        mixing = ErrorExperienceHeuristic()
+        fitness = ComplexityWu()
+        fitness.max_genome_length_ = len(pool)
+        genomes = random_state.random((7, len(pool))) < 0.5
+
+        for fitness_cache in [None, FitnessCache()]:
+            optimizer = GeneticAlgorithm(n_jobs=3, fitness_cache=fitness_cache)
+            solutions = optimizer.evaluate(
+                [Solution(genome=genome, pool=pool, mixing=mixing, fitness=fitness) for genome in genomes],
+                self.X,
+                self.y,
+            )
+
+            self.assertEqual(len(solutions), len(genomes))
+            for solution, genome in zip(solutions, genomes):
+                expected = Solution(genome=genome, pool=self.rules, mixing=mixing, fitness=fitness).fit(self.X, self.y)
+                np.testing.assert_array_equal(solution.genome, genome)
+                self.assertAlmostEqual(solution.error_, expected.error_)
+                self.assertAlmostEqual(solution.fitness_, expected.fitness_)
+
+        # Random subpopulations are drawn in the same order as without threads
+        errors = []
+        genomes = random_state.random((64, len(pool))) < 0.5
+        for n_jobs in [1, 4]:
+            mixing = ErrorExperienceHeuristic(filter_subpopulation=NRandom(rule_amount=3, random_state=0))
+            solutions = GeneticAlgorithm(n_jobs=n_jobs).evaluate(
+                [Solution(genome=genome, pool=pool, mixing=mixing, fitness=fitness) for genome in genomes],
+                self.X,
+                self.y,
+            )
+            errors.append([solution.error_ for solution in solutions])
+        self.assertEqual(errors[0], errors[1])
@@ -1 +1,99 @@
-# TODO: Add real tests for `Rule`s
+import unittest
+
+import numpy as np
+from sklearn.linear_model import LinearRegression, Ridge
+
+from suprb.rule import Rule
+from suprb.rule.batch import fit_rules
+from suprb.rule.fitness import VolumeWu
+from suprb.rule.matching import OrderedBound
+from suprb.rule.statistics import SufficientStatistics
+from suprb.utils import check_random_state
+
+
+class TestBatchFit(unittest.TestCase):
+
+    def setUp(self):
+        random_state = check_random_state(42)
+        self.X = random_state.uniform(-1, 1, size=(300, 3))
+        self.y = self.X @ np.array([0.5, -1, 2]) + np.sin(4 * self.X[:, 0]) + 3
+        self.centers = random_state.uniform(-1, 1, size=(12, 3))
+
+    def make_rules(self, model):
+        rules = []
+        for center in self.centers:
+            bounds = np.stack((center - 0.5, center + 0.5), axis=1)
+            rules.append(Rule(OrderedBound(bounds), np.array([[-1, 1]] * 3), model, VolumeWu()))
+        return [rule.clone() for rule in rules]
+
+    def test_identical_to_sklearn(self):
+        for model in [Ridge(alpha=0.01), Ridge(alpha=1, fit_intercept=False), LinearRegression()]:
+            batch = fit_rules(self.make_rules(model), self.X, self.y)
+            expected = [rule.fit(self.X, self.y) for rule in self.make_rules(model)]
+
+            for rule, other in zip(batch, expected):
+                self.assertEqual(rule.is_fitted_, other.is_fitted_)
+                if not other.is_fitted_:
+                    continue
+                np.testing.assert_array_equal(rule.match_set_, other.match_set_)
+                np.testing.assert_allclose(rule.model.coef_, other.model.coef_, atol=1e-8)
+                self.assertAlmostEqual(rule.model.intercept_, other.model.intercept_)
+                np.testing.assert_allclose(rule.pred_, other.pred_, atol=1e-8)
+                np.testing.assert_allclose(rule.predict(self.X), other.predict(self.X), atol=1e-8)
+                self.assertAlmostEqual(rule.error_, other.error_)
+                self.assertAlmostEqual(rule.fitness_, other.fitness_)
+                self.assertEqual(rule.experience_, other.experience_)
+
+    def test_offset_features(self):
+        # Features far from zero with a small spread, where uncentered sums cancel catastrophically
+        X, y = 1e6 + 1e-2 * self.X, 100 * self.y
+        for model in [Ridge(alpha=1), LinearRegression()]:
+            rules = [rule.clone(match=OrderedBound(1e6 + 1e-2 * rule.match.bounds)) for rule in self.make_rules(model)]
+            batch = fit_rules([rule.clone() for rule in rules], X, y)
+            expected = [rule.fit(X, y) for rule in rules]
+
+            for rule, other in zip(batch, expected):
+                if other.is_fitted_:
+                    np.testing.assert_allclose(rule.model.coef_, other.model.coef_, rtol=1e-6)
+                    # Up to the rounding of intercept + coef @ x, which are large compared to the prediction
+                    np.testing.assert_allclose(rule.predict(X), other.predict(X), atol=1e-3)
+
+
+class TestSufficientStatistics(unittest.TestCase):
+
+    def test_identical_to_masked_fit(self):
+        random_state = check_random_state(0)
+        for n_features in [1, 2]:
+            X = np.round(random_state.uniform(-1, 1, size=(400, n_features)), 2)
+            y = np.sin(3 * X[:, 0]) + X.sum(axis=1)
+            centers = random_state.uniform(-1, 1, size=(30, n_features))
+            widths = random_state.uniform(0, 0.5, size=(30, n_features))
+            bounds = np.stack((centers - widths, centers + widths), axis=2)
+
+            statistics = SufficientStatistics(X, y)
+            self.assertTrue(statistics.supported)
+            counts, coefs, intercepts, _, errors = statistics.fit(bounds, alpha=0.01)
+
+            for i, rule in enumerate(fit_rules(self.make_rules(bounds), X, y)):
+                self.assertEqual(counts[i], np.count_nonzero(rule.match_set_))
+                if counts[i]:
+                    np.testing.assert_allclose(coefs[i], rule.model.coef_, atol=1e-8)
+                    self.assertAlmostEqual(intercepts[i], rule.model.intercept_)
+                    self.assertAlmostEqual(max(errors[i], 1e-4), rule.error_)
+
+    def test_offset_features(self):
+        random_state = check_random_state(1)
+        X = 1e6 + 1e-2 * random_state.uniform(-1, 1, size=(300, 2))
+        y = 1e3 + 100 * np.sin(300 * X[:, 0]) + 100 * (X[:, 1] - 1e6)
+        bounds = np.stack((X[:20] - 5e-3, X[:20] + 5e-3), axis=2)
+
+        counts, coefs, intercepts, _, errors = SufficientStatistics(X, y).fit(bounds, alpha=0.01)
+        for i, rule in enumerate(fit_rules(self.make_rules(bounds), X, y)):
+            np.testing.assert_allclose(coefs[i], rule.model.coef_, rtol=1e-6)
+            np.testing.assert_allclose(X @ coefs[i] + intercepts[i], rule.predict(X), atol=1e-6)
+            np.testing.assert_allclose(max(errors[i], 1e-4), rule.error_, rtol=1e-8)
+
+    @staticmethod
+    def make_rules(bounds):
+        input_space = np.array([[-1, 1]] * bounds.shape[1])
+        return [Rule(OrderedBound(b), input_space, Ridge(alpha=0.01), VolumeWu()) for b in bounds]
@@ -1,6 +1,11 @@
+import os
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import numpy as np
 
+from sklearn import config_context
 from sklearn.utils.estimator_checks import check_estimator, _regression_dataset
 
 import suprb
@@ -11,6 +16,9 @@ from suprb.rule import Rule
 from suprb.rule.fitness import VolumeWu
 from suprb.rule.matching import OrderedBound
 from suprb.optimizer.rule.es import ES1xLambda
+from suprb.optimizer.subsample import Subsample
+from suprb.solution.initialization import RandomInit
+from suprb.solution.mixing_model import ErrorExperienceHeuristic, FilterSubpopulation, NRandom
 
 
 class TestSupRB(unittest.TestCase):
@@ -86,3 +94,282 @@ class TestSupRB(unittest.TestCase):
         estimator.previous_fitness_ = 20
         estimator.solution_composition_.population_ = [self.create_rule(22, 2, 2)]
         self.assertTrue(estimator.check_early_stopping())
+
+    def test_persistent_workers(self):
+        random_state = np.random.default_rng(0)
+        X = random_state.uniform(-1, 1, size=(200, 2))
+        y = np.sin(3 * X[:, 0]) + X[:, 1]
+
+        estimators = [
+            suprb.SupRB(
+                n_iter=2,
+                n_rules=2,
+                rule_discovery=ES1xLambda(n_iter=8, lmbda=4, delay=2, persistent_workers=persistent_workers),
+                solution_composition=suprb.optimizer.solution.ga.GeneticAlgorithm(n_iter=2, population_size=2),
+                random_state=1,
+                verbose=0,
+                n_jobs=n_jobs,
+            ).fit(X, y)
+            for n_jobs, persistent_workers in [(1, False), (2, True)]
+        ]
+
+        # The workers are released after fitting and produce the same rules as a sequential run
+        self.assertFalse(hasattr(estimators[1].rule_discovery_, "workers_"))
+        self.assertEqual(len(estimators[0].pool_), len(estimators[1].pool_))
+        for expected, rule in zip(estimators[0].pool_, estimators[1].pool_):
+            np.testing.assert_array_equal(rule.match.bounds, expected.match.bounds)
+            np.testing.assert_array_equal(rule.match_set_, expected.match_set_)
+            np.testing.assert_allclose(rule.pred_, expected.pred_)
+            self.assertAlmostEqual(rule.error_, expected.error_)
+
+    def test_islands(self):
+        random_state = np.random.default_rng(0)
+        X = random_state.uniform(-1, 1, size=(200, 2))
+        y = np.sin(3 * X[:, 0]) + X[:, 1]
+
+        # Both estimators share the seed, which must not be advanced by fitting
+        seed = np.random.SeedSequence(1)
+        estimators = [
+            suprb.SupRB(
+                n_iter=4,
+                n_rules=2,
+                rule_discovery=ES1xLambda(n_iter=8, lmbda=4, delay=2),
+                solution_composition=suprb.optimizer.solution.ga.GeneticAlgorithm(n_iter=2, population_size=4),
+                random_state=seed,
+                verbose=0,
+                n_jobs=n_jobs,
+                n_islands=3,
+                migration_interval=2,
+            ).fit(X, y)
+            for n_jobs in [1, 3]
+        ]
+
+        # Islands are seeded independently of the processes they run in
+        self.assertEqual(seed.n_children_spawned, 0)
+        self.assertEqual(len(estimators[0].islands_), 3)
+        for expected, island in zip(estimators[0].islands_, estimators[1].islands_):
+            self.assertFalse(island.is_error_)
+            np.testing.assert_array_equal(island.elitist_.genome, expected.elitist_.genome)
+            self.assertEqual(
+                [rule.match.bounds.tolist() for rule in island.pool_],
+                [rule.match.bounds.tolist() for rule in expected.pool_],
+            )
+
+        # Every island received the rules of the elitist of its predecessor
+        self.assertTrue(all(len(island.pool_) > 4 * 2 for island in estimators[0].islands_))
+        np.testing.assert_allclose(estimators[0].predict(X), estimators[1].predict(X))
+
+    def test_pipelined(self):
+        random_state = np.random.default_rng(0)
+        X = random_state.uniform(-1, 1, size=(200, 2))
+        y = np.sin(3 * X[:, 0]) + X[:, 1]
+
+        # The background thread must not draw from the random state of a random subpopulation filter
+        for filter_subpopulation in [FilterSubpopulation, partial(NRandom, rule_amount=3)]:
+            estimators = [
+                suprb.SupRB(
+                    n_iter=4,
+                    n_rules=2,
+                    rule_discovery=ES1xLambda(n_iter=8, lmbda=4, delay=2),
+                    solution_composition=suprb.optimizer.solution.ga.GeneticAlgorithm(
+                        n_iter=2,
+                        population_size=4,
+                        init=RandomInit(mixing=ErrorExperienceHeuristic(filter_subpopulation=filter_subpopulation())),
+                    ),
+                    random_state=1,
+                    verbose=0,
+                    pipelined=True,
+                ).fit(X, y)
+                for _ in range(4)
+            ]
+
+            for estimator in estimators:
+                self.assertFalse(estimator.is_error_)
+                self.assertIs(estimator.rule_discovery_.pool_, estimator.pool_)
+                self.assertEqual(len(estimator.elitist_.genome), len(estimator.pool_))
+                np.testing.assert_array_equal(estimators[0].elitist_.genome, estimator.elitist_.genome)
+                self.assertEqual(estimators[0].elitist_.error_, estimator.elitist_.error_)
+
+    def test_subsample(self):
+        subsample = Subsample(size=20, growth=2, min_samples=1)
+        schedule = subsample.schedule(100, np.random.default_rng(0))
+
+        # Windows of a shuffled order, which grow until they cover all samples
+        first, second, third = next(schedule), next(schedule), next(schedule)
+        self.assertEqual((len(first), len(second), len(third)), (20, 40, 80))
+        self.assertFalse(np.intersect1d(first, second).size)
+        np.testing.assert_array_equal(next(schedule), np.arange(100))
+
+        self.assertTrue(subsample.promote(np.full(50, 1.0), np.full(50, 1.0)))
+        self.assertFalse(subsample.promote(np.linspace(2, 3, 50), np.linspace(1, 0, 50)))
+
+        random_state = np.random.default_rng(0)
+        X = random_state.uniform(-1, 1, size=(400, 2))
+        y = np.sin(3 * X[:, 0]) + X[:, 1]
+
+        estimator = suprb.SupRB(
+            n_iter=4,
+            n_rules=2,
+            rule_discovery=ES1xLambda(n_iter=8, lmbda=4, delay=2, subsample=subsample),
+            solution_composition=suprb.optimizer.solution.ga.GeneticAlgorithm(
+                n_iter=4, population_size=4, subsample=subsample
+            ),
+            random_state=1,
+            verbose=0,
+        ).fit(X, y)
+
+        # Rules in the pool and the elitist carry the results of fits on all samples
+        self.assertFalse(estimator.is_error_)
+        for rule in estimator.pool_:
+            self.assertEqual(rule.match_set_.shape[0], X.shape[0])
+        error = estimator.elitist_.error_
+        self.assertAlmostEqual(estimator.elitist_.clone().fit(X, y).error_, error)
+
+        # Children of the ES are only fitted on all samples if they are not significantly worse than their parent
+        rule_discovery = estimator.rule_discovery_
+        parent = estimator.pool_[0]
+        better = parent.clone().fit(X[:100], y[:100])
+        worse = parent.clone().fit(X[:100], y[:100] + 1)
+        self.assertTrue(rule_discovery._promote(better, parent, X[:100], y[:100]))
+        self.assertFalse(rule_discovery._promote(worse, parent, X[:100], y[:100]))
+
+    def test_out_of_core(self):
+        random_state = np.random.default_rng(0)
+        X = random_state.uniform(-1, 1, size=(2000, 2))
+        y = np.sin(3 * X[:, 0]) + X[:, 1]
+
+        def estimator():
+            return suprb.SupRB(
+                n_iter=4,
+                n_rules=2,
+                rule_discovery=ES1xLambda(n_iter=8, lmbda=4, delay=2, batched=True, sample_index=True),
+                solution_composition=suprb.optimizer.solution.ga.GeneticAlgorithm(n_iter=4, population_size=4),
+                random_state=1,
+                verbose=0,
+            )
+
+        in_memory = estimator().fit(X, y)
+        # The tables over the training data are released after fitting
+        self.assertFalse(hasattr(in_memory.rule_discovery_, "statistics_"))
+        self.assertFalse(hasattr(in_memory.rule_discovery_, "index_"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = {"X": [], "y": []}
+            for i, shard in enumerate(np.array_split(np.arange(X.shape[0]), 3)):
+                for name, array in (("X", X), ("y", y)):
+                    paths[name].append(os.path.join(directory, f"{name}{i}.npy"))
+                    np.save(paths[name][-1], array[shard])
+
+            X_mapped, y_mapped = suprb.utils.load_shards(paths["X"]), suprb.utils.load_shards(paths["y"])
+
+            # A working memory of about 10 KB forces every matching, fitting and mixing step into chunks
+            with config_context(working_memory=0.01):
+                out_of_core = estimator().fit(X_mapped, y_mapped)
+                pred = out_of_core.predict(X_mapped)
+
+        self.assertTrue(suprb.utils.is_memory_mapped(out_of_core.pool_.match_matrix_))
+        np.testing.assert_allclose(pred, in_memory.predict(X))
+
+    def test_predict_chunked(self):
+        random_state = np.random.default_rng(0)
+        X = random_state.uniform(-1, 1, size=(500, 2))
+        y = np.sin(3 * X[:, 0]) + X[:, 1]
+
+        estimator = suprb.SupRB(
+            n_iter=2,
+            n_rules=4,
+            rule_discovery=ES1xLambda(n_iter=4, lmbda=4, delay=2),
+            solution_composition=suprb.optimizer.solution.ga.GeneticAlgorithm(n_iter=4, population_size=4),
+            random_state=1,
+            verbose=0,
+        ).fit(X, y)
+        expected = estimator.predict(X)
+
+        blocks = list(estimator.predict_iter(X, chunk_size=64))
+        self.assertEqual([block.shape[0] for block in blocks], [64] * 7 + [52])
+        np.testing.assert_allclose(np.concatenate(blocks), expected)
+
+        # Inputs are validated block by block, so lists are accepted like by predict()
+        np.testing.assert_allclose(estimator.predict_chunked(X.tolist(), chunk_size=64), expected)
+
+        with tempfile.TemporaryDirectory() as directory:
+            X_mapped = np.lib.format.open_memmap(os.path.join(directory, "X.npy"), mode="w+", shape=X.shape)
+            X_mapped[:] = X
+            out = np.lib.format.open_memmap(os.path.join(directory, "out.npy"), mode="w+", shape=X.shape[:1])
+
+            with config_context(working_memory=0.01):
+                self.assertIs(estimator.predict_chunked(X_mapped, out=out), out)
+            np.testing.assert_allclose(out, expected)
+            del X_mapped, out
+
+    def test_profile(self):
+        random_state = np.random.default_rng(0)
+        X = random_state.uniform(-1, 1, size=(300, 2))
+        y = np.sin(3 * X[:, 0]) + X[:, 1]
+
+        def estimator(**kwargs):
+            return suprb.SupRB(
+                n_iter=3,
+                n_rules=2,
+                rule_discovery=ES1xLambda(n_iter=4, lmbda=4, delay=2),
+                solution_composition=suprb.optimizer.solution.ga.GeneticAlgorithm(n_iter=4, population_size=4),
+                random_state=1,
+                verbose=0,
+                **kwargs,
+            ).fit(X, y)
+
+        profiled, unprofiled = estimator(profile=True), estimator()
+        np.testing.assert_array_equal(profiled.elitist_.genome, unprofiled.elitist_.genome)
+        self.assertIsNone(suprb.profiling._active.get())
+
+        metrics = profiled.logger_.metrics_
+        for key in ["time_rule_discovery", "time_rule_fit", "time_solution_composition", "count_rules_fitted"]:
+            self.assertEqual(sorted(metrics[key]), [0, 1, 2])
+        self.assertGreater(metrics["count_mixing_calls"][0], 0)
+        self.assertAlmostEqual(
+            sum(metrics["time_solution_composition"].values()), profiled.profile_.times["solution_composition"]
+        )
+        self.assertNotIn("time_rule_discovery", unprofiled.logger_.metrics_)
+
+        # Fits in concurrent threads collect their own profiles, including the work of the threads they start
+        modes = [False, True, False, True]
+        expected = {pipelined: estimator(profile=True, pipelined=pipelined).profile_ for pipelined in modes[:2]}
+        with ThreadPoolExecutor(max_workers=len(modes)) as executor:
+            concurrent = list(executor.map(lambda pipelined: estimator(profile=True, pipelined=pipelined), modes))
+        for pipelined, estimator_ in zip(modes, concurrent):
+            self.assertEqual(dict(estimator_.profile_.counts), dict(expected[pipelined].counts))
+        self.assertIsNone(suprb.profiling._active.get())
+
+    def test_compile(self):
+        random_state = np.random.default_rng(0)
+        X = random_state.uniform(-1, 1, size=(500, 3))
+        y = np.sin(3 * X[:, 0]) + X[:, 1]
+
+        estimator = suprb.SupRB(
+            n_iter=4,
+            n_rules=4,
+            rule_discovery=ES1xLambda(n_iter=8, lmbda=4, delay=2),
+            solution_composition=suprb.optimizer.solution.ga.GeneticAlgorithm(n_iter=4, population_size=4),
+            random_state=1,
+            verbose=0,
+        ).fit(X, y)
+
+        # Also predict samples outside of all rules
+        X_test = random_state.uniform(-1.5, 1.5, size=(1000, 3))
+        expected = estimator.elitist_.predict(X_test)
+
+        # Fitting already compiled the elitist
+        self.assertTrue(hasattr(estimator, "compiled_"))
+        np.testing.assert_allclose(estimator.predict(X_test), expected)
+
+        estimator.compile()
+        self.assertEqual(estimator.compiled_.n_rules, np.count_nonzero(estimator.elitist_.genome))
+        np.testing.assert_allclose(estimator.predict(X_test), expected)
+        with config_context(working_memory=0.01):
+            np.testing.assert_allclose(estimator.predict(X_test), expected)
+        for x, pred in zip(X_test[:50], expected):
+            self.assertAlmostEqual(estimator.predict_one(x), pred)
+
+        compiled = estimator.compiled_
+        estimator.fit(X, y)
+        self.assertIsNot(estimator.compiled_, compiled)